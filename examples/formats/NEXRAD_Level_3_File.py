@@ -30,7 +30,7 @@ for v, ctable, ax in zip(('N0Q', 'N0U'), ('NWSReflectivity', 'NWSVelocity'), axe
     data[data == 0] = np.ma.masked
 
     # Grab azimuths and calculate a range based on number of gates
-    az = np.array(datadict['start_az'] + [datadict['end_az'][-1]])
+    az = np.append(datadict['start_az'], datadict['end_az'][-1])
     rng = np.linspace(0, f.max_range, data.shape[-1] + 1)
 
     # Convert az,range to x,y
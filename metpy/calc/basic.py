@@ -12,6 +12,8 @@ These include:
 
 from __future__ import division
 
+from multiprocessing import cpu_count
+from multiprocessing.pool import ThreadPool
 import warnings
 
 import numpy as np
@@ -617,7 +619,7 @@ def sigma_to_pressure(sigma, psfc, ptop):
 
 @exporter.export
 @preprocess_xarray
-def smooth_gaussian(scalar_grid, n):
+def smooth_gaussian(scalar_grid, n, workers=None):
     """Filter with normal distribution of weights.
 
     Parameters
@@ -629,6 +631,10 @@ def smooth_gaussian(scalar_grid, n):
     n : int
         Degree of filtering
 
+    workers : int, optional
+        The number of threads used to smooth the grids along any leading axes (e.g. time
+        or vertical level) in parallel. Defaults to the number of CPUs.
+
     Returns
     -------
     `pint.Quantity`
@@ -698,16 +704,234 @@ def smooth_gaussian(scalar_grid, n):
         n = 2
     sgma = n / (2 * np.pi)
 
-    # Construct sigma sequence so smoothing occurs only in horizontal direction
-    nax = len(scalar_grid.shape)
-    # Assume the last two axes represent the horizontal directions
-    sgma_seq = [sgma if i > nax - 3 else 0 for i in range(nax)]
+    # Assume the last two axes represent the horizontal directions, and smooth each of the
+    # grids along the leading axes separately, into an output with the same dtype
+    grid, grid_units = _magnitude_and_units(scalar_grid)
+    res = np.empty_like(grid)
+
+    def smooth(index):
+        gaussian_filter(grid[index], sgma, output=res[index], truncate=2 * np.sqrt(2))
+
+    indices = list(np.ndindex(*grid.shape[:-2]))
+    workers = min(workers or cpu_count(), len(indices))
+    if workers > 1:
+        pool = ThreadPool(workers)
+        try:
+            pool.map(smooth, indices)
+        finally:
+            pool.close()
+    else:
+        for index in indices:
+            smooth(index)
+
+    # Reattach units
+    return _with_units(res, grid_units)
+
+
+@exporter.export
+@preprocess_xarray
+def smooth_n_point(scalar_grid, n=5, passes=1):
+    """Filter with a 5- or 9-point smoother.
+
+    Parameters
+    ----------
+    scalar_grid : `pint.Quantity`
+        Some n-dimensional scalar grid. If more than two axes, smoothing
+        is only done across the last two.
+
+    n : int, optional
+        The number of points to use in the smoothing, either 5 or 9. Defaults to 5.
+
+    passes : int, optional
+        The number of times to apply the filter to the grid. Defaults to 1.
+
+    Returns
+    -------
+    `pint.Quantity`
+        The filtered scalar grid
+
+    Notes
+    -----
+    This function is a close replication of the GEMPAK functions SM5S and SM9S. The
+    5-point smoother gives a weight of 1/2 to each point and 1/8 to each of its four
+    neighbors. The 9-point smoother gives a weight of 1/4 to each point, 1/8 to its four
+    neighbors, and 1/16 to its four diagonal neighbors. Points along the edges of the grid
+    are left unchanged, and any missing (NaN) points spread to their neighbors.
+
+    """
+    if n == 9:
+        p, q, r = 0.25, 0.125, 0.0625
+    elif n == 5:
+        p, q, r = 0.5, 0.125, 0.
+    else:
+        raise ValueError('The number of points to use in the smoothing '
+                         'calculation must be either 5 or 9.')
+
+    grid, grid_units = _smoothing_grid(scalar_grid)
+    for _ in range(passes):
+        smoothed = (p * grid[..., 1:-1, 1:-1] +
+                    q * (grid[..., 2:, 1:-1] + grid[..., 1:-1, 2:] +
+                         grid[..., :-2, 1:-1] + grid[..., 1:-1, :-2]))
+        if r:
+            smoothed += r * (grid[..., 2:, 2:] + grid[..., 2:, :-2] +
+                             grid[..., :-2, 2:] + grid[..., :-2, :-2])
+        grid[..., 1:-1, 1:-1] = smoothed
+    return _with_units(grid, grid_units)
+
+
+@exporter.export
+@preprocess_xarray
+def smooth_rectangular(scalar_grid, size, passes=1):
+    """Filter with a rectangular (box) window, averaging the points within it equally.
+
+    Parameters
+    ----------
+    scalar_grid : `pint.Quantity`
+        Some n-dimensional scalar grid. If more than two axes, smoothing
+        is only done across the last two.
+
+    size : int or sequence of ints
+        The number of points in the window along the y and x axes, which must be odd. A
+        single value gives a square window.
+
+    passes : int, optional
+        The number of times to apply the filter to the grid. Defaults to 1.
+
+    Returns
+    -------
+    `pint.Quantity`
+        The filtered scalar grid
+
+    Notes
+    -----
+    The sums within the windows are found from cumulative sums along each axis, so the
+    cost does not depend on the size of the window. Points closer to the edge of the grid
+    than half the window are left unchanged, as are points with any missing (NaN) values
+    in their window.
+
+    """
+    size = np.broadcast_to(size, 2)
+    if np.any(size < 1) or np.any(size % 2 == 0):
+        raise ValueError('The size of the window must be a positive odd integer.')
+    half_y, half_x = (int(half) for half in size // 2)
 
-    # Compute smoothed field and reattach units
-    res = gaussian_filter(scalar_grid, sgma_seq, truncate=2 * np.sqrt(2))
-    if hasattr(scalar_grid, 'units'):
-        res = res * scalar_grid.units
-    return res
+    def window_sums(grid):
+        return _running_sums(_running_sums(grid, half_x, -1), half_y, -2)
+
+    grid, grid_units = _smoothing_grid(scalar_grid)
+    for _ in range(passes):
+        _smooth_window(grid, window_sums, size[0] * size[1], half_y, half_x)
+    return _with_units(grid, grid_units)
+
+
+@exporter.export
+@preprocess_xarray
+def smooth_circular(scalar_grid, radius, passes=1):
+    """Filter with a circular window, averaging the points within it equally.
+
+    Parameters
+    ----------
+    scalar_grid : `pint.Quantity`
+        Some n-dimensional scalar grid. If more than two axes, smoothing
+        is only done across the last two.
+
+    radius : float
+        The radius of the window, in grid points. All points within this distance of the
+        target point are included.
+
+    passes : int, optional
+        The number of times to apply the filter to the grid. Defaults to 1.
+
+    Returns
+    -------
+    `pint.Quantity`
+        The filtered scalar grid
+
+    Notes
+    -----
+    Each row of the window is summed from the cumulative sums along the x axis, so the cost
+    grows only linearly with the radius. Points closer to the edge of the grid than the
+    radius are left unchanged, as are points with any missing (NaN) values in their window.
+
+    """
+    if radius < 1:
+        raise ValueError('The radius of the window must be at least 1.')
+    half = int(radius)
+    offsets = np.arange(-half, half + 1)
+    half_widths = np.floor(np.sqrt(radius**2 - offsets**2)).astype(int)
+
+    def window_sums(grid):
+        # Cumulative sums along x, with a leading zero, give the sum along any part of a row
+        ny, nx = grid.shape[-2:]
+        csum = np.zeros(grid.shape[:-1] + (nx + 1,))
+        np.cumsum(grid, axis=-1, out=csum[..., 1:])
+        sums = 0
+        for offset, width in zip(offsets, half_widths):
+            rows = slice(half + offset, ny - half + offset)
+            sums = sums + (csum[..., rows, half + width + 1:nx - half + width + 1] -
+                           csum[..., rows, half - width:nx - half - width])
+        return sums
+
+    grid, grid_units = _smoothing_grid(scalar_grid)
+    for _ in range(passes):
+        _smooth_window(grid, window_sums, np.sum(2 * half_widths + 1), half, half)
+    return _with_units(grid, grid_units)
+
+
+def _magnitude_and_units(scalar_grid):
+    """Get the magnitude of a grid as an array, along with its units (if any)."""
+    return (np.asarray(getattr(scalar_grid, 'magnitude', scalar_grid)),
+            getattr(scalar_grid, 'units', None))
+
+
+def _smoothing_grid(scalar_grid):
+    """Get a floating point copy of a grid to smooth in place, along with its units."""
+    grid, grid_units = _magnitude_and_units(scalar_grid)
+    return grid.astype(grid.dtype if grid.dtype.kind == 'f' else np.float64), grid_units
+
+
+def _with_units(grid, grid_units):
+    """Attach units (if any) to a grid, without copying it."""
+    return grid if grid_units is None else units.Quantity(grid, grid_units)
+
+
+def _running_sums(grid, half_width, axis):
+    """Sum the windows of 2 * half_width + 1 points centered on each point along an axis.
+
+    This uses the differences of the cumulative sums, which are calculated in double
+    precision to limit the build up of rounding error. Only the points with a full window
+    are included in the result.
+    """
+    shape = list(grid.shape)
+    shape[axis] += 1
+    csum = np.zeros(shape)
+    inner = [slice(None)] * grid.ndim
+    inner[axis] = slice(1, None)
+    np.cumsum(grid, axis=axis, out=csum[tuple(inner)])
+
+    upper = [slice(None)] * grid.ndim
+    lower = [slice(None)] * grid.ndim
+    upper[axis] = slice(2 * half_width + 1, None)
+    lower[axis] = slice(None, -2 * half_width - 1)
+    return csum[tuple(upper)] - csum[tuple(lower)]
+
+
+def _smooth_window(grid, window_sums, num_points, half_y, half_x):
+    """Replace the points of a grid that have full windows with their window's average."""
+    ny, nx = grid.shape[-2:]
+    if ny <= 2 * half_y or nx <= 2 * half_x:
+        return
+
+    interior = (Ellipsis, slice(half_y, ny - half_y), slice(half_x, nx - half_x))
+
+    # Missing values are zeroed for the sums, and then any window containing one is skipped
+    missing = np.isnan(grid)
+    if missing.any():
+        means = window_sums(np.where(missing, 0, grid)) / num_points
+        means = np.where(window_sums(missing) > 0, grid[interior], means)
+    else:
+        means = window_sums(grid) / num_points
+    grid[interior] = means
 
 
 def _check_radians(value, max_radians=2 * np.pi):
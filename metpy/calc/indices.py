@@ -5,7 +5,7 @@
 import numpy as np
 
 from .thermo import mixing_ratio, saturation_vapor_pressure
-from .tools import get_layer
+from .tools import _layer_segments, _log_pressure_fractions, _segment_values, get_layer
 from ..constants import g, rho_l
 from ..package_tools import Exporter
 from ..units import atleast_1d, check_units, concatenate, units
@@ -115,6 +115,25 @@ def mean_pressure_weighted(pressure, *args, **kwargs):
     return ret
 
 
+def _mean_pressure_weighted_segments(start, end, pressure, *args):
+    """Calculate pressure-weighted means through layers given by `_layer_segments`.
+
+    This uses the trapezoid rule through the same points as `mean_pressure_weighted`, summing
+    the contributions from each segment between levels that lies within the layer. Returns
+    an array with the mean of each argument along the first axis.
+    """
+    start, start_pressure = _log_pressure_fractions(pressure, start)
+    end, end_pressure = _log_pressure_fractions(pressure, end)
+
+    # Taking the integral of the weights (pressure) to feed into the weighting
+    # function, which adds up to 0.5 * (p_top**2 - p_bottom**2) through the layer
+    pres_int = 0.5 * (end_pressure**2 - start_pressure**2).sum(axis=0)
+    return np.stack([(0.5 * (_segment_values(arg, start) * start_pressure +
+                             _segment_values(arg, end) * end_pressure) *
+                      (end_pressure - start_pressure)).sum(axis=0) / pres_int
+                     for arg in args])
+
+
 @exporter.export
 @preprocess_xarray
 @check_units('[pressure]', '[speed]', '[speed]', '[length]')
@@ -175,6 +194,77 @@ def bunkers_storm_motion(pressure, u, v, heights):
     return right_mover, left_mover, wind_mean
 
 
+@exporter.export
+@preprocess_xarray
+@check_units('[pressure]', '[speed]', '[speed]', '[length]')
+def bunkers_storm_motion_grid(pressure, u, v, heights, axis=0):
+    r"""Calculate the Bunkers storm motions and sfc-6km mean flow for every column of a grid.
+
+    This gives the same results as `bunkers_storm_motion` for each column, but finds the
+    layer means for all of the columns at once, rather than one sounding at a time.
+
+    Parameters
+    ----------
+    pressure : (P, M, N) array-like
+        Pressure of the levels
+    u : (P, M, N) array-like
+        U component of the wind
+    v : (P, M, N) array-like
+        V component of the wind
+    heights : (P, M, N) array-like
+        Heights of the levels
+    axis : int, optional
+        The axis corresponding to the vertical levels, defaults to 0
+
+    Returns
+    -------
+    right_mover: `pint.Quantity`
+        (2, M, N) U and v components of Bunkers RM storm motion
+    left_mover: `pint.Quantity`
+        (2, M, N) U and v components of Bunkers LM storm motion
+    wind_mean: `pint.Quantity`
+        (2, M, N) U and v components of sfc-6km mean flow
+
+    Notes
+    -----
+    Columns whose heights do not extend to 6 km above the lowest level are set to NaN.
+
+    See Also
+    --------
+    bunkers_storm_motion
+
+    """
+    wind_units = u.units
+    v = v.to(wind_units)
+
+    def layer_mean(bottom, depth):
+        start, end, complete, layer_p, layer_u, layer_v = _layer_segments(
+            heights, bottom, depth, pressure, u, v, axis=axis)
+        means = _mean_pressure_weighted_segments(start, end, layer_p, layer_u, layer_v)
+        return np.where(complete, means, np.nan)
+
+    # mean wind from sfc-6km
+    wind_mean = layer_mean(0 * units('meter'), 6000 * units('meter'))
+
+    # mean wind from sfc-500m
+    wind_500m = layer_mean(0 * units('meter'), 500 * units('meter'))
+
+    # mean wind from 5.5-6km
+    wind_5500m = layer_mean(5500 * units('meter'), 500 * units('meter'))
+
+    # Calculate the shear vector from sfc-500m to 5.5-6km
+    shear = wind_5500m - wind_500m
+
+    # Take the cross product of the wind shear and k, and divide by the vector magnitude and
+    # multiply by the deviaton empirically calculated in Bunkers (2000) (7.5 m/s)
+    shear_cross = np.stack([shear[1], -shear[0]])
+    rdev = shear_cross * (units('m/s').to(wind_units).magnitude * 7.5 / np.hypot(*shear))
+
+    return (units.Quantity(wind_mean + rdev, wind_units),
+            units.Quantity(wind_mean - rdev, wind_units),
+            units.Quantity(wind_mean, wind_units))
+
+
 @exporter.export
 @preprocess_xarray
 @check_units('[pressure]', '[speed]', '[speed]')
@@ -218,6 +308,64 @@ def bulk_shear(pressure, u, v, heights=None, bottom=None, depth=None):
     return u_shr, v_shr
 
 
+@exporter.export
+@preprocess_xarray
+@check_units('[pressure]', '[speed]', '[speed]', '[length]', '[length]', '[length]')
+def bulk_shear_grid(pressure, u, v, heights, depth, bottom=0 * units.m, axis=0):
+    r"""Calculate bulk shear through a layer for every column of a grid.
+
+    This gives the same results as `bulk_shear` for each column, with the layer given in
+    height, but finds the bounds of the layer for all of the columns at once.
+
+    Parameters
+    ----------
+    pressure : (P, M, N) `pint.Quantity`
+        Atmospheric pressure
+    u : (P, M, N) `pint.Quantity`
+        U-component of wind.
+    v : (P, M, N) `pint.Quantity`
+        V-component of wind.
+    heights : (P, M, N) `pint.Quantity`
+        Heights of the levels
+    depth : `pint.Quantity`
+        The depth of the layer in meters
+    bottom : `pint.Quantity`, optional
+        The bottom of the layer as a height above the lowest level. Can be a single value or
+        one for each column. Defaults to 0 m, the lowest level.
+    axis : int, optional
+        The axis corresponding to the vertical levels, defaults to 0
+
+    Returns
+    -------
+    u_shr: `pint.Quantity`
+        (M, N) u-component of layer bulk shear
+    v_shr: `pint.Quantity`
+        (M, N) v-component of layer bulk shear
+
+    Notes
+    -----
+    As with `get_layer`, the pressures at the bounds of the layer are interpolated linearly
+    in height, and the winds there are interpolated in log-pressure. Columns whose heights do
+    not extend through the whole layer are set to NaN.
+
+    See Also
+    --------
+    bulk_shear
+
+    """
+    wind_units = u.units
+    start, end, complete, pressure, u, v = _layer_segments(heights, bottom, depth, pressure,
+                                                           u, v.to(wind_units), axis=axis)
+    start, _ = _log_pressure_fractions(pressure, start)
+    end, _ = _log_pressure_fractions(pressure, end)
+
+    # The changes across the segments of the layer add up to the shear through it
+    return tuple(units.Quantity(np.where(complete, (_segment_values(wind, end) -
+                                                    _segment_values(wind, start)).sum(axis=0),
+                                         np.nan), wind_units)
+                 for wind in (u, v))
+
+
 @exporter.export
 @preprocess_xarray
 @check_units('[energy] / [mass]', '[speed] * [speed]', '[speed]')
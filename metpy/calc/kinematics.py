@@ -9,8 +9,8 @@ import functools
 import numpy as np
 
 from . import coriolis_parameter
-from .tools import first_derivative, get_layer_heights, gradient
-from ..cbook import is_string_like, iterable
+from .tools import (_layer_segments, _segment_values, first_derivative, get_layer_heights,
+                    gradient)
 from ..constants import Cp_d, g, Rd
 from ..package_tools import Exporter
 from ..units import atleast_2d, check_units, concatenate, units
@@ -30,43 +30,38 @@ def _is_x_first_dim(dim_order):
     return dim_order == 'xy'
 
 
-def _check_and_flip(arr):
-    """Transpose array or list of arrays if they are 2D."""
-    if hasattr(arr, 'ndim'):
-        if arr.ndim >= 2:
-            return arr.T
-        else:
-            return arr
-    elif not is_string_like(arr) and iterable(arr):
-        return tuple(_check_and_flip(a) for a in arr)
-    else:
+def _expand_horizontal(arr, ndim, x_axis, y_axis):
+    """Line up a 2D horizontal array, like grid spacing, with the x and y axes of ndim arrays.
+
+    This allows arrays with other dimensions, such as time or vertical level, to be used with
+    grid spacing or latitudes given only for the horizontal grid.
+    """
+    if getattr(arr, 'ndim', 0) != 2 or ndim <= 2:
         return arr
+    shape = [1] * ndim
+    for axis, size in zip(sorted((x_axis % ndim, y_axis % ndim)), arr.shape):
+        shape[axis] = size
+    return arr.reshape(shape)
 
 
 def ensure_yx_order(func):
-    """Wrap a function to ensure all array arguments are y, x ordered, based on kwarg."""
+    """Wrap a function to find the x and y axes of its arrays, based on kwarg.
+
+    ``dim_order='xy'`` is translated into the ``x_axis`` and ``y_axis`` keyword arguments
+    of the wrapped function, which works directly with the arrays as given, rather than
+    transposing them.
+    """
     @functools.wraps(func)
     def wrapper(*args, **kwargs):
         # Check what order we're given
         dim_order = kwargs.pop('dim_order', None)
-        x_first = _is_x_first_dim(dim_order)
-
-        # If x is the first dimension, flip (transpose) every array within the function args.
-        if x_first:
-            args = tuple(_check_and_flip(arr) for arr in args)
-            for k, v in kwargs:
-                kwargs[k] = _check_and_flip(v)
-
-        ret = func(*args, **kwargs)
-
-        # If we flipped on the way in, need to flip on the way out so that output array(s)
-        # match the dimension order of the original input.
-        if x_first:
-            return _check_and_flip(ret)
-        else:
-            return ret
+        if _is_x_first_dim(dim_order):
+            if 'x_axis' in kwargs or 'y_axis' in kwargs:
+                raise ValueError('Cannot specify both "dim_order" and "x_axis" or "y_axis".')
+            kwargs['x_axis'], kwargs['y_axis'] = 0, 1
+        return func(*args, **kwargs)
 
-    # Inject a docstring for the dim_order argument into the function's docstring.
+    # Inject a docstring for the dimension arguments into the function's docstring.
     dim_order_doc = """
     dim_order : str or ``None``, optional
         The ordering of dimensions in passed in arrays. Can be one of ``None``, ``'xy'``,
@@ -74,7 +69,14 @@ def ensure_yx_order(func):
         dimension, followed by y. ``'yx'`` indicates that x is the last dimension, preceded
         by y. ``None`` indicates that the default ordering should be assumed,
         which is 'yx'. Can only be passed as a keyword argument, i.e.
-        func(..., dim_order='xy')."""
+        func(..., dim_order='xy').
+    x_axis : int, optional
+        The axis of the arrays corresponding to x. Defaults to -1, the last axis, or to 0
+        for ``dim_order='xy'``. Any other dimensions, such as time or vertical level, are
+        treated as separate grids. Can only be passed as a keyword argument.
+    y_axis : int, optional
+        The axis of the arrays corresponding to y. Defaults to -2, the second to last axis,
+        or to 1 for ``dim_order='xy'``. Can only be passed as a keyword argument."""
 
     # Find the first blank line after the start of the parameters section
     params = wrapper.__doc__.find('Parameters')
@@ -85,9 +87,235 @@ def ensure_yx_order(func):
 
 
 @exporter.export
-@preprocess_xarray
+class WindGradients(object):
+    r"""Calculate kinematic quantities from a single set of horizontal wind derivatives.
+
+    Each of :math:`\partial u/\partial x`, :math:`\partial u/\partial y`,
+    :math:`\partial v/\partial x`, and :math:`\partial v/\partial y` is calculated with
+    `first_derivative` the first time it is needed, and then reused. Computing several
+    quantities for the same wind, such as vorticity, divergence, and deformation, is then
+    much faster than calling the individual functions, which each calculate their own
+    derivatives, while giving identical results.
+
+    Parameters
+    ----------
+    u : (M, N) ndarray
+        x component of the wind
+    v : (M, N) ndarray
+        y component of the wind
+    dx : float or ndarray
+        The grid spacing(s) in the x-direction. If an array, there should be one
+        item less than the size of `u` along the applicable axis.
+    dy : float or ndarray
+        The grid spacing(s) in the y-direction. If an array, there should be one
+        item less than the size of `u` along the applicable axis.
+    dim_order : str or ``None``, optional
+        The ordering of dimensions in passed in arrays. Can be one of ``None``, ``'xy'``,
+        or ``'yx'``. ``'xy'`` indicates that the dimension corresponding to x is the leading
+        dimension, followed by y. ``'yx'`` indicates that x is the last dimension, preceded
+        by y. ``None`` indicates that the default ordering should be assumed,
+        which is 'yx'. All arrays, including those returned, use this ordering.
+    x_axis : int, optional
+        The axis of the arrays corresponding to x. Defaults to -1, the last axis, or to 0
+        for ``dim_order='xy'``. Any other dimensions, such as time or vertical level, are
+        treated as separate grids, and 2D grid spacing is lined up with the x and y axes.
+    y_axis : int, optional
+        The axis of the arrays corresponding to y. Defaults to -2, the second to last axis,
+        or to 1 for ``dim_order='xy'``.
+
+    See Also
+    --------
+    vorticity, divergence, shearing_deformation, stretching_deformation, total_deformation
+
+    """
+
+    @preprocess_xarray(dask=True)
+    def __init__(self, u, v, dx, dy, dim_order='yx', x_axis=-1, y_axis=-2):
+        """Initialize the wind gradients, which are calculated as needed."""
+        if _is_x_first_dim(dim_order):
+            x_axis, y_axis = 0, 1
+        self._u = u
+        self._v = v
+        self._axes = {'x': x_axis, 'y': y_axis}
+        self._deltas = {'x': self._horizontal(dx), 'y': self._horizontal(dy)}
+        self._derivs = {}
+
+    def _horizontal(self, arr):
+        """Line up a 2D horizontal array with the x and y axes of the wind arrays."""
+        return _expand_horizontal(arr, self._u.ndim, self._axes['x'], self._axes['y'])
+
+    def _gradient(self, scalar):
+        """Calculate the derivatives of a scalar field along y and x."""
+        return (first_derivative(scalar, delta=self._deltas['y'], axis=self._axes['y']),
+                first_derivative(scalar, delta=self._deltas['x'], axis=self._axes['x']))
+
+    def _deriv(self, component, direction):
+        """Get the (cached) derivative of a wind component in the 'x' or 'y' direction."""
+        key = (component, direction)
+        if key not in self._derivs:
+            self._derivs[key] = first_derivative(self._u if component == 'u' else self._v,
+                                                 delta=self._deltas[direction],
+                                                 axis=self._axes[direction])
+        return self._derivs[key]
+
+    @property
+    def dudx(self):
+        """Get the derivative of u in the x-direction."""
+        return self._deriv('u', 'x')
+
+    @property
+    def dudy(self):
+        """Get the derivative of u in the y-direction."""
+        return self._deriv('u', 'y')
+
+    @property
+    def dvdx(self):
+        """Get the derivative of v in the x-direction."""
+        return self._deriv('v', 'x')
+
+    @property
+    def dvdy(self):
+        """Get the derivative of v in the y-direction."""
+        return self._deriv('v', 'y')
+
+    def _vorticity(self):
+        return self._deriv('v', 'x') - self._deriv('u', 'y')
+
+    def _divergence(self):
+        return self._deriv('u', 'x') + self._deriv('v', 'y')
+
+    def _shearing_deformation(self):
+        return self._deriv('v', 'x') + self._deriv('u', 'y')
+
+    def _stretching_deformation(self):
+        return self._deriv('u', 'x') - self._deriv('v', 'y')
+
+    def _total_deformation(self):
+        # Power of 0.5 (same as np.sqrt) keeps dask arrays unevaluated within the Quantity
+        return (self._shearing_deformation()**2 + self._stretching_deformation()**2)**0.5
+
+    @property
+    def vorticity(self):
+        """Get the vertical vorticity of the horizontal wind."""
+        return self._vorticity()
+
+    @property
+    def divergence(self):
+        """Get the horizontal divergence of the horizontal wind."""
+        return self._divergence()
+
+    @property
+    def shearing_deformation(self):
+        """Get the shearing deformation of the horizontal wind."""
+        return self._shearing_deformation()
+
+    @property
+    def stretching_deformation(self):
+        """Get the stretching deformation of the horizontal wind."""
+        return self._stretching_deformation()
+
+    @property
+    def total_deformation(self):
+        """Get the total deformation of the horizontal wind."""
+        return self._total_deformation()
+
+    @preprocess_xarray(dask=True)
+    def absolute_vorticity(self, lats):
+        """Calculate the absolute vorticity of the horizontal wind.
+
+        Parameters
+        ----------
+        lats : (M, N) ndarray
+            latitudes of the wind data
+
+        Returns
+        -------
+        (M, N) ndarray
+            absolute vorticity
+
+        See Also
+        --------
+        absolute_vorticity
+
+        """
+        return self.vorticity + coriolis_parameter(self._horizontal(lats))
+
+    @preprocess_xarray(dask=True)
+    def frontogenesis(self, thta):
+        r"""Calculate the 2D kinematic frontogenesis of a temperature field by the wind.
+
+        Parameters
+        ----------
+        thta : (M, N) ndarray
+            Potential temperature
+
+        Returns
+        -------
+        (M, N) ndarray
+            2D Frontogenesis in [temperature units]/m/s
+
+        See Also
+        --------
+        frontogenesis
+
+        """
+        # Get gradients of potential temperature in both x and y
+        ddy_thta, ddx_thta = self._gradient(thta)
+
+        # Compute the magnitude of the potential temperature gradient
+        mag_thta = (ddx_thta**2 + ddy_thta**2)**0.5
+
+        # Compute the angle (beta) between the wind field and the gradient of potential
+        # temperature. The trigonometry is done on the magnitudes, which (unlike Quantities)
+        # numpy can pass along to dask arrays without evaluating them.
+        shear = self._shearing_deformation()
+        psi = 0.5 * np.arctan2(shear.magnitude,
+                               self._stretching_deformation().to(shear.units).magnitude)
+        beta = np.arcsin(((-ddx_thta * np.cos(psi) - ddy_thta * np.sin(psi)) /
+                          mag_thta).to('dimensionless').magnitude)
+
+        return 0.5 * mag_thta * (self._total_deformation() * np.cos(2 * beta) -
+                                 self._divergence())
+
+    @preprocess_xarray(dask=True)
+    def q_vector(self, temperature, pressure, static_stability=1):
+        r"""Calculate the Q-vector, treating the wind as geostrophic.
+
+        Parameters
+        ----------
+        temperature : (M, N) ndarray
+            Array of temperature at pressure level
+        pressure : `pint.Quantity`
+            Pressure at level
+        static_stability : `pint.Quantity`, optional
+            The static stability at the pressure level. Defaults to 1 if not given to
+            calculate the Q-vector without factoring in static stability.
+
+        Returns
+        -------
+        tuple of (M, N) ndarrays
+            The components of the Q-vector in the u- and v-directions respectively
+
+        See Also
+        --------
+        q_vector
+
+        """
+        static_stability = self._horizontal(static_stability)
+        dtempdy, dtempdx = self._gradient(temperature)
+
+        q1 = -Rd / (pressure * static_stability) * (self._deriv('u', 'x') * dtempdx +
+                                                    self._deriv('v', 'x') * dtempdy)
+        q2 = -Rd / (pressure * static_stability) * (self._deriv('u', 'y') * dtempdx +
+                                                    self._deriv('v', 'y') * dtempdy)
+
+        return q1.to_base_units(), q2.to_base_units()
+
+
+@exporter.export
+@preprocess_xarray(dask=True)
 @ensure_yx_order
-def vorticity(u, v, dx, dy):
+def vorticity(u, v, dx, dy, x_axis=-1, y_axis=-2):
     r"""Calculate the vertical vorticity of the horizontal wind.
 
     Parameters
@@ -113,15 +341,13 @@ def vorticity(u, v, dx, dy):
     divergence
 
     """
-    dudy = first_derivative(u, delta=dy, axis=-2)
-    dvdx = first_derivative(v, delta=dx, axis=-1)
-    return dvdx - dudy
+    return WindGradients(u, v, dx, dy, x_axis=x_axis, y_axis=y_axis).vorticity
 
 
 @exporter.export
-@preprocess_xarray
+@preprocess_xarray(dask=True)
 @ensure_yx_order
-def divergence(u, v, dx, dy):
+def divergence(u, v, dx, dy, x_axis=-1, y_axis=-2):
     r"""Calculate the horizontal divergence of the horizontal wind.
 
     Parameters
@@ -145,15 +371,13 @@ def divergence(u, v, dx, dy):
     vorticity
 
     """
-    dudx = first_derivative(u, delta=dx, axis=-1)
-    dvdy = first_derivative(v, delta=dy, axis=-2)
-    return dudx + dvdy
+    return WindGradients(u, v, dx, dy, x_axis=x_axis, y_axis=y_axis).divergence
 
 
 @exporter.export
-@preprocess_xarray
+@preprocess_xarray(dask=True)
 @ensure_yx_order
-def shearing_deformation(u, v, dx, dy):
+def shearing_deformation(u, v, dx, dy, x_axis=-1, y_axis=-2):
     r"""Calculate the shearing deformation of the horizontal wind.
 
     Parameters
@@ -177,15 +401,13 @@ def shearing_deformation(u, v, dx, dy):
     stretching_deformation, total_deformation
 
     """
-    dudy = first_derivative(u, delta=dy, axis=-2)
-    dvdx = first_derivative(v, delta=dx, axis=-1)
-    return dvdx + dudy
+    return WindGradients(u, v, dx, dy, x_axis=x_axis, y_axis=y_axis).shearing_deformation
 
 
 @exporter.export
-@preprocess_xarray
+@preprocess_xarray(dask=True)
 @ensure_yx_order
-def stretching_deformation(u, v, dx, dy):
+def stretching_deformation(u, v, dx, dy, x_axis=-1, y_axis=-2):
     r"""Calculate the stretching deformation of the horizontal wind.
 
     Parameters
@@ -209,15 +431,13 @@ def stretching_deformation(u, v, dx, dy):
     shearing_deformation, total_deformation
 
     """
-    dudx = first_derivative(u, delta=dx, axis=-1)
-    dvdy = first_derivative(v, delta=dy, axis=-2)
-    return dudx - dvdy
+    return WindGradients(u, v, dx, dy, x_axis=x_axis, y_axis=y_axis).stretching_deformation
 
 
 @exporter.export
-@preprocess_xarray
+@preprocess_xarray(dask=True)
 @ensure_yx_order
-def total_deformation(u, v, dx, dy):
+def total_deformation(u, v, dx, dy, x_axis=-1, y_axis=-2):
     r"""Calculate the horizontal total deformation of the horizontal wind.
 
     Parameters
@@ -241,21 +461,19 @@ def total_deformation(u, v, dx, dy):
     shearing_deformation, stretching_deformation
 
     """
-    dudy, dudx = gradient(u, deltas=(dy, dx), axes=(-2, -1))
-    dvdy, dvdx = gradient(v, deltas=(dy, dx), axes=(-2, -1))
-    return np.sqrt((dvdx + dudy)**2 + (dudx - dvdy)**2)
+    return WindGradients(u, v, dx, dy, x_axis=x_axis, y_axis=y_axis).total_deformation
 
 
 @exporter.export
-@preprocess_xarray
+@preprocess_xarray(dask=True)
 @ensure_yx_order
-def advection(scalar, wind, deltas):
+def advection(scalar, wind, deltas, x_axis=-1, y_axis=-2):
     r"""Calculate the advection of a scalar field by the wind.
 
-    The order of the dimensions of the arrays must match the order in which
-    the wind components are given.  For example, if the winds are given [u, v],
-    then the scalar and wind arrays must be indexed as x,y (which puts x as the
-    rows, not columns).
+    The wind components and grid spacings are given in the order x, y, and then any
+    remaining dimensions from last to first. For example, if the winds are given [u, v],
+    the gradients are taken along ``x_axis`` and ``y_axis`` (by default the last two
+    dimensions), and any leading dimensions, such as time, are treated as separate grids.
 
     Parameters
     ----------
@@ -278,28 +496,34 @@ def advection(scalar, wind, deltas):
     # This allows passing in a list of wind components or an array.
     wind = _stack(wind)
 
-    # If we have more than one component, we need to reverse the order along the first
-    # dimension so that the wind components line up with the
-    # order of the gradients from the ..., y, x ordered array.
-    if wind.ndim > scalar.ndim:
-        wind = wind[::-1]
+    # Line up the wind components (u, v, ...) and deltas with the x and y axes, followed by
+    # any remaining axes from last to first (e.g. the vertical for w).
+    axes = [x_axis % scalar.ndim]
+    if len(deltas) > 1:
+        axes.append(y_axis % scalar.ndim)
+    axes.extend(axis for axis in reversed(range(scalar.ndim)) if axis not in axes)
 
-    # Gradient returns a list of derivatives along each dimension. We convert
-    # this to an array with dimension as the first index. Reverse the deltas to line up
-    # with the order of the dimensions.
-    grad = _stack(gradient(scalar, deltas=deltas[::-1]))
+    # Gradient returns a list of derivatives along each of the axes. We convert
+    # this to an array with the wind component as the first index.
+    deltas = [_expand_horizontal(delta, scalar.ndim, x_axis, y_axis) for delta in deltas]
+    grad = _stack(gradient(scalar, deltas=deltas, axes=axes[:len(deltas)]))
 
     # Make them be at least 2D (handling the 1D case) so that we can do the
     # multiply and sum below
     grad, wind = atleast_2d(grad, wind)
 
-    return (-grad * wind).sum(axis=0)
+    adv = -grad * wind
+
+    # Sum the magnitudes, since pint would evaluate a dask array to sum it
+    if hasattr(adv, 'units'):
+        return units.Quantity(adv.magnitude.sum(axis=0), adv.units)
+    return adv.sum(axis=0)
 
 
 @exporter.export
-@preprocess_xarray
+@preprocess_xarray(dask=True)
 @ensure_yx_order
-def frontogenesis(thta, u, v, dx, dy, dim_order='yx'):
+def frontogenesis(thta, u, v, dx, dy, x_axis=-1, y_axis=-2):
     r"""Calculate the 2D kinematic frontogenesis of a temperature field.
 
     The implementation is a form of the Petterssen Frontogenesis and uses the formula
@@ -339,32 +563,13 @@ def frontogenesis(thta, u, v, dx, dy, dim_order='yx'):
     :math:`1.08e4*1.e5`
 
     """
-    # Get gradients of potential temperature in both x and y
-    ddy_thta = first_derivative(thta, delta=dy, axis=-2)
-    ddx_thta = first_derivative(thta, delta=dx, axis=-1)
-
-    # Compute the magnitude of the potential temperature gradient
-    mag_thta = np.sqrt(ddx_thta**2 + ddy_thta**2)
-
-    # Get the shearing, stretching, and total deformation of the wind field
-    shrd = shearing_deformation(u, v, dx, dy, dim_order=dim_order)
-    strd = stretching_deformation(u, v, dx, dy, dim_order=dim_order)
-    tdef = total_deformation(u, v, dx, dy, dim_order=dim_order)
-
-    # Get the divergence of the wind field
-    div = divergence(u, v, dx, dy, dim_order=dim_order)
-
-    # Compute the angle (beta) between the wind field and the gradient of potential temperature
-    psi = 0.5 * np.arctan2(shrd, strd)
-    beta = np.arcsin((-ddx_thta * np.cos(psi) - ddy_thta * np.sin(psi)) / mag_thta)
-
-    return 0.5 * mag_thta * (tdef * np.cos(2 * beta) - div)
+    return WindGradients(u, v, dx, dy, x_axis=x_axis, y_axis=y_axis).frontogenesis(thta)
 
 
 @exporter.export
-@preprocess_xarray
+@preprocess_xarray(dask=True)
 @ensure_yx_order
-def geostrophic_wind(heights, f, dx, dy):
+def geostrophic_wind(heights, f, dx, dy, x_axis=-1, y_axis=-2):
     r"""Calculate the geostrophic wind given from the heights or geopotential.
 
     Parameters
@@ -386,20 +591,21 @@ def geostrophic_wind(heights, f, dx, dy):
         A tuple of the u-component and v-component of the geostrophic wind.
 
     """
+    f, dx, dy = (_expand_horizontal(arr, heights.ndim, x_axis, y_axis) for arr in (f, dx, dy))
     if heights.dimensionality['[length]'] == 2.0:
         norm_factor = 1. / f
     else:
         norm_factor = g / f
 
-    dhdy = first_derivative(heights, delta=dy, axis=-2)
-    dhdx = first_derivative(heights, delta=dx, axis=-1)
+    dhdy = first_derivative(heights, delta=dy, axis=y_axis)
+    dhdx = first_derivative(heights, delta=dx, axis=x_axis)
     return -norm_factor * dhdy, norm_factor * dhdx
 
 
 @exporter.export
-@preprocess_xarray
+@preprocess_xarray(dask=True)
 @ensure_yx_order
-def ageostrophic_wind(heights, f, dx, dy, u, v, dim_order='yx'):
+def ageostrophic_wind(heights, f, dx, dy, u, v, x_axis=-1, y_axis=-2):
     r"""Calculate the ageostrophic wind given from the heights or geopotential.
 
     Parameters
@@ -427,7 +633,8 @@ def ageostrophic_wind(heights, f, dx, dy, u, v, dim_order='yx'):
         A tuple of the u-component and v-component of the ageostrophic wind.
 
     """
-    u_geostrophic, v_geostrophic = geostrophic_wind(heights, f, dx, dy, dim_order=dim_order)
+    u_geostrophic, v_geostrophic = geostrophic_wind(heights, f, dx, dy, x_axis=x_axis,
+                                                    y_axis=y_axis)
     return u - u_geostrophic, v - v_geostrophic
 
 
@@ -532,8 +739,76 @@ def storm_relative_helicity(u, v, heights, depth, bottom=0 * units.m,
 
 @exporter.export
 @preprocess_xarray
+@check_units('[speed]', '[speed]', '[length]', '[length]', '[length]',
+             '[speed]', '[speed]')
+def storm_relative_helicity_grid(u, v, heights, depth, bottom=0 * units.m,
+                                 storm_u=0 * units('m/s'), storm_v=0 * units('m/s'), axis=0):
+    r"""Calculate storm relative helicity for every column of a grid.
+
+    This gives the same results as `storm_relative_helicity` for each column, but selects
+    the layer for all of the columns at once using masks, rather than one profile at a time.
+
+    Parameters
+    ----------
+    u : (P, M, N) array-like
+        u component winds
+    v : (P, M, N) array-like
+        v component winds
+    heights : (P, M, N) array-like
+        atmospheric heights, will be converted to above the lowest level
+    depth : number
+        depth of the layer
+    bottom : number or (M, N) array-like
+        height of layer bottom above the lowest level (default is surface)
+    storm_u : number or (M, N) array-like
+        u component of storm motion (default is 0 m/s)
+    storm_v : number or (M, N) array-like
+        v component of storm motion (default is 0 m/s)
+    axis : int, optional
+        The axis corresponding to the vertical levels, defaults to 0
+
+    Returns
+    -------
+    `pint.Quantity, pint.Quantity, pint.Quantity`
+        (M, N) positive, negative, total storm-relative helicity
+
+    Notes
+    -----
+    The top and bottom of the layer are interpolated linearly in height. Columns whose
+    heights do not extend through the whole layer are set to NaN.
+
+    See Also
+    --------
+    storm_relative_helicity
+
+    """
+    wind_units = u.units
+    start, end, complete, u, v = _layer_segments(heights, bottom, depth, u,
+                                                 v.to(wind_units), axis=axis)
+
+    storm_relative_u = u - storm_u.m_as(wind_units)
+    storm_relative_v = v - storm_v.m_as(wind_units)
+
+    # Each segment of the layer contributes the same term as in the sum over a profile
+    int_layers = (_segment_values(storm_relative_u, end) *
+                  _segment_values(storm_relative_v, start) -
+                  _segment_values(storm_relative_u, start) *
+                  _segment_values(storm_relative_v, end))
+
+    positive_srh = np.where(complete, np.where(int_layers > 0., int_layers, 0.).sum(axis=0),
+                            np.nan)
+    negative_srh = np.where(complete, np.where(int_layers < 0., int_layers, 0.).sum(axis=0),
+                            np.nan)
+
+    return tuple(units.Quantity(srh, wind_units**2).to('meter ** 2 / second ** 2')
+                 for srh in (positive_srh, negative_srh, positive_srh + negative_srh))
+
+
+@exporter.export
+@preprocess_xarray(dask=True)
+@ensure_yx_order
 @check_units('[speed]', '[speed]', '[length]', '[length]')
-def absolute_vorticity(u, v, dx, dy, lats, dim_order='yx'):
+def absolute_vorticity(u, v, dx, dy, lats, x_axis=-1, y_axis=-2):
     """Calculate the absolute vorticity of the horizontal wind.
 
     Parameters
@@ -555,17 +830,17 @@ def absolute_vorticity(u, v, dx, dy, lats, dim_order='yx'):
         absolute vorticity
 
     """
-    f = coriolis_parameter(lats)
-    relative_vorticity = vorticity(u, v, dx, dy, dim_order=dim_order)
-    return relative_vorticity + f
+    return WindGradients(u, v, dx, dy, x_axis=x_axis,
+                         y_axis=y_axis).absolute_vorticity(lats)
 
 
 @exporter.export
-@preprocess_xarray
+@preprocess_xarray(dask=True)
+@ensure_yx_order
 @check_units('[temperature]', '[pressure]', '[speed]', '[speed]',
              '[length]', '[length]', '[dimensionless]')
 def potential_vorticity_baroclinic(potential_temperature, pressure, u, v, dx, dy, lats,
-                                   axis=0, dim_order='yx'):
+                                   axis=0, x_axis=-1, y_axis=-2):
     r"""Calculate the baroclinic potential vorticity.
 
     .. math:: PV = -g \frac{\partial \theta}{\partial z}(\zeta + f)
@@ -611,19 +886,125 @@ def potential_vorticity_baroclinic(potential_temperature, pressure, u, v, dx, dy
     if np.shape(pressure)[axis] != 3:
         raise ValueError('Length of pressure along axis '
                          '{} must be 3.'.format(axis))
-    avor = absolute_vorticity(u, v, dx, dy, lats, dim_order=dim_order)
+    avor = absolute_vorticity(u, v, dx, dy, lats, x_axis=x_axis, y_axis=y_axis)
     stability = first_derivative(potential_temperature, x=pressure, axis=axis)
     # Get the middle layer stability derivative (index 1)
     slices = [slice(None)] * stability.ndim
     slices[axis] = 1
-    return (-1 * avor * g * stability[slices]).to(units.kelvin * units.meter**2 /
-                                                  (units.second * units.kilogram))
+    return (-1 * avor * g * stability[tuple(slices)]).to(units.kelvin * units.meter**2 /
+                                                         (units.second * units.kilogram))
 
 
 @exporter.export
 @preprocess_xarray
+@check_units('[temperature]', '[pressure]', '[speed]', '[speed]',
+             '[length]', '[length]', '[dimensionless]')
+def potential_vorticity_baroclinic_levels(potential_temperature, pressure, u, v, dx, dy, lats,
+                                          batch_size=8):
+    r"""Calculate the baroclinic potential vorticity on every level of a stack of grids.
+
+    .. math:: PV = -g \frac{\partial \theta}{\partial p}(\zeta + f)
+
+    This calculates the same quantity as `potential_vorticity_baroclinic`, but for all of
+    the levels (and any leading dimensions, such as time) at once. The levels are processed
+    a batch at a time, so that the temporary arrays needed stay small regardless of the
+    size of the full dataset. The Coriolis parameter is only calculated once, and the
+    grid spacing weights are reused across batches.
+
+    Parameters
+    ----------
+    potential_temperature : (..., P, M, N) ndarray
+        potential temperature
+    pressure : (..., P, M, N) or (P,) ndarray
+        vertical pressures, either for every point or one value for each level
+    u : (..., P, M, N) ndarray
+        x component of the wind
+    v : (..., P, M, N) ndarray
+        y component of the wind
+    dx : float or ndarray
+        The grid spacing in the x-direction
+    dy : float or ndarray
+        The grid spacing in the y-direction
+    lats : (M, N) ndarray
+        latitudes of the wind data
+    batch_size : int, optional
+        The number of levels to calculate at once. Defaults to 8.
+
+    Returns
+    -------
+    (..., P, M, N) ndarray
+        baroclinic potential vorticity
+
+    Notes
+    -----
+    The levels must lie along the third to last dimension, with the y and x dimensions
+    last. Single precision input gives single precision output. The vertical derivative
+    uses one-sided differences at the top and bottom levels, and at least three levels
+    are required.
+
+    See Also
+    --------
+    potential_vorticity_baroclinic
+
+    """
+    shape = potential_temperature.shape
+    if len(shape) < 3:
+        raise ValueError('Potential temperature must have dimensions (..., P, M, N).')
+    if u.shape != shape or v.shape != shape:
+        raise ValueError('Winds must have the same shape as potential temperature.')
+    num_levels = shape[-3]
+    if num_levels < 3:
+        raise ValueError('At least 3 levels are required to calculate potential vorticity.')
+    level_pressure = pressure.ndim == 1
+    if level_pressure:
+        if pressure.size != num_levels:
+            raise ValueError('Length of pressure must match the number of levels.')
+        pressure = pressure.reshape(-1, 1, 1)
+    elif pressure.shape != shape:
+        raise ValueError('Pressure must have one value per level or the same shape as '
+                         'potential temperature.')
+
+    dtype = np.result_type(*[getattr(a, 'magnitude', a)
+                             for a in (potential_temperature, u, v)])
+    if dtype.kind != 'f':
+        dtype = np.dtype(np.float64)
+    pv_units = units.kelvin * units.meter**2 / (units.second * units.kilogram)
+    pvor = np.empty(shape, dtype=dtype)
+
+    # The Coriolis parameter is the same for every batch, so only calculate it once
+    f = units.Quantity(coriolis_parameter(lats).m_as('1/s').astype(dtype), '1/s')
+
+    for index in np.ndindex(*shape[:-3]):
+        for start in range(0, num_levels, batch_size):
+            stop = min(start + batch_size, num_levels)
+
+            # Include the levels on either side (at least 3 in all) so that the vertical
+            # derivative matches what a calculation over all levels would give
+            bottom = max(start - 1, 0)
+            top = min(stop + 1, num_levels)
+            while top - bottom < 3:
+                if bottom > 0:
+                    bottom -= 1
+                else:
+                    top += 1
+
+            levels = index + (slice(start, stop),)
+            window = index + (slice(bottom, top),)
+            stability = first_derivative(potential_temperature[window],
+                                         x=pressure[window[-1:] if level_pressure
+                                                    else window],
+                                         axis=0)[start - bottom:stop - bottom]
+            avor = WindGradients(u[levels], v[levels], dx, dy).vorticity + f
+            pvor[levels] = (-1 * avor * g * stability).m_as(pv_units)
+
+    return units.Quantity(pvor, pv_units)
+
+
+@exporter.export
+@preprocess_xarray(dask=True)
+@ensure_yx_order
 @check_units('[length]', '[speed]', '[speed]', '[length]', '[length]', '[dimensionless]')
-def potential_vorticity_barotropic(heights, u, v, dx, dy, lats, dim_order='yx'):
+def potential_vorticity_barotropic(heights, u, v, dx, dy, lats, x_axis=-1, y_axis=-2):
     r"""Calculate the barotropic (Rossby) potential vorticity.
 
     .. math:: PV = \frac{f + \zeta}{H}
@@ -651,13 +1032,15 @@ def potential_vorticity_barotropic(heights, u, v, dx, dy, lats, dim_order='yx'):
         barotropic potential vorticity
 
     """
-    avor = absolute_vorticity(u, v, dx, dy, lats, dim_order=dim_order)
+    avor = absolute_vorticity(u, v, dx, dy, lats, x_axis=x_axis, y_axis=y_axis)
     return (avor / heights).to('meter**-1 * second**-1')
 
 
 @exporter.export
-@preprocess_xarray
-def inertial_advective_wind(u, v, u_geostrophic, v_geostrophic, dx, dy, lats):
+@preprocess_xarray(dask=True)
+@ensure_yx_order
+def inertial_advective_wind(u, v, u_geostrophic, v_geostrophic, dx, dy, lats, x_axis=-1,
+                            y_axis=-2):
     r"""Calculate the inertial advective wind.
 
     .. math:: \frac{\hat k}{f} \times (\vec V \cdot \nabla)\hat V_g
@@ -704,10 +1087,11 @@ def inertial_advective_wind(u, v, u_geostrophic, v_geostrophic, dx, dy, lats):
     of the geostrophic with for u and u_geostrophic/v and v_geostrophic.
 
     """
+    lats, dx, dy = (_expand_horizontal(arr, u.ndim, x_axis, y_axis) for arr in (lats, dx, dy))
     f = coriolis_parameter(lats)
 
-    dugdy, dugdx = gradient(u_geostrophic, deltas=(dy, dx), axes=(-2, -1))
-    dvgdy, dvgdx = gradient(v_geostrophic, deltas=(dy, dx), axes=(-2, -1))
+    dugdy, dugdx = gradient(u_geostrophic, deltas=(dy, dx), axes=(y_axis, x_axis))
+    dvgdy, dvgdx = gradient(v_geostrophic, deltas=(dy, dx), axes=(y_axis, x_axis))
 
     u_component = -(u * dvgdx + v * dvgdy) / f
     v_component = (u * dugdx + v * dugdy) / f
@@ -716,9 +1100,10 @@ def inertial_advective_wind(u, v, u_geostrophic, v_geostrophic, dx, dy, lats):
 
 
 @exporter.export
-@preprocess_xarray
+@preprocess_xarray(dask=True)
+@ensure_yx_order
 @check_units('[speed]', '[speed]', '[temperature]', '[pressure]', '[length]', '[length]')
-def q_vector(u, v, temperature, pressure, dx, dy, static_stability=1):
+def q_vector(u, v, temperature, pressure, dx, dy, static_stability=1, x_axis=-1, y_axis=-2):
     r"""Calculate Q-vector at a given pressure level using the u, v winds and temperature.
 
     .. math:: \vec{Q} = (Q_1, Q_2)
@@ -764,11 +1149,5 @@ def q_vector(u, v, temperature, pressure, dx, dy, static_stability=1):
     static_stability
 
     """
-    dudy, dudx = gradient(u, deltas=(dy, dx), axes=(-2, -1))
-    dvdy, dvdx = gradient(v, deltas=(dy, dx), axes=(-2, -1))
-    dtempdy, dtempdx = gradient(temperature, deltas=(dy, dx), axes=(-2, -1))
-
-    q1 = -Rd / (pressure * static_stability) * (dudx * dtempdx + dvdx * dtempdy)
-    q2 = -Rd / (pressure * static_stability) * (dudy * dtempdx + dvdy * dtempdy)
-
-    return q1.to_base_units(), q2.to_base_units()
+    return WindGradients(u, v, dx, dy, x_axis=x_axis,
+                         y_axis=y_axis).q_vector(temperature, pressure, static_stability)
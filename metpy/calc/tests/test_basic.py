@@ -10,8 +10,8 @@ from metpy.calc import (add_height_to_pressure, add_pressure_to_height, apparent
                         coriolis_parameter, geopotential_to_height, get_wind_components,
                         get_wind_dir, get_wind_speed, heat_index, height_to_geopotential,
                         height_to_pressure_std, pressure_to_height_std, sigma_to_pressure,
-                        smooth_gaussian, wind_components, wind_direction, wind_speed,
-                        windchill)
+                        smooth_circular, smooth_gaussian, smooth_n_point, smooth_rectangular,
+                        wind_components, wind_direction, wind_speed, windchill)
 from metpy.deprecation import MetpyDeprecationWarning
 from metpy.testing import assert_almost_equal, assert_array_almost_equal, assert_array_equal
 from metpy.units import units
@@ -499,3 +499,87 @@ def test_smooth_gaussian_3d_units():
               [3.00708990, 4.01417981, 7.01417981, 12.0141798, 18.9503707],
               [4.00000000, 5.00708990, 8.00708990, 13.0070899, 19.9432808]]) * units('m')
     assert_array_almost_equal(s[1, :, :], s_true)
+
+
+@pytest.fixture
+def smooth_grid():
+    """Test grid for the smoothers, which is linear in y and quadratic in x."""
+    s = np.zeros((2, 6, 7))
+    for i in np.ndindex(s.shape):
+        s[i] = i[1] + i[2]**2
+    return s * units('m')
+
+
+def test_smooth_gaussian_workers(smooth_grid):
+    """Test that smoothing the leading axes in parallel gives the same result."""
+    assert_array_equal(smooth_gaussian(smooth_grid, 4, workers=2),
+                       smooth_gaussian(smooth_grid, 4, workers=1))
+
+
+@pytest.mark.parametrize('func, arg', [(smooth_gaussian, 4), (smooth_n_point, 9),
+                                       (smooth_rectangular, 3), (smooth_circular, 2)])
+def test_smooth_float32(smooth_grid, func, arg):
+    """Test that the smoothers keep single precision grids in single precision."""
+    grid = units.Quantity(smooth_grid.magnitude.astype(np.float32), smooth_grid.units)
+    res = func(grid, arg)
+    assert res.dtype == np.float32
+    assert_array_almost_equal(res, func(smooth_grid, arg), 4)
+
+
+@pytest.mark.parametrize('n, offset', [(5, 0.25), (9, 0.5)])
+def test_smooth_n_point(smooth_grid, n, offset):
+    """Test the n-point smoothers, which leave the edges alone."""
+    res = smooth_n_point(smooth_grid, n)
+    truth = smooth_grid.copy()
+    truth[..., 1:-1, 1:-1] += offset * units('m')
+    assert_array_almost_equal(res, truth)
+
+
+def test_smooth_n_point_passes(smooth_grid):
+    """Test applying the 5-point smoother more than once."""
+    res = smooth_n_point(smooth_grid, 5, passes=2)
+    assert_array_almost_equal(res, smooth_n_point(smooth_n_point(smooth_grid, 5), 5))
+
+
+def test_smooth_n_point_bad_n(smooth_grid):
+    """Test that the n-point smoother only accepts 5 or 9 points."""
+    with pytest.raises(ValueError):
+        smooth_n_point(smooth_grid, 7)
+
+
+def test_smooth_rectangular(smooth_grid):
+    """Test smoothing with a rectangular window."""
+    res = smooth_rectangular(smooth_grid, (3, 5))
+    truth = smooth_grid.copy()
+    truth[..., 1:-1, 2:-2] += 2 * units('m')
+    assert_array_almost_equal(res, truth)
+
+
+def test_smooth_rectangular_missing(smooth_grid):
+    """Test that windows including missing values are left alone."""
+    grid = smooth_grid.magnitude[0]
+    grid[3, 3] = np.nan
+    res = smooth_rectangular(grid, 3)
+    truth = grid.copy()
+    truth[1:-1, 1:-1] += 2 / 3
+    truth[2:5, 2:5] = grid[2:5, 2:5]
+    assert_array_almost_equal(res, truth)
+
+
+def test_smooth_rectangular_even_size(smooth_grid):
+    """Test that the rectangular window must have an odd size."""
+    with pytest.raises(ValueError):
+        smooth_rectangular(smooth_grid, (3, 4))
+
+
+def test_smooth_circular(smooth_grid):
+    """Test smoothing with a circular window."""
+    res = smooth_circular(smooth_grid, 1)
+    truth = smooth_grid.copy()
+    truth[..., 1:-1, 1:-1] += 0.4 * units('m')
+    assert_array_almost_equal(res, truth)
+
+
+def test_smooth_circular_large_radius(smooth_grid):
+    """Test that a window larger than the grid leaves it unchanged."""
+    assert_array_equal(smooth_circular(smooth_grid, 4), smooth_grid)
@@ -17,12 +17,13 @@ from metpy.calc import (find_bounding_indices, find_intersections, first_derivat
                         log_interp, nearest_intersection_idx, parse_angle,
                         pressure_to_height_std, reduce_point_density, resample_nn_1d,
                         second_derivative)
-from metpy.calc.tools import (_delete_masked_points, _get_bound_pressure_height,
-                              _greater_or_close, _less_or_close, _next_non_masked_element,
+from metpy.calc.tools import (_delete_masked_points, _derivative_weights_cache,
+                              _get_bound_pressure_height, _greater_or_close,
+                              _grid_deltas_cache, _less_or_close, _next_non_masked_element,
                               DIR_STRS)
 from metpy.deprecation import MetpyDeprecationWarning
 from metpy.testing import assert_almost_equal, assert_array_almost_equal, assert_array_equal
-from metpy.units import units
+from metpy.units import concatenate, units
 
 
 def test_resample_nn():
@@ -530,6 +531,27 @@ def test_lat_lon_grid_deltas_mismatched_shape():
         lat_lon_grid_deltas(lon, lat)
 
 
+def test_lat_lon_grid_deltas_cached():
+    """Test that lat_lon_grid_deltas reuses the deltas calculated for the same grid."""
+    _grid_deltas_cache.clear()
+    lat = np.arange(40, 50, 2.5)
+    lon = np.arange(-100, -90, 2.5)
+    dx, dy = lat_lon_grid_deltas(lon, lat)
+    truth_dx = dx.copy()
+    dx[0, 0] = 0 * units.m
+    dx2, dy2 = lat_lon_grid_deltas(lon.copy(), lat.copy())
+    assert len(_grid_deltas_cache) == 1
+
+    # Modifying the returned deltas should not change the cached values
+    assert_array_equal(dx2, truth_dx)
+    assert_array_equal(dy2, dy)
+
+    # Different ellipsoid should give different deltas
+    dx_wgs, _ = lat_lon_grid_deltas(lon, lat, ellps='WGS84')
+    assert len(_grid_deltas_cache) == 2
+    assert not np.allclose(dx_wgs, dx, rtol=1e-5)
+
+
 @pytest.fixture()
 def deriv_1d_data():
     """Return 1-dimensional data for testing derivative functions."""
@@ -600,6 +622,162 @@ def test_first_derivative_masked():
     assert_array_equal(df_dx.mask, truth.mask)
 
 
+def test_first_derivative_out(deriv_2d_data):
+    """Test first_derivative placing the result in a given array."""
+    out = np.empty_like(deriv_2d_data.f)
+    df_dx = first_derivative(deriv_2d_data.f, x=deriv_2d_data.x * units.m, axis=1, out=out)
+    assert df_dx.magnitude is out
+    assert df_dx.units == units('1 / m')
+    assert_array_equal(df_dx, first_derivative(deriv_2d_data.f, x=deriv_2d_data.x * units.m,
+                                               axis=1))
+
+
+def test_first_derivative_out_bad_shape(deriv_2d_data):
+    """Test first_derivative with an output array of the wrong shape."""
+    with pytest.raises(ValueError):
+        first_derivative(deriv_2d_data.f, x=deriv_2d_data.x, axis=1,
+                         out=np.empty(deriv_2d_data.f.shape[::-1]))
+
+
+def test_first_derivative_float32(deriv_2d_data):
+    """Test that first_derivative keeps the precision of float32 input."""
+    df_dx = first_derivative(deriv_2d_data.f.astype(np.float32), x=deriv_2d_data.x, axis=1)
+    assert df_dx.dtype == np.float32
+    assert_array_almost_equal(df_dx, first_derivative(deriv_2d_data.f, x=deriv_2d_data.x,
+                                                      axis=1), 5)
+
+
+def test_first_derivative_out_memory():
+    """Test that first_derivative doesn't need temporary arrays larger than the input."""
+    tracemalloc = pytest.importorskip('tracemalloc')
+    f = np.arange(4 * 200 * 300, dtype=np.float64).reshape(4, 200, 300) * units.K
+    out = np.empty(f.shape)
+    x = np.cumsum(np.linspace(1, 2, 300)) * units.km
+    first_derivative(f, x=x, axis=2, out=out)
+
+    tracemalloc.start()
+    try:
+        first_derivative(f, x=x, axis=2, out=out)
+        first_derivative(f, delta=2 * units.km, axis=1, out=out)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    assert peak < 1.2 * f.magnitude.nbytes
+
+
+@pytest.mark.parametrize('chunks', [(1, 5, 7), (3, 1, 4), (2, 20, 31)])
+@pytest.mark.parametrize('func', [first_derivative, second_derivative])
+def test_derivative_dask(func, chunks):
+    """Test that derivatives of chunked dask arrays match those of the full array."""
+    da = pytest.importorskip('dask.array')
+    f = np.random.RandomState(0).rand(3, 20, 31) * units.K
+    dx, dy = lat_lon_grid_deltas(np.linspace(0, 60, 31), np.linspace(10, 50, 20))
+    f_dask = units.Quantity(da.from_array(f.magnitude, chunks=chunks), f.units)
+
+    for kwargs in ({'delta': dx[None], 'axis': 2}, {'delta': dy[None], 'axis': 1},
+                   {'x': np.array([850., 700., 500.]) * units.hPa, 'axis': 0}):
+        truth = func(f, **kwargs)
+        deriv = func(f_dask, **kwargs)
+        assert isinstance(deriv.magnitude, da.Array)
+        assert deriv.units == truth.units
+        assert_array_equal(deriv.magnitude.compute(), truth.magnitude)
+
+
+@pytest.fixture()
+def periodic_data():
+    """Return data for testing derivatives on a periodic axis."""
+    x = np.linspace(0, 2 * np.pi, 36, endpoint=False)
+    return namedtuple('Periodic_Test_Data', 'x f')(x, np.sin(3 * x) * np.ones((2, 1)))
+
+
+@pytest.mark.parametrize('func', [first_derivative, second_derivative])
+def test_derivative_periodic(func):
+    """Test derivatives on a periodic axis with varying spacing."""
+    rs = np.random.RandomState(0)
+    f = rs.rand(4, 20) * units.K
+    delta = (rs.rand(20) + 0.5) * units.m
+
+    # Should match the derivative on a grid extended with the points across the boundary
+    extended = func(concatenate((f[:, -1:], f, f[:, :1]), axis=1), axis=1,
+                    delta=concatenate((delta[-1:], delta)))
+    deriv = func(f, axis=1, delta=delta, periodic=True)
+    assert_array_equal(deriv, extended[:, 1:-1])
+
+
+def test_first_derivative_periodic_edges(periodic_data):
+    """Test that the periodic first derivative is as accurate at the edges as elsewhere."""
+    df_dx = first_derivative(periodic_data.f, axis=1, delta=periodic_data.x[1], periodic=True)
+
+    # Compare with the points a period (12 points) away
+    error = df_dx - 3 * np.cos(3 * periodic_data.x)
+    assert_array_almost_equal(error[:, 0], error[:, 12], 10)
+    assert_array_almost_equal(error[:, -1], error[:, 23], 10)
+
+
+def test_first_derivative_spectral(periodic_data):
+    """Test the spectral first derivative."""
+    df_dx = first_derivative(periodic_data.f.astype(np.float32) * units.K, axis=1,
+                             delta=periodic_data.x[1] * units.m, spectral=True)
+    assert df_dx.dtype == np.float32
+    assert_array_almost_equal(df_dx, 3 * np.cos(3 * periodic_data.x) * np.ones((2, 1)) *
+                              units('K/m'), 5)
+
+
+def test_second_derivative_spectral(periodic_data):
+    """Test the spectral second derivative."""
+    d2f_dx2 = second_derivative(periodic_data.f, axis=1, delta=periodic_data.x[1],
+                                spectral=True)
+    assert_array_almost_equal(d2f_dx2, -9 * periodic_data.f, 10)
+
+
+def test_first_derivative_spectral_nonuniform():
+    """Test that spectral derivatives with varying spacing raise an error."""
+    with pytest.raises(ValueError):
+        first_derivative(np.arange(5.), delta=np.arange(1., 6.), spectral=True)
+
+
+def test_first_derivative_spectral_masked(periodic_data):
+    """Test that spectral derivatives mask every line containing a masked value."""
+    f = np.ma.array(periodic_data.f)
+    f[1, 4] = np.ma.masked
+    df_dx = first_derivative(f, axis=1, delta=periodic_data.x[1], spectral=True)
+
+    assert_array_equal(df_dx.mask, [[False] * f.shape[1], [True] * f.shape[1]])
+    assert_array_almost_equal(df_dx[0], 3 * np.cos(3 * periodic_data.x), 10)
+
+
+def test_first_derivative_periodic_delta_size():
+    """Test that periodic derivatives require a delta for every point."""
+    with pytest.raises(ValueError):
+        first_derivative(np.arange(5.), delta=np.ones(4), periodic=True)
+
+
+def test_first_derivative_periodic_x():
+    """Test that periodic derivatives with coordinates raise an error."""
+    with pytest.raises(ValueError):
+        first_derivative(np.arange(5.), x=np.arange(5.), periodic=True)
+
+
+def test_derivative_weights_cached(deriv_2d_data):
+    """Test that derivatives reuse the weights calculated for the same deltas."""
+    _derivative_weights_cache.clear()
+    x = deriv_2d_data.x * units.m
+    first_derivative(deriv_2d_data.f, axis=1, x=x)
+    second_derivative(deriv_2d_data.f, axis=1, x=x)
+    assert len(_derivative_weights_cache) == 2
+
+    # Different data on the same grid use the cached weights
+    df_dx = first_derivative(2 * deriv_2d_data.f, axis=1, x=x)
+    d2f_dx2 = second_derivative(2 * deriv_2d_data.f, axis=1, x=x)
+    assert len(_derivative_weights_cache) == 2
+    assert_array_almost_equal(df_dx, 2 * first_derivative(deriv_2d_data.f, axis=1, x=x), 6)
+    assert_array_almost_equal(d2f_dx2, np.full_like(deriv_2d_data.f, 2.) / units('m^2'), 6)
+
+    # A single delta doesn't need to be cached
+    first_derivative(deriv_2d_data.f, axis=1, delta=2 * units.m)
+    assert len(_derivative_weights_cache) == 2
+
+
 def test_second_derivative(deriv_1d_data):
     """Test second_derivative with a simple 1D array."""
     d2v_dx2 = second_derivative(deriv_1d_data.values, x=deriv_1d_data.x)
@@ -626,6 +804,15 @@ def test_second_derivative_too_small(deriv_1d_data):
         second_derivative(deriv_1d_data.values[None, :].T, x=deriv_1d_data.x, axis=1)
 
 
+def test_second_derivative_out_float32(deriv_2d_data):
+    """Test second_derivative placing the result in a float32 array."""
+    out = np.empty(deriv_2d_data.f.shape, dtype=np.float32)
+    df2_dx2 = second_derivative(deriv_2d_data.f, x=deriv_2d_data.x, axis=1, out=out)
+    assert df2_dx2 is out
+    assert_array_almost_equal(df2_dx2,
+                              np.ones_like(deriv_2d_data.f) * (2 * deriv_2d_data.a), 5)
+
+
 def test_second_derivative_scalar_delta():
     """Test second_derivative with a scalar passed for a delta."""
     df_dx = second_derivative(np.arange(3), delta=1)
@@ -959,6 +1146,45 @@ def test_second_derivative_xarray_lonlat(test_da_lonlat):
     assert deriv.metpy.units == truth.metpy.units
 
 
+def test_first_derivative_xarray_periodic():
+    """Test periodic and spectral derivatives of a DataArray on a global grid."""
+    lon = np.arange(0, 360, 10.)
+    ds = xr.Dataset({'temperature': (('lat', 'lon'),
+                                     np.sin(np.deg2rad(3 * lon)) * np.ones((3, 1)),
+                                     {'units': 'K'})},
+                    coords={'lat': ('lat', [-30., 0., 30.], {'units': 'degrees_north'}),
+                            'lon': ('lon', lon, {'units': 'degrees_east'})})
+    temperature = ds.metpy.parse_cf('temperature')
+
+    dx, dy = grid_deltas_from_dataarray(temperature, periodic=True)
+    assert dx.shape == (3, 36)
+    assert dy.shape == (2, 36)
+    assert_array_almost_equal(dx[:, -1], dx[:, 0], 4)
+
+    # Periodic should be as accurate at the edges as at points a period (12 points) away,
+    # compared to the (exact) spectral result
+    spectral = first_derivative(temperature, axis='lon', spectral=True)
+    deriv = first_derivative(temperature, axis='lon', periodic=True)
+    assert deriv.metpy.units == units('K/m')
+    error = (deriv - spectral).values
+    assert_array_almost_equal(error[:, 0], error[:, 12], 15)
+    assert_array_almost_equal(error[:, -1], error[:, 23], 15)
+
+
+def test_grid_deltas_from_dataarray_periodic_xy(test_da_xy):
+    """Test that periodic grid deltas are not supported for projected grids."""
+    with pytest.raises(ValueError):
+        grid_deltas_from_dataarray(test_da_xy, periodic=True)
+
+
+def test_first_derivative_xarray_dask(test_da_lonlat):
+    """Test first derivative of a DataArray backed by dask is calculated lazily."""
+    pytest.importorskip('dask')
+    deriv = first_derivative(test_da_lonlat.chunk({'lon': 2}), axis='lon')
+    assert not isinstance(deriv.data, np.ndarray)
+    xr.testing.assert_identical(deriv.compute(), first_derivative(test_da_lonlat, axis='lon'))
+
+
 def test_gradient_xarray(test_da_xy):
     """Test the 3D gradient calculation with a 4D DataArray in each axis usage."""
     deriv_x, deriv_y, deriv_p = gradient(test_da_xy, axes=('x', 'y', 'isobaric'))
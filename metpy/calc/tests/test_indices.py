@@ -8,11 +8,12 @@ import warnings
 
 import numpy as np
 
-from metpy.calc import (bulk_shear, bunkers_storm_motion, critical_angle,
-                        mean_pressure_weighted, precipitable_water,
-                        significant_tornado, supercell_composite)
+from metpy.calc import (bulk_shear, bulk_shear_grid, bunkers_storm_motion,
+                        bunkers_storm_motion_grid, critical_angle, mean_pressure_weighted,
+                        precipitable_water, significant_tornado, supercell_composite)
 from metpy.deprecation import MetpyDeprecationWarning
-from metpy.testing import assert_almost_equal, assert_array_equal, get_upper_air_data
+from metpy.testing import (assert_almost_equal, assert_array_almost_equal, assert_array_equal,
+                           get_upper_air_data)
 from metpy.units import concatenate, units
 
 warnings.simplefilter('ignore', MetpyDeprecationWarning)
@@ -118,6 +119,91 @@ def test_bulk_shear_elevated():
     assert_almost_equal(v, truth[1], 8)
 
 
+def _sounding_grid(*args):
+    """Repeat sounding profiles to make a (level, y, x) grid of columns."""
+    return [units.Quantity(np.tile(arg.magnitude[:, None, None], (1, 2, 3)), arg.units)
+            for arg in args]
+
+
+def test_bulk_shear_grid():
+    """Test gridded bulk shear with columns from an observed sounding."""
+    data = get_upper_air_data(datetime(2016, 5, 22, 0), 'DDC')
+    u, v = bulk_shear_grid(*_sounding_grid(data['pressure'], data['u_wind'],
+                                           data['v_wind'], data['height']),
+                           depth=6000 * units('meter'))
+    truth = [29.899581266946115, -14.389225800205509] * units('knots')
+    assert u.shape == (2, 3)
+    assert_array_almost_equal(u.to('knots'), np.full((2, 3), truth[0].m) * units.knots, 8)
+    assert_array_almost_equal(v.to('knots'), np.full((2, 3), truth[1].m) * units.knots, 8)
+
+
+def test_bulk_shear_grid_profiles():
+    """Test that gridded bulk shear matches that of each column."""
+    rng = np.random.RandomState(20190321)
+    heights = (np.cumsum(50 + 400 * rng.rand(30, 2, 3), axis=0) +
+               500 * rng.rand(2, 3)) * units.m
+    pressure = 1000 * np.exp(-heights.m / 8000) * units.hPa
+    u = 10 * rng.randn(30, 2, 3) * units('m/s')
+    v = 10 * rng.randn(30, 2, 3) * units('m/s')
+    u_shr, v_shr = bulk_shear_grid(pressure, u, v, heights, 3000. * units.m,
+                                   bottom=500. * units.m)
+    for ind in np.ndindex(2, 3):
+        column = (slice(None),) + ind
+        truth = bulk_shear(pressure[column], u[column], v[column], heights=heights[column],
+                           bottom=heights[column][0] + 500. * units.m, depth=3000. * units.m)
+        assert_almost_equal(u_shr[ind], truth[0], 4)
+        assert_almost_equal(v_shr[ind], truth[1], 4)
+
+
+def test_bulk_shear_grid_too_deep():
+    """Test that columns not reaching the top of the layer are NaN."""
+    data = get_upper_air_data(datetime(2016, 5, 22, 0), 'DDC')
+    u, v = bulk_shear_grid(*_sounding_grid(data['pressure'], data['u_wind'],
+                                           data['v_wind'], data['height']),
+                           depth=50 * units('km'))
+    assert np.isnan(u).all()
+    assert np.isnan(v).all()
+
+
+def test_bunkers_motion_grid():
+    """Test gridded Bunkers storm motion with columns from an observed sounding."""
+    data = get_upper_air_data(datetime(2016, 5, 22, 0), 'DDC')
+    motion = concatenate(bunkers_storm_motion_grid(*_sounding_grid(data['pressure'],
+                                                                   data['u_wind'],
+                                                                   data['v_wind'],
+                                                                   data['height'])))
+    truth = [1.4537892577864744, 2.0169333025630616, 10.587950761120482, 13.915130377372801,
+             6.0208700094534775, 7.9660318399679308] * units('m/s')
+    assert motion.shape == (6, 2, 3)
+    for ind in np.ndindex(2, 3):
+        assert_almost_equal(motion[(slice(None),) + ind], truth, 8)
+
+
+def test_bunkers_motion_grid_profiles():
+    """Test that gridded Bunkers storm motion matches that of each column."""
+    rng = np.random.RandomState(20190323)
+    heights = np.cumsum(50 + 400 * rng.rand(2, 3, 40), axis=-1) * units.m
+    pressure = 1000 * np.exp(-heights.m / 8000) * units.hPa
+    u = 10 * rng.randn(2, 3, 40) * units('m/s')
+    v = 10 * rng.randn(2, 3, 40) * units('knots')
+    motion = bunkers_storm_motion_grid(pressure, u, v, heights, axis=-1)
+    for ind in np.ndindex(2, 3):
+        truth = bunkers_storm_motion(pressure[ind], u[ind], v[ind], heights[ind])
+        for result, true_motion in zip(motion, truth):
+            assert_array_almost_equal(result[(slice(None),) + ind], true_motion, 8)
+
+
+def test_bunkers_motion_grid_too_shallow():
+    """Test that columns not reaching 6 km are NaN."""
+    data = get_upper_air_data(datetime(2016, 5, 22, 0), 'DDC')
+    shallow = data['height'] < data['height'][0] + 5 * units.km
+    right_mover, left_mover, wind_mean = bunkers_storm_motion_grid(
+        *_sounding_grid(data['pressure'][shallow], data['u_wind'][shallow],
+                        data['v_wind'][shallow], data['height'][shallow]))
+    assert np.isnan(right_mover).all()
+    assert np.isnan(wind_mean).all()
+
+
 def test_supercell_composite():
     """Test supercell composite function."""
     mucape = [2000., 1000., 500., 2000.] * units('J/kg')
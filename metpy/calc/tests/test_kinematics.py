@@ -10,12 +10,15 @@ import pytest
 import xarray as xr
 
 from metpy.calc import (absolute_vorticity, advection, ageostrophic_wind, coriolis_parameter,
-                        divergence, frontogenesis, geostrophic_wind, inertial_advective_wind,
-                        lat_lon_grid_deltas, montgomery_streamfunction,
-                        potential_temperature, potential_vorticity_baroclinic,
-                        potential_vorticity_barotropic, q_vector, shearing_deformation,
-                        static_stability, storm_relative_helicity, stretching_deformation,
-                        total_deformation, vorticity, wind_components)
+                        divergence, first_derivative, frontogenesis, geostrophic_wind,
+                        inertial_advective_wind, lat_lon_grid_deltas,
+                        montgomery_streamfunction, potential_temperature,
+                        potential_vorticity_baroclinic,
+                        potential_vorticity_baroclinic_levels, potential_vorticity_barotropic,
+                        q_vector, shearing_deformation, static_stability,
+                        storm_relative_helicity, storm_relative_helicity_grid,
+                        stretching_deformation, total_deformation,
+                        vorticity, wind_components, WindGradients)
 from metpy.constants import g, omega, Re
 from metpy.testing import (assert_almost_equal, assert_array_almost_equal, assert_array_equal,
                            get_test_data)
@@ -173,6 +176,103 @@ def test_frontogenesis_asym():
     assert_almost_equal(fronto, true_fronto.T)
 
 
+def test_wind_gradients_asym():
+    """Test wind gradients with a complicated field."""
+    u = np.array([[2, 4, 8], [0, 2, 2], [4, 6, 8]]) * units('m/s')
+    v = np.array([[6, 4, 8], [2, 6, 0], [2, 2, 6]]) * units('m/s')
+    theta = np.array([[303, 295, 305], [308, 310, 312], [299, 293, 289]]) * units('K')
+    grads = WindGradients(u, v, 1 * units.meters, 2 * units.meters)
+
+    true_vort = np.array([[-2.5, 3.5, 13.], [8.5, -1.5, -11.], [-5.5, -1.5, 0.]]) / units.sec
+    assert_array_equal(grads.vorticity, true_vort)
+    true_c = np.array([[-2, 5.5, -2.5], [2., 0.5, -1.5], [3., -1.5, 8.5]]) / units.sec
+    assert_array_equal(grads.divergence, true_c)
+    true_sh = np.array([[-7.5, -1.5, 1.], [9.5, -0.5, -11.], [1.5, 5.5, 12.]]) / units.sec
+    assert_array_equal(grads.shearing_deformation, true_sh)
+    true_st = np.array([[4., 0.5, 12.5], [4., 1.5, -0.5], [1., 5.5, -4.5]]) / units.sec
+    assert_array_equal(grads.stretching_deformation, true_st)
+    true_tdef = np.array([[8.5, 1.58113883, 12.5399362], [10.30776406, 1.58113883, 11.0113578],
+                          [1.80277562, 7.7781746, 12.8160056]]) / units.sec
+    assert_almost_equal(grads.total_deformation, true_tdef)
+    true_fronto = np.array([[-52.4746386, -37.3658646, -50.3996939],
+                            [3.5777088, -2.1221867, -16.9941166],
+                            [-23.1417334, 26.0499143, -158.4839684]]
+                           ) * units.K / units.meter / units.sec
+    assert_almost_equal(grads.frontogenesis(theta), true_fronto)
+    true_dvdx = np.array([[-5., 1., 7.], [9., -1., -11.], [-2., 2., 6.]]) / units.sec
+    assert_array_equal(grads.dvdx, true_dvdx)
+
+    # Only the four wind derivatives are ever calculated
+    assert len(grads._derivs) == 4
+
+
+def test_wind_gradients_xy():
+    """Test wind gradients with x, y ordered arrays."""
+    u = np.array([[2, 4, 8], [0, 2, 2], [4, 6, 8]]) * units('m/s')
+    v = np.array([[6, 4, 8], [2, 6, 0], [2, 2, 6]]) * units('m/s')
+    grads = WindGradients(u.T, v.T, 1 * units.meters, 2 * units.meters, dim_order='xy')
+    true_vort = np.array([[-2.5, 3.5, 13.], [8.5, -1.5, -11.], [-5.5, -1.5, 0.]]) / units.sec
+    assert_array_equal(grads.vorticity, true_vort.T)
+    assert_array_equal(grads.dudy, WindGradients(u, v, 1 * units.meters,
+                                                 2 * units.meters).dudy.T)
+
+
+@pytest.fixture
+def leading_dims_data():
+    """Test winds with a leading time dimension on a lat/lon grid."""
+    rng = np.random.RandomState(20190301)
+    u = 20 * rng.rand(3, 5, 7) * units('m/s')
+    v = 20 * rng.rand(3, 5, 7) * units('m/s')
+    lats = np.linspace(30, 40, 5)[:, None] * np.ones(7) * units.degrees
+    lons = np.ones(5)[:, None] * np.linspace(-100, -90, 7) * units.degrees
+    dx, dy = lat_lon_grid_deltas(lons, lats)
+    return u, v, dx, dy
+
+
+@pytest.mark.parametrize('func', [vorticity, divergence, shearing_deformation,
+                                  stretching_deformation, total_deformation])
+def test_kinematics_leading_dims(leading_dims_data, func):
+    """Test that leading dimensions are treated as separate grids with 2D grid spacing."""
+    u, v, dx, dy = leading_dims_data
+    truth = concatenate([func(u[i], v[i], dx, dy)[np.newaxis] for i in range(len(u))])
+    assert_array_equal(func(u, v, dx, dy), truth)
+
+
+@pytest.mark.parametrize('func', [vorticity, divergence, shearing_deformation,
+                                  stretching_deformation, total_deformation])
+def test_kinematics_axes(leading_dims_data, func):
+    """Test giving the x and y axes for arrays laid out as (x, y, time)."""
+    u, v, dx, dy = leading_dims_data
+    result = func(u.transpose(2, 1, 0), v.transpose(2, 1, 0), dx.T, dy.T, x_axis=0, y_axis=1)
+    assert result.flags['C_CONTIGUOUS']
+    assert_array_equal(result.transpose(2, 1, 0), func(u, v, dx, dy))
+
+
+def test_absolute_vorticity_axes(leading_dims_data):
+    """Test absolute vorticity with the time dimension last, using the x and y axes."""
+    u, v, dx, dy = leading_dims_data
+    lats = np.linspace(30, 40, 5)[:, None] * np.ones(7) * units.degrees
+    avor = absolute_vorticity(u.transpose(1, 2, 0), v.transpose(1, 2, 0), dx, dy, lats,
+                              x_axis=1, y_axis=0)
+    assert_array_equal(avor.transpose(2, 0, 1), absolute_vorticity(u, v, dx, dy, lats))
+
+
+def test_advection_leading_dims(leading_dims_data):
+    """Test advection of a field with a leading time dimension."""
+    u, v, dx, dy = leading_dims_data
+    s = u.magnitude * units.kelvin
+    truth = concatenate([advection(s[i], [u[i], v[i]], (dx, dy))[np.newaxis]
+                         for i in range(len(u))])
+    assert_array_equal(advection(s, [u, v], (dx, dy)), truth)
+
+
+def test_dim_order_and_axes():
+    """Test that giving both dim_order and the x and y axes raises an error."""
+    u = np.ones((3, 3)) * units('m/s')
+    with pytest.raises(ValueError):
+        vorticity(u, u, 1 * units.meter, 1 * units.meter, dim_order='xy', x_axis=0)
+
+
 def test_advection_uniform():
     """Test advection calculation for a uniform 1D field."""
     u = np.ones((3,)) * units('m/s')
@@ -200,6 +300,31 @@ def test_advection_1d():
     assert_array_equal(a, truth)
 
 
+@pytest.mark.parametrize('func, args', [
+    (vorticity, ('u', 'v')),
+    (total_deformation, ('u', 'v')),
+    (frontogenesis, ('theta', 'u', 'v')),
+    (q_vector, ('u', 'v', 'theta', 700 * units.hPa))])
+def test_kinematics_dask(func, args):
+    """Test that kinematics of DataArrays backed by dask are calculated lazily."""
+    pytest.importorskip('dask')
+    rs = np.random.RandomState(0)
+    fields = {'u': (rs.rand(10, 12) * 10, 'm/s'), 'v': (rs.rand(10, 12) * 10, 'm/s'),
+              'theta': (300 + rs.rand(10, 12), 'K')}
+    full = [xr.DataArray(fields[a][0], dims=('y', 'x'), attrs={'units': fields[a][1]})
+            if isinstance(a, str) else a for a in args]
+    chunked = [a.chunk({'y': 4, 'x': 5}) if isinstance(a, xr.DataArray) else a for a in full]
+
+    truth = func(*full, dx=2 * units.km, dy=3 * units.km)
+    result = func(*chunked, dx=2 * units.km, dy=3 * units.km)
+    if not isinstance(truth, tuple):
+        truth, result = (truth,), (result,)
+    for res, tr in zip(result, truth):
+        assert not isinstance(res.magnitude, np.ndarray)
+        assert res.units == tr.units
+        assert_array_equal(res.magnitude.compute(), tr.magnitude)
+
+
 def test_advection_2d_uniform():
     """Test advection for uniform 2D field."""
     u = np.ones((3, 3)) * units('m/s')
@@ -443,6 +568,66 @@ def test_storm_relative_helicity_agl():
     assert_almost_equal(total_srh, 300. * units('meter ** 2 / second ** 2 '), 6)
 
 
+def test_storm_relative_helicity_grid():
+    """Test gridded storm relative helicity with columns on varying terrain."""
+    u = np.array([-5, 15, 25, 15, -5]) * units('m/s')
+    v = np.array([40, 20, 10, 10, 30]) * units('m/s')
+    u = np.tile(u.to('knots').magnitude[:, None, None], (1, 2, 3)) * units.knots
+    v = np.tile(v.magnitude[:, None, None], (1, 2, 3)) * units('m/s')
+    heights = (np.arange(5)[:, None, None] * 100 + np.arange(6).reshape(2, 3) * 250) * units.m
+
+    pos_srh, neg_srh, total_srh = storm_relative_helicity_grid(u, v, heights,
+                                                               bottom=50 * units.meters,
+                                                               depth=300 * units.meters,
+                                                               storm_u=5 * units('m/s'),
+                                                               storm_v=10 * units('m/s'))
+    srh_units = units('meter ** 2 / second ** 2')
+    assert_array_almost_equal(pos_srh, np.full((2, 3), 400.) * srh_units, 6)
+    assert_array_almost_equal(neg_srh, np.full((2, 3), -100.) * srh_units, 6)
+    assert_array_almost_equal(total_srh, np.full((2, 3), 300.) * srh_units, 6)
+
+
+def test_storm_relative_helicity_grid_profiles():
+    """Test that gridded storm relative helicity matches that of each column."""
+    rng = np.random.RandomState(20190320)
+    heights = (np.cumsum(50 + 400 * rng.rand(20, 3, 4), axis=0) +
+               500 * rng.rand(3, 4)) * units.m
+    u = 10 * rng.randn(20, 3, 4) * units('m/s')
+    v = 10 * rng.randn(20, 3, 4) * units('m/s')
+    storm_u = 5 * rng.rand(3, 4) * units('m/s')
+    srh = storm_relative_helicity_grid(u, v, heights, 3 * units.km, bottom=500 * units.m,
+                                       storm_u=storm_u, storm_v=3 * units('m/s'))
+    for ind in np.ndindex(3, 4):
+        column = (slice(None),) + ind
+        truth = storm_relative_helicity(u[column], v[column], heights[column], 3 * units.km,
+                                        bottom=500 * units.m, storm_u=storm_u[ind],
+                                        storm_v=3 * units('m/s'))
+        for result, true_srh in zip(srh, truth):
+            assert_almost_equal(result[ind], true_srh, 8)
+
+
+def test_storm_relative_helicity_grid_axis():
+    """Test gridded storm relative helicity with levels along the last axis, top down."""
+    rng = np.random.RandomState(20190322)
+    heights = np.cumsum(50 + 400 * rng.rand(2, 3, 20), axis=-1) * units.m
+    u = 10 * rng.randn(2, 3, 20) * units('m/s')
+    v = 10 * rng.randn(2, 3, 20) * units('m/s')
+    truth = storm_relative_helicity_grid(np.moveaxis(u, -1, 0), np.moveaxis(v, -1, 0),
+                                         np.moveaxis(heights, -1, 0), 1 * units.km)
+    srh = storm_relative_helicity_grid(u[..., ::-1], v[..., ::-1], heights[..., ::-1],
+                                       1 * units.km, axis=-1)
+    for result, true_srh in zip(srh, truth):
+        assert_array_almost_equal(result, true_srh, 10)
+
+
+def test_storm_relative_helicity_grid_too_deep():
+    """Test that columns not reaching the top of the layer are NaN."""
+    u = np.ones((5, 2, 2)) * units('m/s')
+    heights = np.arange(5)[:, None, None] * np.ones((2, 2)) * 100 * units.m
+    pos_srh, neg_srh, total_srh = storm_relative_helicity_grid(u, u, heights, 1 * units.km)
+    assert np.isnan(total_srh).all()
+
+
 def test_absolute_vorticity_asym():
     """Test absolute vorticity calculation with a complicated field."""
     u = np.array([[2, 4, 8], [0, 2, 2], [4, 6, 8]]) * units('m/s')
@@ -631,6 +816,87 @@ def test_potential_vorticity_baroclinic_wrong_number_of_levels_axis_2(pv_data):
                                        dx, dy, lats, axis=1)
 
 
+@pytest.fixture
+def pv_levels_data():
+    """Test data for the batched PV calculation, with dimensions (time, level, y, x)."""
+    rng = np.random.RandomState(20190215)
+    shape = (2, 6, 5, 7)
+    potential_temperature = (300 + 10 * rng.rand(*shape)) * units.kelvin
+    u = 20 * rng.rand(*shape) * units('m/s')
+    v = 20 * rng.rand(*shape) * units('m/s')
+    pressure = np.linspace(1000, 500, shape[1]) * units.hPa
+    lats = np.linspace(30, 40, shape[2])[:, None] * np.ones(shape[3]) * units.degrees
+    return potential_temperature, pressure, u, v, 10 * units.km, 12 * units.km, lats
+
+
+def _pv_levels_truth(potential_temperature, pressure, u, v, dx, dy, lats):
+    """Calculate the PV on all levels in one go to check the batched calculation."""
+    stability = first_derivative(potential_temperature, x=pressure.reshape(1, -1, 1, 1),
+                                 axis=1)
+    avor = vorticity(u, v, dx, dy) + coriolis_parameter(lats)
+    return (-1 * avor * g * stability).to('K m^2 / (s kg)')
+
+
+@pytest.mark.parametrize('batch_size', [1, 2, 3, 8])
+def test_potential_vorticity_baroclinic_levels(pv_levels_data, batch_size):
+    """Test that batching the levels does not change the calculated PV."""
+    pvor = potential_vorticity_baroclinic_levels(*pv_levels_data, batch_size=batch_size)
+    assert pvor.units == units('K m^2 / (s kg)')
+    assert_array_equal(pvor, _pv_levels_truth(*pv_levels_data))
+
+
+def test_potential_vorticity_baroclinic_levels_full_pressure(pv_levels_data):
+    """Test the batched PV calculation with pressure given at every point."""
+    potential_temperature, pressure, u, v, dx, dy, lats = pv_levels_data
+    full_pressure = units.Quantity(np.broadcast_to(pressure.m.reshape(-1, 1, 1),
+                                                   potential_temperature.shape),
+                                   pressure.units)
+    pvor = potential_vorticity_baroclinic_levels(potential_temperature, full_pressure,
+                                                 u, v, dx, dy, lats, batch_size=2)
+    assert_array_equal(pvor, _pv_levels_truth(*pv_levels_data))
+
+
+def test_potential_vorticity_baroclinic_levels_middle(pv_levels_data):
+    """Test that the batched PV matches the 3-level calculation on interior levels."""
+    potential_temperature, pressure, u, v, dx, dy, lats = pv_levels_data
+    pvor = potential_vorticity_baroclinic_levels(potential_temperature[0], pressure,
+                                                 u[0], v[0], dx, dy, lats)
+    layer_pressure = pressure[1:4].reshape(-1, 1, 1) * np.ones((3, 5, 7))
+    truth = potential_vorticity_baroclinic(potential_temperature[0, 1:4], layer_pressure,
+                                           u[0, 2], v[0, 2], dx, dy, lats)
+    assert_array_almost_equal(pvor[2], truth, 12)
+
+
+def test_potential_vorticity_baroclinic_levels_float32(pv_levels_data):
+    """Test that single precision input stays single precision."""
+    potential_temperature, pressure, u, v, dx, dy, lats = pv_levels_data
+
+    def single(arr):
+        return units.Quantity(arr.magnitude.astype(np.float32), arr.units)
+
+    pvor = potential_vorticity_baroclinic_levels(single(potential_temperature), pressure,
+                                                 single(u), single(v), dx, dy, lats)
+    assert pvor.dtype == np.float32
+    truth = _pv_levels_truth(*pv_levels_data)
+    assert_array_almost_equal(pvor / np.abs(truth).max(), truth / np.abs(truth).max(), 5)
+
+
+def test_potential_vorticity_baroclinic_levels_too_few(pv_levels_data):
+    """Test that the batched PV calculation requires at least three levels."""
+    potential_temperature, pressure, u, v, dx, dy, lats = pv_levels_data
+    with pytest.raises(ValueError):
+        potential_vorticity_baroclinic_levels(potential_temperature[:, :2], pressure[:2],
+                                              u[:, :2], v[:, :2], dx, dy, lats)
+
+
+def test_potential_vorticity_baroclinic_levels_bad_pressure(pv_levels_data):
+    """Test that pressure must have a value for each level."""
+    potential_temperature, pressure, u, v, dx, dy, lats = pv_levels_data
+    with pytest.raises(ValueError):
+        potential_vorticity_baroclinic_levels(potential_temperature, pressure[:-1],
+                                              u, v, dx, dy, lats)
+
+
 def test_potential_vorticity_barotropic(pv_data):
     """Test the barotopic (Rossby) potential vorticity."""
     u, v, lats, _, dx, dy = pv_data
@@ -910,6 +1176,15 @@ def test_q_vector_without_static_stability(q_vector_data):
     assert_almost_equal(q2, q2_truth, 20)
 
 
+def test_wind_gradients_q_vector(q_vector_data):
+    """Test that the Q-vector from wind gradients matches the function."""
+    u, v, temp, p, dx, dy = q_vector_data
+    q1, q2 = WindGradients(u, v, dx, dy).q_vector(temp[1], p[1])
+    q1_truth, q2_truth = q_vector(u, v, temp[1], p[1], dx, dy)
+    assert_array_equal(q1, q1_truth)
+    assert_array_equal(q2, q2_truth)
+
+
 def test_q_vector_with_static_stability(q_vector_data):
     """Test the Q-vector function using static stability."""
     u, v, temp, p, dx, dy = q_vector_data
@@ -5,6 +5,7 @@
 from __future__ import division
 
 import functools
+import hashlib
 from operator import itemgetter
 import warnings
 
@@ -20,7 +21,7 @@ from scipy.spatial import cKDTree
 import xarray as xr
 
 from . import height_to_pressure_std, pressure_to_height_std
-from ..cbook import broadcast_indices
+from ..cbook import broadcast_indices, is_dask_array, LRUCache
 from ..deprecation import deprecated, metpyDeprecation
 from ..interpolate.one_dimension import interpolate_1d, interpolate_nans_1d, log_interpolate_1d
 from ..package_tools import Exporter
@@ -610,6 +611,67 @@ def get_layer(pressure, *args, **kwargs):
     return ret
 
 
+def _layer_segments(heights, bottom, depth, *args, **kwargs):
+    """Find the part of each segment between adjacent levels within a layer of every column.
+
+    The levels of `heights` and any other arrays lie along ``axis``, and the layer extends
+    from `bottom` to `bottom` + `depth` above the lowest level of each column. For each pair
+    of adjacent levels, the fractions of the way from the lower to the upper level where the
+    segment starts and ends within the layer are found. Segments outside of the layer have
+    the same start and end, and so are empty. This gives the same points as `get_layer` and
+    `get_layer_heights`, including the interpolated bounds, but for all columns at once.
+
+    Returns the start and end fractions, a mask of the columns that contain the whole layer,
+    and the magnitudes of the other arrays, with their levels along the first axis and
+    ordered from the ground up.
+    """
+    axis = kwargs.pop('axis', 0)
+
+    height_units = heights.units
+    arrs = [np.moveaxis(getattr(a, 'magnitude', a), axis, 0) for a in (heights,) + args]
+    if np.all(arrs[0][0] > arrs[0][-1]):
+        arrs = [a[::-1] for a in arrs]
+
+    # Heights above the lowest level
+    heights = arrs[0] - np.min(arrs[0], axis=0)
+    bottom = bottom.m_as(height_units)
+    top = bottom + depth.m_as(height_units)
+
+    lower = heights[:-1]
+    upper = heights[1:]
+    thickness = upper - lower
+    with np.errstate(divide='ignore', invalid='ignore'):
+        start = np.where(thickness > 0, (np.maximum(lower, bottom) - lower) / thickness, 0)
+        end = np.where(thickness > 0, (np.minimum(upper, top) - lower) / thickness, 0)
+    start = np.clip(start, 0, 1)
+    end = np.clip(end, start, 1)
+
+    complete = (bottom >= 0) & (top <= heights[-1])
+    return [start, end, complete] + arrs[1:]
+
+
+def _segment_values(values, fraction):
+    """Interpolate linearly to the given fractions of the way between adjacent levels."""
+    return values[:-1] + fraction * (values[1:] - values[:-1])
+
+
+def _log_pressure_fractions(pressure, fraction):
+    """Convert fractions of the way between levels in height to fractions in log-pressure.
+
+    The pressure at each point is interpolated linearly in height, and then the data are
+    interpolated in log-pressure, in the same way as `get_layer` finds the layer bounds.
+    Returns the converted fractions and the pressures.
+    """
+    log_pressure = np.log(pressure)
+    segment_pressure = _segment_values(pressure, fraction)
+    log_thickness = log_pressure[1:] - log_pressure[:-1]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        log_fraction = np.where(log_thickness != 0,
+                                (np.log(segment_pressure) - log_pressure[:-1]) / log_thickness,
+                                0)
+    return log_fraction, segment_pressure
+
+
 @exporter.export
 @preprocess_xarray
 @deprecated('0.9', addendum=(' This function has been moved to metpy.interpolate and renamed '
@@ -842,21 +904,32 @@ def lat_lon_grid_deltas(longitude, latitude, **kwargs):
     Accepts 1D, 2D, or higher arrays for latitude and longitude
     Assumes [..., Y, X] for >=2 dimensional arrays
 
-    """
-    from pyproj import Geod
+    The deltas for the most recently used grids are cached, since they only depend on the
+    grid, so repeated calls for the same grid are inexpensive.
 
+    """
     # Inputs must be the same number of dimensions
     if latitude.ndim != longitude.ndim:
         raise ValueError('Latitude and longitude must have the same number of dimensions.')
 
-    # If we were given 1D arrays, make a mesh grid
-    if latitude.ndim < 2:
-        longitude, latitude = np.meshgrid(longitude, latitude)
-
     geod_args = {'ellps': 'sphere'}
     if kwargs:
         geod_args = kwargs
 
+    key = (_array_key(longitude), _array_key(latitude), tuple(sorted(geod_args.items())))
+    dx, dy = _grid_deltas_cache.fetch(key, _calc_lat_lon_grid_deltas, longitude, latitude,
+                                      geod_args)
+    return dx * units.meter, dy * units.meter
+
+
+def _calc_lat_lon_grid_deltas(longitude, latitude, geod_args):
+    """Calculate the signed deltas (in meters) between points on a lat/lon grid."""
+    from pyproj import Geod
+
+    # If we were given 1D arrays, make a mesh grid
+    if latitude.ndim < 2:
+        longitude, latitude = np.meshgrid(longitude, latitude)
+
     g = Geod(**geod_args)
 
     forward_az, _, dy = g.inv(longitude[..., :-1, :], latitude[..., :-1, :],
@@ -867,11 +940,27 @@ def lat_lon_grid_deltas(longitude, latitude, **kwargs):
                               longitude[..., :, 1:], latitude[..., :, 1:])
     dx[(forward_az < 0.) | (forward_az > 180.)] *= -1
 
-    return dx * units.meter, dy * units.meter
+    # Keep the cached values from being modified
+    dx.flags.writeable = False
+    dy.flags.writeable = False
+    return dx, dy
+
+
+# The grid deltas and derivative weights only depend on the grid, so cache the most recent
+# to reuse them when calculating with several variables (or repeatedly) on the same grid.
+_grid_deltas_cache = LRUCache(maxsize=16)
+_derivative_weights_cache = LRUCache(maxsize=16)
+
+
+def _array_key(arr):
+    """Get a hashable key identifying the values (and units) of an array."""
+    mag = np.ascontiguousarray(getattr(arr, 'magnitude', arr))
+    return (mag.shape, mag.dtype.str, str(getattr(arr, 'units', '')),
+            hashlib.sha1(mag.view(np.uint8)).hexdigest())
 
 
 @exporter.export
-def grid_deltas_from_dataarray(f):
+def grid_deltas_from_dataarray(f, periodic=False):
     """Calculate the horizontal deltas between grid points of a DataArray.
 
     Calculate the signed delta distance between grid points of a DataArray in the horizontal
@@ -882,6 +971,10 @@ def grid_deltas_from_dataarray(f):
     f : `xarray.DataArray`
         Parsed DataArray on a latitude/longitude grid, in (..., lat, lon) or (..., y, x)
         dimension order
+    periodic : bool, optional
+        Whether the longitude wraps around the globe, in which case `dx` includes the delta
+        from the last point back to the first (one more than otherwise). Only supported for
+        latitude/longitude grids. Defaults to False.
 
     Returns
     -------
@@ -895,9 +988,16 @@ def grid_deltas_from_dataarray(f):
 
     """
     if f.metpy.crs['grid_mapping_name'] == 'latitude_longitude':
-        dx, dy = lat_lon_grid_deltas(f.metpy.x, f.metpy.y,
+        lon = f.metpy.x.metpy.unit_array
+        if periodic:
+            # Add the first longitude, one revolution later, to get the delta back to it
+            lon = concatenate((lon, lon[:1] + 360 * units.degrees))
+        dx, dy = lat_lon_grid_deltas(lon, f.metpy.y.metpy.unit_array,
                                      initstring=f.metpy.cartopy_crs.proj4_init)
-        slc_x = slc_y = tuple([np.newaxis] * (f.ndim - 2) + [slice(None)] * 2)
+        slc_x = tuple([np.newaxis] * (f.ndim - 2) + [slice(None)] * 2)
+        slc_y = tuple([np.newaxis] * (f.ndim - 2) + [slice(None), slice(None, f.metpy.x.size)])
+    elif periodic:
+        raise ValueError('Periodic deltas are only supported for latitude/longitude grids.')
     else:
         dx = np.diff(f.metpy.x.metpy.unit_array.to('m').magnitude) * units('m')
         dy = np.diff(f.metpy.y.metpy.unit_array.to('m').magnitude) * units('m')
@@ -917,20 +1017,23 @@ def xarray_derivative_wrap(func):
     def wrapper(f, **kwargs):
         if 'x' in kwargs or 'delta' in kwargs:
             # Use the usual DataArray to pint.Quantity preprocessing wrapper
-            return preprocess_xarray(func)(f, **kwargs)
+            return preprocess_xarray(func, dask=True)(f, **kwargs)
         elif isinstance(f, xr.DataArray):
             # Get axis argument, defaulting to first dimension
             axis = f.metpy.find_axis_name(kwargs.get('axis', 0))
 
             # Initialize new kwargs with the axis number
-            new_kwargs = {'axis': f.get_axis_num(axis)}
+            new_kwargs = {name: kwargs[name] for name in ('out', 'periodic', 'spectral')
+                          if name in kwargs}
+            new_kwargs['axis'] = f.get_axis_num(axis)
+            periodic = kwargs.get('periodic', False) or kwargs.get('spectral', False)
 
             if f[axis].attrs.get('axis') == 'T':
                 # Time coordinate, need to convert to seconds from datetimes
                 new_kwargs['x'] = f[axis].metpy.as_timestamp().metpy.unit_array
             elif CFConventionHandler.check_axis(f[axis], 'lon'):
                 # Longitude coordinate, need to get grid deltas
-                new_kwargs['delta'], _ = grid_deltas_from_dataarray(f)
+                new_kwargs['delta'], _ = grid_deltas_from_dataarray(f, periodic=periodic)
             elif CFConventionHandler.check_axis(f[axis], 'lat'):
                 # Latitude coordinate, need to get grid deltas
                 _, new_kwargs['delta'] = grid_deltas_from_dataarray(f)
@@ -938,12 +1041,18 @@ def xarray_derivative_wrap(func):
                 # General coordinate, use as is
                 new_kwargs['x'] = f[axis].metpy.unit_array
 
-            # Calculate and return result as a DataArray
-            result = func(f.metpy.unit_array, **new_kwargs)
-            return xr.DataArray(result.magnitude,
-                                coords=f.coords,
-                                dims=f.dims,
-                                attrs={'units': str(result.units)})
+            # Calculate and return result as a DataArray, leaving dask arrays unevaluated
+            values = (units.Quantity(f.data, f.metpy.units) if is_dask_array(f.data)
+                      else f.metpy.unit_array)
+            result = func(values, **new_kwargs)
+            result = xr.DataArray(result.magnitude,
+                                  coords=f.coords,
+                                  dims=f.dims,
+                                  attrs={'units': str(result.units)})
+
+            # Don't take the name of the dask array, if any
+            result.name = None
+            return result
         else:
             # Error
             raise ValueError('Must specify either "x" or "delta" for value positions when "f" '
@@ -984,6 +1093,22 @@ def first_derivative(f, **kwargs):
     delta : array-like, optional
         Spacing between the grid points in `f`. Should be one item less than the size
         of `f` along `axis`.
+    out : `numpy.ndarray`, optional
+        Array, with the same shape as `f`, in which to place the result. This avoids
+        allocating a new array for the result, and determines the precision used for the
+        calculation. By default, floating point input (e.g. float32) keeps its precision
+        and other input is calculated as float64.
+    periodic : bool, optional
+        Whether the grid is periodic along `axis`, such as longitude on a global grid. If
+        True, centered differences are used across the boundary, and `delta` must have the
+        same size as `f` along `axis`, with the last item the spacing from the last point
+        back to the first. For a DataArray on a longitude/latitude grid, this spacing is
+        calculated automatically. Defaults to False.
+    spectral : bool, optional
+        Whether to calculate the derivative using FFTs, which requires a periodic grid (as
+        for `periodic`) with uniform spacing along `axis`. This is much more accurate for
+        smooth fields, but a masked value masks the whole line along `axis` in the result.
+        Defaults to False.
 
     Returns
     -------
@@ -996,61 +1121,10 @@ def first_derivative(f, **kwargs):
 
     """
     n, axis, delta = _process_deriv_args(f, kwargs)
-
-    # create slice objects --- initially all are [:, :, ..., :]
-    slice0 = [slice(None)] * n
-    slice1 = [slice(None)] * n
-    slice2 = [slice(None)] * n
-    delta_slice0 = [slice(None)] * n
-    delta_slice1 = [slice(None)] * n
-
-    # First handle centered case
-    slice0[axis] = slice(None, -2)
-    slice1[axis] = slice(1, -1)
-    slice2[axis] = slice(2, None)
-    delta_slice0[axis] = slice(None, -1)
-    delta_slice1[axis] = slice(1, None)
-
-    combined_delta = delta[tuple(delta_slice0)] + delta[tuple(delta_slice1)]
-    delta_diff = delta[tuple(delta_slice1)] - delta[tuple(delta_slice0)]
-    center = (- delta[tuple(delta_slice1)] / (combined_delta * delta[tuple(delta_slice0)]) *
-              f[tuple(slice0)] +
-              delta_diff / (delta[tuple(delta_slice0)] * delta[tuple(delta_slice1)]) *
-              f[tuple(slice1)] +
-              delta[tuple(delta_slice0)] / (combined_delta * delta[tuple(delta_slice1)]) *
-              f[tuple(slice2)])
-
-    # Fill in "left" edge with forward difference
-    slice0[axis] = slice(None, 1)
-    slice1[axis] = slice(1, 2)
-    slice2[axis] = slice(2, 3)
-    delta_slice0[axis] = slice(None, 1)
-    delta_slice1[axis] = slice(1, 2)
-
-    combined_delta = delta[tuple(delta_slice0)] + delta[tuple(delta_slice1)]
-    big_delta = combined_delta + delta[tuple(delta_slice0)]
-    left = (- big_delta / (combined_delta * delta[tuple(delta_slice0)]) * f[tuple(slice0)] +
-            combined_delta / (delta[tuple(delta_slice0)] * delta[tuple(delta_slice1)]) *
-            f[tuple(slice1)] -
-            delta[tuple(delta_slice0)] / (combined_delta * delta[tuple(delta_slice1)]) *
-            f[tuple(slice2)])
-
-    # Now the "right" edge with backward difference
-    slice0[axis] = slice(-3, -2)
-    slice1[axis] = slice(-2, -1)
-    slice2[axis] = slice(-1, None)
-    delta_slice0[axis] = slice(-2, -1)
-    delta_slice1[axis] = slice(-1, None)
-
-    combined_delta = delta[tuple(delta_slice0)] + delta[tuple(delta_slice1)]
-    big_delta = combined_delta + delta[tuple(delta_slice1)]
-    right = (delta[tuple(delta_slice1)] / (combined_delta * delta[tuple(delta_slice0)]) *
-             f[tuple(slice0)] -
-             combined_delta / (delta[tuple(delta_slice0)] * delta[tuple(delta_slice1)]) *
-             f[tuple(slice1)] +
-             big_delta / (combined_delta * delta[tuple(delta_slice1)]) * f[tuple(slice2)])
-
-    return concatenate((left, center, right), axis=axis)
+    if kwargs.get('spectral', False):
+        return _spectral_derivative(f, delta, axis, 1, kwargs.get('out'))
+    return _derivative(_first_derivative_weights, f, delta, axis, kwargs.get('out'),
+                       kwargs.get('periodic', False))
 
 
 @exporter.export
@@ -1086,6 +1160,22 @@ def second_derivative(f, **kwargs):
     delta : array-like, optional
         Spacing between the grid points in `f`. There should be one item less than the size
         of `f` along `axis`.
+    out : `numpy.ndarray`, optional
+        Array, with the same shape as `f`, in which to place the result. This avoids
+        allocating a new array for the result, and determines the precision used for the
+        calculation. By default, floating point input (e.g. float32) keeps its precision
+        and other input is calculated as float64.
+    periodic : bool, optional
+        Whether the grid is periodic along `axis`, such as longitude on a global grid. If
+        True, centered differences are used across the boundary, and `delta` must have the
+        same size as `f` along `axis`, with the last item the spacing from the last point
+        back to the first. For a DataArray on a longitude/latitude grid, this spacing is
+        calculated automatically. Defaults to False.
+    spectral : bool, optional
+        Whether to calculate the derivative using FFTs, which requires a periodic grid (as
+        for `periodic`) with uniform spacing along `axis`. This is much more accurate for
+        smooth fields, but a masked value masks the whole line along `axis` in the result.
+        Defaults to False.
 
     Returns
     -------
@@ -1098,52 +1188,10 @@ def second_derivative(f, **kwargs):
 
     """
     n, axis, delta = _process_deriv_args(f, kwargs)
-
-    # create slice objects --- initially all are [:, :, ..., :]
-    slice0 = [slice(None)] * n
-    slice1 = [slice(None)] * n
-    slice2 = [slice(None)] * n
-    delta_slice0 = [slice(None)] * n
-    delta_slice1 = [slice(None)] * n
-
-    # First handle centered case
-    slice0[axis] = slice(None, -2)
-    slice1[axis] = slice(1, -1)
-    slice2[axis] = slice(2, None)
-    delta_slice0[axis] = slice(None, -1)
-    delta_slice1[axis] = slice(1, None)
-
-    combined_delta = delta[tuple(delta_slice0)] + delta[tuple(delta_slice1)]
-    center = 2 * (f[tuple(slice0)] / (combined_delta * delta[tuple(delta_slice0)]) -
-                  f[tuple(slice1)] / (delta[tuple(delta_slice0)] *
-                  delta[tuple(delta_slice1)]) +
-                  f[tuple(slice2)] / (combined_delta * delta[tuple(delta_slice1)]))
-
-    # Fill in "left" edge
-    slice0[axis] = slice(None, 1)
-    slice1[axis] = slice(1, 2)
-    slice2[axis] = slice(2, 3)
-    delta_slice0[axis] = slice(None, 1)
-    delta_slice1[axis] = slice(1, 2)
-
-    combined_delta = delta[tuple(delta_slice0)] + delta[tuple(delta_slice1)]
-    left = 2 * (f[tuple(slice0)] / (combined_delta * delta[tuple(delta_slice0)]) -
-                f[tuple(slice1)] / (delta[tuple(delta_slice0)] * delta[tuple(delta_slice1)]) +
-                f[tuple(slice2)] / (combined_delta * delta[tuple(delta_slice1)]))
-
-    # Now the "right" edge
-    slice0[axis] = slice(-3, -2)
-    slice1[axis] = slice(-2, -1)
-    slice2[axis] = slice(-1, None)
-    delta_slice0[axis] = slice(-2, -1)
-    delta_slice1[axis] = slice(-1, None)
-
-    combined_delta = delta[tuple(delta_slice0)] + delta[tuple(delta_slice1)]
-    right = 2 * (f[tuple(slice0)] / (combined_delta * delta[tuple(delta_slice0)]) -
-                 f[tuple(slice1)] / (delta[tuple(delta_slice0)] * delta[tuple(delta_slice1)]) +
-                 f[tuple(slice2)] / (combined_delta * delta[tuple(delta_slice1)]))
-
-    return concatenate((left, center, right), axis=axis)
+    if kwargs.get('spectral', False):
+        return _spectral_derivative(f, delta, axis, 2, kwargs.get('out'))
+    return _derivative(_second_derivative_weights, f, delta, axis, kwargs.get('out'),
+                       kwargs.get('periodic', False))
 
 
 @exporter.export
@@ -1257,6 +1305,312 @@ def laplacian(f, **kwargs):
     return laplac
 
 
+# Points used for the left (forward) edge, center, and right (backward) edge of the grid
+_derivative_point_slices = ((slice(None, 1), slice(1, 2), slice(2, 3)),
+                            (slice(None, -2), slice(1, -1), slice(2, None)),
+                            (slice(-3, -2), slice(-2, -1), slice(-1, None)))
+
+# On a periodic grid, the edges instead use the points on the other side of the boundary
+_periodic_point_slices = ((slice(-1, None), slice(None, 1), slice(1, 2)),
+                          (slice(None, -2), slice(1, -1), slice(2, None)),
+                          (slice(-2, -1), slice(-1, None), slice(None, 1)))
+
+# Part of the result calculated for each of these
+_derivative_out_slices = (slice(None, 1), slice(1, -1), slice(-1, None))
+
+
+def _delta_pairs(delta, axis, periodic=False):
+    """Get the pairs of adjacent deltas for the left edge, center, and right edge.
+
+    For a periodic grid, the last delta is the spacing from the last point back to the first.
+    """
+    if periodic:
+        pair_slices = ((slice(-1, None), slice(None, 1)), (slice(None, -2), slice(1, -1)),
+                       (slice(-2, -1), slice(-1, None)))
+    else:
+        pair_slices = ((slice(None, 1), slice(1, 2)), (slice(None, -1), slice(1, None)),
+                       (slice(-2, -1), slice(-1, None)))
+
+    pairs = []
+    for slc0, slc1 in pair_slices:
+        delta_slice0 = [slice(None)] * delta.ndim
+        delta_slice1 = [slice(None)] * delta.ndim
+        delta_slice0[axis] = slc0
+        delta_slice1[axis] = slc1
+        pairs.append((delta[tuple(delta_slice0)], delta[tuple(delta_slice1)]))
+    return pairs
+
+
+def _centered_first_derivative_weights(delta0, delta1):
+    """Calculate the weights for a centered first derivative between deltas."""
+    combined_delta = delta0 + delta1
+    delta_diff = delta1 - delta0
+    return (-delta1 / (combined_delta * delta0), delta_diff / (delta0 * delta1),
+            delta0 / (combined_delta * delta1))
+
+
+def _first_derivative_weights(delta, axis, periodic=False):
+    """Calculate the weights of the three points used for the first derivative.
+
+    This uses the formulation for irregular spacing specified by [Bowen2005]_.
+    """
+    pairs = _delta_pairs(delta, axis, periodic)
+    if periodic:
+        return tuple(_centered_first_derivative_weights(*pair) for pair in pairs)
+
+    (left0, left1), (center0, center1), (right0, right1) = pairs
+
+    # Centered difference
+    center = _centered_first_derivative_weights(center0, center1)
+
+    # Forward difference at the "left" edge
+    combined_delta = left0 + left1
+    big_delta = combined_delta + left0
+    left = (-big_delta / (combined_delta * left0), combined_delta / (left0 * left1),
+            -left0 / (combined_delta * left1))
+
+    # Backward difference at the "right" edge
+    combined_delta = right0 + right1
+    big_delta = combined_delta + right1
+    right = (right1 / (combined_delta * right0), -combined_delta / (right0 * right1),
+             big_delta / (combined_delta * right1))
+
+    return left, center, right
+
+
+def _second_derivative_weights(delta, axis, periodic=False):
+    """Calculate the weights of the three points used for the second derivative.
+
+    This uses the formulation for irregular spacing specified by [Bowen2005]_.
+    """
+    weights = []
+    for delta0, delta1 in _delta_pairs(delta, axis, periodic):
+        combined_delta = delta0 + delta1
+        weights.append((2 / (combined_delta * delta0), -2 / (delta0 * delta1),
+                        2 / (combined_delta * delta1)))
+    return tuple(weights)
+
+
+def _reduce_broadcast_delta(delta, axis, size):
+    """Reduce deltas broadcast (with 0 strides) from a single value to a smaller array.
+
+    Returns None if the deltas are not broadcast. Otherwise, `size` items are kept along
+    `axis` and a single item along other broadcast dimensions.
+    """
+    mag = getattr(delta, 'magnitude', delta)
+    broadcast = [dim_size > 1 and not stride
+                 for dim_size, stride in zip(mag.shape, mag.strides)]
+    if not any(broadcast):
+        return None
+
+    reduced = tuple(slice(None, size if dim == axis else 1) if bcast else slice(None)
+                    for dim, bcast in enumerate(broadcast))
+    delta_units = getattr(delta, 'units', None)
+    return mag[reduced] if delta_units is None else units.Quantity(mag[reduced], delta_units)
+
+
+def _derivative_weights(func, delta, axis, dtype, periodic=False):
+    """Get the weight magnitudes and units for a derivative with the given deltas.
+
+    The magnitudes are cast to `dtype`, and those calculated for the same deltas are reused.
+    """
+    # Single deltas are reduced to what is needed along each axis, which makes the weights
+    # small enough to not be worth caching.
+    reduced = _reduce_broadcast_delta(delta, axis, 3 if periodic else 2)
+    if reduced is not None:
+        return _weight_magnitudes(func(reduced, axis, periodic), dtype)
+
+    def calc():
+        weights, weight_units = _weight_magnitudes(func(delta, axis, periodic), dtype)
+        for part in weights:
+            for weight in part:
+                weight.flags.writeable = False
+        return weights, weight_units
+
+    key = (func.__name__, axis, periodic, np.dtype(dtype).str, _array_key(delta))
+    return _derivative_weights_cache.fetch(key, calc)
+
+
+def _weight_magnitudes(weights, dtype):
+    """Split the weights into magnitudes, cast to `dtype`, and their (common) units."""
+    weight_units = getattr(weights[1][0], 'units', None)
+    return (tuple(tuple(np.asarray(getattr(weight, 'magnitude', weight), dtype=dtype)
+                        for weight in part) for part in weights), weight_units)
+
+
+def _derivative(weights_func, f, delta, axis, out=None, periodic=False):
+    """Calculate a derivative of `f` along `axis` from the weights of three points.
+
+    The weighted values for each part of the grid are accumulated in place into `out`, using
+    a single scratch array, so that no other temporary arrays the size of `f` are needed.
+    """
+    f_mag = getattr(f, 'magnitude', f)
+    if is_dask_array(f_mag):
+        if out is not None:
+            raise ValueError('out is not supported for dask arrays.')
+        return _dask_derivative(weights_func, f, delta, axis, periodic)
+
+    mask = np.ma.getmask(f_mag)
+    f_mag = np.ma.getdata(f_mag)
+
+    if out is None:
+        out = np.empty(f_mag.shape, f_mag.dtype if f_mag.dtype.kind in 'fc' else np.float64)
+    else:
+        out = np.ma.getdata(getattr(out, 'magnitude', out))
+        if out.shape != f_mag.shape:
+            raise ValueError('out must have the same shape as f.')
+
+    weights, weight_units = _derivative_weights(weights_func, delta, axis, out.dtype,
+                                                periodic)
+    point_slices = _periodic_point_slices if periodic else _derivative_point_slices
+
+    def axis_slice(slc):
+        slices = [slice(None)] * f_mag.ndim
+        slices[axis] = slc
+        return tuple(slices)
+
+    scratch = np.empty_like(out[axis_slice(slice(1, -1))])
+    for part_weights, part_slices, out_slice in zip(weights, point_slices,
+                                                    _derivative_out_slices):
+        target = out[axis_slice(out_slice)]
+        temp = scratch[axis_slice(slice(None, target.shape[axis]))]
+        np.multiply(part_weights[0], f_mag[axis_slice(part_slices[0])], out=target)
+        for weight, point_slice in zip(part_weights[1:], part_slices[1:]):
+            np.multiply(weight, f_mag[axis_slice(point_slice)], out=temp)
+            target += temp
+
+    # Mask any points calculated using masked values
+    if mask is not np.ma.nomask:
+        out_mask = np.zeros(out.shape, dtype=np.bool_)
+        for part_slices, out_slice in zip(point_slices, _derivative_out_slices):
+            for point_slice in part_slices:
+                out_mask[axis_slice(out_slice)] |= mask[axis_slice(point_slice)]
+        out = np.ma.array(out, mask=out_mask, copy=False)
+
+    return _with_derivative_units(out, getattr(f, 'units', None), weight_units)
+
+
+def _with_derivative_units(result, f_units, weight_units):
+    """Attach the units for a derivative, given those of the values and weights."""
+    if f_units is None and weight_units is None:
+        return result
+
+    # Let pint work out the units, which handles (e.g.) converting offset temperature units
+    result_units = ((units.Quantity(1., f_units) if f_units is not None else 1.)
+                    * (units.Quantity(1., weight_units) if weight_units is not None else 1.))
+    return units.Quantity(result, result_units.units)
+
+
+def _dask_derivative(weights_func, f, delta, axis, periodic=False):
+    """Calculate a derivative of a dask array lazily, one chunk at a time.
+
+    Each chunk is extended by a halo of one point from its neighbors along `axis` using
+    `dask.array.Array.map_overlap`, so that centered differences are used everywhere but the
+    real edges of the grid, giving the same result as calculating on the whole array. For a
+    periodic grid, the halos at the edges wrap around from the other side.
+    """
+    f_mag = f.magnitude if hasattr(f, 'magnitude') else f
+    delta_mag = np.asarray(getattr(delta, 'magnitude', delta))
+    delta_units = getattr(delta, 'units', None)
+
+    # Edge chunks need at least two points of their own along the axis for the stencil, so
+    # merge any smaller chunks with their neighbor
+    axis_chunks = list(f_mag.chunks[axis])
+    while len(axis_chunks) > 1 and min(axis_chunks) < 2:
+        ind = axis_chunks.index(min(axis_chunks))
+        other = ind - 1 if ind == len(axis_chunks) - 1 else ind + 1
+        axis_chunks[min(ind, other)] += axis_chunks.pop(max(ind, other))
+    f_mag = f_mag.rechunk({axis: tuple(axis_chunks)})
+    starts = [np.cumsum((0,) + chunks[:-1]) for chunks in f_mag.chunks]
+
+    def block_derivative(block, block_info=None):
+        # Find the deltas for this chunk (including the halo) within the full grid
+        slices = []
+        for dim, (ind, size) in enumerate(zip(block_info[0]['chunk-location'], block.shape)):
+            start = starts[dim][ind]
+            if delta_mag.shape[dim] == 1:
+                slices.append(slice(None))
+            elif dim == axis and periodic:
+                slices.append(np.arange(start - 1, start + size - 2) % delta_mag.shape[dim])
+            elif dim == axis:
+                start -= 1 if ind else 0
+                slices.append(slice(start, start + size - 1))
+            else:
+                slices.append(slice(start, start + size))
+        block_delta = delta_mag[tuple(slices)]
+        if delta_units is not None:
+            block_delta = units.Quantity(block_delta, delta_units)
+        result = _derivative(weights_func, block, block_delta, axis)
+        return getattr(result, 'magnitude', result)
+
+    dtype = f_mag.dtype if f_mag.dtype.kind in 'fc' else np.dtype(np.float64)
+    result = f_mag.map_overlap(block_derivative, depth={axis: 1},
+                               boundary={axis: 'periodic' if periodic else 'none'},
+                               dtype=dtype)
+
+    # Get the units from the weights for the start of the grid
+    start = tuple(slice(None, 2 if dim == axis else 1) for dim in range(delta_mag.ndim))
+    weight_units = _derivative_weights(weights_func, delta[start], axis, dtype)[1]
+    return _with_derivative_units(result, getattr(f, 'units', None), weight_units)
+
+
+def _spectral_derivative(f, delta, axis, order, out=None):
+    """Calculate a derivative along a periodic axis with uniform spacing using FFTs."""
+    f_mag = getattr(f, 'magnitude', f)
+    delta_units = getattr(delta, 'units', None)
+    reduced = _reduce_broadcast_delta(delta, axis, 1)
+    delta_mag = np.asarray(getattr(delta if reduced is None else reduced, 'magnitude',
+                                   delta if reduced is None else reduced))
+
+    # The spacing can vary along other axes (e.g. longitude spacing with latitude), but
+    # not along the axis of the derivative
+    start = [slice(None)] * delta_mag.ndim
+    start[axis] = slice(None, 1)
+    spacing = delta_mag[tuple(start)]
+    if not np.allclose(delta_mag, spacing):
+        raise ValueError('Spectral derivatives require uniform spacing along the axis.')
+
+    # Wavenumbers for each of the Fourier components along the axis. For an even number of
+    # points, the first derivative of the Nyquist component is ambiguous, so drop it.
+    n = f_mag.shape[axis]
+    wavenumbers = 2 * np.pi * np.fft.rfftfreq(n)
+    if order == 1 and not n % 2:
+        wavenumbers[-1] = 0
+    wavenumbers = _broadcast_to_axis(wavenumbers, axis, f_mag.ndim) / spacing
+    factor = 1j * wavenumbers if order == 1 else -wavenumbers**2
+
+    if is_dask_array(f_mag):
+        if out is not None:
+            raise ValueError('out is not supported for dask arrays.')
+        import dask.array as da
+        fft = da.fft
+        mask = np.ma.nomask
+        f_mag = f_mag.rechunk({axis: -1})
+    else:
+        fft = np.fft
+        mask = np.ma.getmask(f_mag)
+        f_mag = np.ma.getdata(f_mag)
+
+    dtype = f_mag.dtype if f_mag.dtype.kind in 'fc' else np.dtype(np.float64)
+    result = fft.irfft(factor * fft.rfft(f_mag, axis=axis), n, axis=axis).astype(dtype)
+    if out is not None:
+        out = np.ma.getdata(getattr(out, 'magnitude', out))
+        if out.shape != f_mag.shape:
+            raise ValueError('out must have the same shape as f.')
+        out[...] = result
+        result = out
+
+    # Every point depends on the whole line along the axis, so mask any line with a masked
+    # value (which would otherwise be spread everywhere by the transform)
+    if mask is not np.ma.nomask:
+        out_mask = np.zeros(result.shape, dtype=np.bool_)
+        out_mask |= mask.any(axis=axis, keepdims=True)
+        result = np.ma.array(result, mask=out_mask, copy=False)
+
+    return _with_derivative_units(result, getattr(f, 'units', None),
+                                  None if delta_units is None else delta_units**-order)
+
+
 def _broadcast_to_axis(arr, axis, ndim):
     """Handle reshaping coordinate array to have proper dimensionality.
 
@@ -1309,6 +1663,7 @@ def _process_deriv_args(f, kwargs):
     if f.shape[axis] < 3:
         raise ValueError('f must have at least 3 point along the desired axis.')
 
+    periodic = kwargs.get('periodic', False) or kwargs.get('spectral', False)
     if 'delta' in kwargs:
         if 'x' in kwargs:
             raise ValueError('Cannot specify both "x" and "delta".')
@@ -1316,14 +1671,24 @@ def _process_deriv_args(f, kwargs):
         delta = atleast_1d(kwargs['delta'])
         if delta.size == 1:
             diff_size = list(f.shape)
-            diff_size[axis] -= 1
+            if not periodic:
+                diff_size[axis] -= 1
             delta_units = getattr(delta, 'units', None)
-            delta = np.broadcast_to(delta, diff_size, subok=True)
+            delta = np.broadcast_to(getattr(delta, 'magnitude', delta), diff_size)
             if delta_units is not None:
-                delta = delta * delta_units
+                # Wrap rather than multiply to avoid expanding the broadcast array
+                delta = units.Quantity(delta, delta_units)
         else:
             delta = _broadcast_to_axis(delta, axis, n)
+
+        if periodic and delta.shape[axis] != f.shape[axis]:
+            raise ValueError('Periodic derivatives require a "delta" for each point along the '
+                             'axis, including the spacing from the last point back to the '
+                             'first.')
     elif 'x' in kwargs:
+        if periodic:
+            raise ValueError('Periodic derivatives require "delta", including the spacing '
+                             'from the last point back to the first.')
         x = _broadcast_to_axis(kwargs['x'], axis, n)
         delta = diff(x, axis=axis)
     else:
@@ -3,8 +3,10 @@
 # SPDX-License-Identifier: BSD-3-Clause
 """Collection of generally useful utility code from the cookbook."""
 
+from collections import OrderedDict
 import os
 import os.path
+import threading
 
 from matplotlib.cbook import iterable
 import numpy as np
@@ -21,6 +23,11 @@ def is_string_like(s):
     return isinstance(s, string_type)
 
 
+def is_dask_array(arr):
+    """Check if an object is a dask array, without needing dask to be installed."""
+    return type(arr).__module__.split('.', 1)[0] == 'dask'
+
+
 def get_test_data(fname, as_file_obj=True):
     """Access a file from MetPy's collection of test data."""
     # Look for an environment variable to point to the test data. If not, try looking at
@@ -74,6 +81,72 @@ class Registry(object):
         return self._registry[name]
 
 
+class LRUCache(object):
+    """Provide a simple, thread-safe cache of limited size.
+
+    When the cache is full, the least recently used item is discarded to make room.
+    """
+
+    def __init__(self, maxsize=128):
+        """Initialize an empty cache.
+
+        Parameters
+        ----------
+        maxsize : int, optional
+            The maximum number of items to keep in the cache. Defaults to 128.
+
+        """
+        self.maxsize = maxsize
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def fetch(self, key, func, *args, **kwargs):
+        """Return the item cached under key, calling a function to create it if needed.
+
+        Parameters
+        ----------
+        key : hashable
+            The key for the item
+        func : callable
+            Called with any remaining arguments to create the item if it is not found
+
+        """
+        try:
+            return self[key]
+        except KeyError:
+            item = func(*args, **kwargs)
+            self[key] = item
+            return item
+
+    def clear(self):
+        """Remove all items from the cache."""
+        with self._lock:
+            self._items.clear()
+
+    def __getitem__(self, key):
+        """Return the item cached under key, marking it as most recently used."""
+        with self._lock:
+            item = self._items.pop(key)
+            self._items[key] = item
+            return item
+
+    def __setitem__(self, key, item):
+        """Add an item to the cache, discarding the least recently used if full."""
+        with self._lock:
+            self._items.pop(key, None)
+            self._items[key] = item
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+
+    def __contains__(self, key):
+        """Return whether an item is cached under key."""
+        return key in self._items
+
+    def __len__(self):
+        """Return the number of items in the cache."""
+        return len(self._items)
+
+
 def broadcast_indices(x, minv, ndim, axis):
     """Calculate index values to properly broadcast index array within data array.
 
@@ -91,4 +164,5 @@ def broadcast_indices(x, minv, ndim, axis):
     return tuple(ret)
 
 
-__all__ = ('Registry', 'broadcast_indices', 'get_test_data', 'is_string_like', 'iterable')
+__all__ = ('LRUCache', 'Registry', 'broadcast_indices', 'get_test_data', 'is_dask_array',
+           'is_string_like', 'iterable')
@@ -7,8 +7,10 @@ that are already in memory (using :class:`python:io.StringIO`) or remote files
 (using :func:`~python:urllib.request.urlopen`).
 """
 
+from .backends import *  # noqa: F403
 from .gini import *  # noqa: F403
 from .nexrad import *  # noqa: F403
 
 __all__ = gini.__all__[:]  # pylint: disable=undefined-variable
 __all__.extend(nexrad.__all__)  # pylint: disable=undefined-variable
+__all__.extend(backends.__all__)  # pylint: disable=undefined-variable
@@ -4,6 +4,8 @@
 
 # flake8: noqa
 # Generated file -- do not modify
+from .._tools import DictStruct
+
 descriptions = {"ADAP_FILE_NAME": "NAME OF ADAPTATION DATA FILE",
                 "ADAP_FORMAT": "FORMAT OF ADAPTATION DATA FILE",
                 "ADAP_REVISION": "REVISION NUMBER OF ADAPTATION DATA FILE",
@@ -747,3 +749,6 @@ fields = [("ADAP_FILE_NAME", "12s"),
           ("REFLECTOR_BIAS", "f"),
           ("A_MIN_SHELTER_TEMP_WARN", "f"),
           (None, "432x")]
+
+# Struct to decode the message, assembled once on import
+msg_fmt = DictStruct(fields, '>')
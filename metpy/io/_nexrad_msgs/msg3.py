@@ -4,6 +4,8 @@
 
 # flake8: noqa
 # Generated file -- do not modify
+from .._tools import DictStruct
+
 descriptions = {"T1_Output_Frames": "The number of octets received on interface, including frame octets (octet)",
                 "T1_Input_Frames": "The number of octets sent on interface, including frame octets (octet)",
                 "Router_Memory_Used": "Bytes currently in use by applications on managed device (byte)",
@@ -402,3 +404,6 @@ fields = [(None, "2x"),
           (None, "2x"),
           ("Performance_Check_Time", "L"),
           (None, "20x")]
+
+# Struct to decode the message, assembled once on import
+msg_fmt = DictStruct(fields, '>')
@@ -157,6 +157,7 @@ def write_file(fname, info):
         outfile.write('# SPDX-License-Identifier: BSD-3-Clause\n\n')
         outfile.write('# flake8: noqa\n')
         outfile.write('# Generated file -- do not modify\n')
+        outfile.write('from .._tools import DictStruct\n\n')
 
         # Variable descriptions
         outfile.write('descriptions = {')
@@ -170,7 +171,11 @@ def write_file(fname, info):
         outdata = ',\n          '.join('({fname}, "{fmt}")'.format(
             fname=field_name(i), **i) for i in info)
         outfile.write(outdata)
-        outfile.write(']\n')
+        outfile.write(']\n\n')
+
+        # The struct for decoding, so that it is only assembled once
+        outfile.write('# Struct to decode the message, assembled once on import\n')
+        outfile.write("msg_fmt = DictStruct(fields, '>')\n")
 
 if __name__ == '__main__':
     import os.path
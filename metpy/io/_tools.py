@@ -5,13 +5,23 @@
 
 from __future__ import print_function
 
+import bisect
 import bz2
 from collections import namedtuple
 import gzip
+import hashlib
+from io import BytesIO
 import logging
+import mmap
+import os
+import pickle
 from struct import Struct
+import tempfile
+import threading
 import zlib
 
+import numpy as np
+
 from ..units import UndefinedUnitError, units
 
 logging.basicConfig(level=logging.WARNING)
@@ -27,23 +37,111 @@ except NameError:
     bytearray_to_buff = memoryview
 
 
+# Leading bytes that identify compressed data
+GZIP_MAGIC = b'\x1f\x8b'
+BZIP2_MAGIC = b'BZh'
+
+
+def is_bytes_like(obj):
+    """Check if an object holds binary data, rather than being a filename.
+
+    On Python 2, `bytes` is `str`, so only `bytearray` and `memoryview` are recognized.
+    """
+    return (isinstance(obj, (bytearray, memoryview))
+            or (isinstance(obj, bytes) and not isinstance(obj, str)))
+
+
 def open_as_needed(filename):
-    """Return a file-object given either a filename or an object.
+    """Return a file-object given either a filename, binary data, or an object.
 
-    Handles opening with the right class based on the file extension.
+    Filenames and binary data compressed using gzip or bzip2 are recognized from their
+    leading bytes and decompressed as they are read. File-like objects are returned as-is.
 
     """
     if hasattr(filename, 'read'):
         return filename
 
-    if filename.endswith('.bz2'):
+    if is_bytes_like(filename):
+        data = filename
+        start = bytes(data[:3])
+        if start.startswith(GZIP_MAGIC):
+            return gzip.GzipFile(fileobj=BytesIO(data), mode='rb')
+        elif start.startswith(BZIP2_MAGIC):
+            return BytesIO(bz2.decompress(data))
+        return BufferReader(data)
+
+    with open(filename, 'rb') as fobj:
+        start = fobj.read(3)
+
+    if start.startswith(BZIP2_MAGIC):
         return bz2.BZ2File(filename, 'rb')
-    elif filename.endswith('.gz'):
+    elif start.startswith(GZIP_MAGIC):
         return gzip.GzipFile(filename, 'rb')
     else:
         return open(filename, 'rb')
 
 
+class BufferReader(object):
+    """Provide a read-only file-like object for binary data in memory.
+
+    Unlike :class:`io.BytesIO`, reading all of a `bytes` object returns it without making
+    a copy. Partial reads return `bytes`.
+    """
+
+    def __init__(self, data):
+        """Initialize the reader at the start of the data."""
+        self._data = data
+        self._offset = 0
+
+    def read(self, size=-1):
+        """Read and return up to `size` bytes, or all remaining bytes if not given."""
+        if size is None or size < 0:
+            size = len(self._data) - self._offset
+
+        start = self._offset
+        self._offset = min(start + size, len(self._data))
+
+        # Avoid copying when reading everything. Only bytes is immutable, so other
+        # objects are returned as a memoryview (which IOBuffer copies)
+        if start == 0 and self._offset == len(self._data):
+            return self._data if isinstance(self._data, bytes) else memoryview(self._data)
+        return bytes(self._data[start:self._offset])
+
+    def tell(self):
+        """Return the current position."""
+        return self._offset
+
+    def seek(self, offset, whence=0):
+        """Change the current position."""
+        if whence == 1:
+            offset += self._offset
+        elif whence == 2:
+            offset += len(self._data)
+        self._offset = max(offset, 0)
+        return self._offset
+
+    def close(self):
+        """Release the data."""
+        self._data = b''
+
+
+def map_as_needed(fobj):
+    """Return the contents of a file object, memory-mapping them when possible.
+
+    Only uncompressed files on disk, read from the beginning, can be mapped; the contents
+    of any other file-like object are read into memory instead.
+
+    """
+    if not isinstance(fobj, (bz2.BZ2File, gzip.GzipFile)):
+        try:
+            if fobj.tell() == 0:
+                return mmap.mmap(fobj.fileno(), 0, access=mmap.ACCESS_READ)
+        except (AttributeError, EnvironmentError, ValueError):
+            # Not a real file (or it's empty), so fall back to reading
+            pass
+    return fobj.read()
+
+
 class UnitLinker(object):
     r"""Wrap a :class:`metpy.io.cdm.Variable` and handle units.
 
@@ -90,6 +188,31 @@ class UnitLinker(object):
             self._unit = units(val)
 
 
+# Keep track of the namedtuple classes created by NamedStruct so that the instances can be
+# pickled (e.g. to send between processes), even though the classes aren't module-level.
+_named_tuples = {}
+
+
+def _named_tuple(tuple_name, fields):
+    """Get the (cached) namedtuple class with the given name and fields."""
+    key = (tuple_name, tuple(fields))
+    if key not in _named_tuples:
+        tuple_class = namedtuple(tuple_name, fields)
+        tuple_class.__reduce__ = _reduce_named_tuple
+        _named_tuples[key] = tuple_class
+    return _named_tuples[key]
+
+
+def _reduce_named_tuple(self):
+    """Reduce a NamedStruct tuple instance for pickling."""
+    return _unpickle_named_tuple, (type(self).__name__, self._fields, tuple(self))
+
+
+def _unpickle_named_tuple(tuple_name, fields, items):
+    """Recreate a NamedStruct tuple instance when unpickling."""
+    return _named_tuple(tuple_name, fields)(*items)
+
+
 class NamedStruct(Struct):
     """Parse bytes using :class:`Struct` but provide named fields."""
 
@@ -105,7 +228,7 @@ class NamedStruct(Struct):
                 self.converters[ind - conv_off] = i[-1]
             elif not i[0]:  # Skip items with no name
                 conv_off += 1
-        self._tuple = namedtuple(tuple_name, ' '.join(n for n in names if n))
+        self._tuple = _named_tuple(tuple_name, [n for n in names if n])
         super(NamedStruct, self).__init__(prefmt + ''.join(f for f in fmts if f))
 
     def _create(self, items):
@@ -224,12 +347,20 @@ class Array(object):
         return list(self._struct.unpack(buf))
 
 
+# Types that IOBuffer can use without copying. Indexing a Python 2 str gives characters
+# instead of integers, so those need to be copied into a bytearray.
+_buffer_types = (bytearray,) if bytes is str else (bytes, bytearray)
+
+
 class IOBuffer(object):
     """Holds bytes from a buffer to simplify parsing and random access."""
 
     def __init__(self, source):
-        """Initialize the IOBuffer with the source data."""
-        self._data = bytearray(source)
+        """Initialize the IOBuffer with the source data.
+
+        `bytes` (on Python 3) and `bytearray` are used directly, rather than copied.
+        """
+        self._data = source if isinstance(source, _buffer_types) else bytearray(source)
         self._offset = 0
         self.clear_marks()
 
@@ -290,6 +421,15 @@ class IOBuffer(object):
 
         return list(self.read_struct(Struct(order + '{:d}'.format(int(num)) + item_type)))
 
+    def read_array(self, count, dtype):
+        """Parse the current buffer offset as an array of `count` items of `dtype`.
+
+        The returned array is a view of the buffer, rather than a copy.
+        """
+        arr = np.frombuffer(self._data, dtype=dtype, count=count, offset=self._offset)
+        self.skip(arr.nbytes)
+        return arr
+
     def read_int(self, code):
         """Parse the current buffer offset as the specified integer code."""
         return self.read_struct(Struct(code))[0]
@@ -339,16 +479,21 @@ class IOBuffer(object):
         return len(self._data)
 
 
-def zlib_decompress_all_frames(data):
+def zlib_decompress_all_frames(data, max_length=None):
     """Decompress all frames of zlib-compressed bytes.
 
     Repeatedly tries to decompress `data` until all data are decompressed, or decompression
-    fails. This will skip over bytes that are not compressed with zlib.
+    fails. This will skip over bytes that are not compressed with zlib. Frames are found by
+    offset, rather than by copying the remaining data, and the results are gathered into a
+    single buffer once the size of every frame is known.
 
     Parameters
     ----------
     data : bytearray or bytes
         Binary data compressed using zlib.
+    max_length : int, optional
+        Stop decompressing once this many bytes have been decompressed. Defaults to `None`,
+        which decompresses everything.
 
     Returns
     -------
@@ -356,17 +501,268 @@ def zlib_decompress_all_frames(data):
             All decompressed bytes
 
     """
-    frames = bytearray()
-    data = bytes(data)
-    while data:
+    buff = bytearray_to_buff(data)
+    frames = [buff[start:end] if frame is None else frame
+              for start, end, frame in zlib_frames(data, max_length=max_length)]
+
+    decompressed = bytearray(sum(len(frame) for frame in frames))
+    offset = 0
+    for frame in frames:
+        decompressed[offset:offset + len(frame)] = frame
+        offset += len(frame)
+    return decompressed
+
+
+def zlib_frames(data, offset=0, chunk_size=65536, max_length=None):
+    """Iterate over the zlib-compressed frames in a block of data.
+
+    Frames are found by walking through `data` by offset, handing the decompressor at most
+    `chunk_size` bytes at a time, so that the remaining data are never copied. Iteration stops
+    with the first bytes that are not compressed with zlib; these are yielded as a final,
+    uncompressed frame that runs to the end of `data`.
+
+    Parameters
+    ----------
+    data : bytes-like
+        Binary data compressed using zlib.
+    offset : int, optional
+        The offset in `data` of the first frame. Defaults to 0.
+    chunk_size : int, optional
+        The number of bytes to decompress at a time. Defaults to 65536.
+    max_length : int, optional
+        Stop once this many bytes have been decompressed, in which case the last frame
+        is incomplete. Defaults to `None`, which decompresses everything.
+
+    Yields
+    ------
+    start : int
+        The offset in `data` where the frame starts
+    end : int
+        The offset in `data` where the frame ends
+    frame : bytes or None
+        The decompressed bytes of the frame, or `None` if the bytes are not compressed.
+
+    """
+    buff = bytearray_to_buff(data)
+    total = 0
+    while offset < len(data) and (max_length is None or total < max_length):
         decomp = zlib.decompressobj()
+        parts = []
+        pos = offset
+
+        # Start small and grow, so that little is left over (and copied) for small frames
+        size = min(1024, chunk_size)
         try:
-            frames.extend(decomp.decompress(data))
-            data = decomp.unused_data
+            while (pos < len(data) and not decomp.unused_data
+                   and (max_length is None or total < max_length)):
+                chunk = buff[pos:pos + size]
+                size = min(2 * size, chunk_size)
+                if max_length is None:
+                    parts.append(decomp.decompress(chunk))
+                else:
+                    parts.append(decomp.decompress(chunk, max_length - total))
+                total += len(parts[-1])
+                pos += len(chunk) - len(decomp.unconsumed_tail)
         except zlib.error:
-            frames.extend(data)
-            break
-    return frames
+            yield offset, len(data), None
+            return
+
+        end = pos - len(decomp.unused_data)
+        yield offset, end, b''.join(parts)
+        offset = end
+
+
+class IndexedZlibData(object):
+    """Provide random access to a block of data made up of zlib-compressed frames.
+
+    The locations of the frames are found (and remembered) only as far into the data as
+    needed, and only the frames holding the requested bytes are decompressed. Data that are
+    not compressed are accessed directly, without any copying.
+    """
+
+    def __init__(self, data, offset=0):
+        """Initialize the index for `data`, whose first frame starts at `offset`."""
+        self._data = data
+        self._frames = zlib_frames(data, offset)
+        self._starts = []
+        self._locations = []
+        self._size = 0
+        self.complete = False
+        self._lock = threading.Lock()
+
+    @property
+    def compressed(self):
+        """Whether the data start with a zlib-compressed frame."""
+        self._index_to(1)
+        return bool(self._locations) and self._locations[0][-1]
+
+    def _index_to(self, stop):
+        """Find frames until those covering the decompressed bytes up to `stop` are known."""
+        with self._lock:
+            while not self.complete and (stop is None or self._size < stop):
+                try:
+                    start, end, frame = next(self._frames)
+                except StopIteration:
+                    self.complete = True
+                    break
+
+                self._starts.append(self._size)
+                self._locations.append((start, end, frame is not None))
+                self._size += end - start if frame is None else len(frame)
+
+    def read(self, start, stop=None):
+        """Return the decompressed bytes from `start` up to `stop`."""
+        if self._data is None:
+            raise ValueError('I/O operation on closed data.')
+
+        self._index_to(stop)
+        if stop is None or stop > self._size:
+            stop = self._size
+        if start >= stop:
+            return b''
+
+        buff = bytearray_to_buff(self._data)
+        first = bisect.bisect_right(self._starts, start) - 1
+        last = bisect.bisect_left(self._starts, stop)
+        parts = []
+        for frame_start, (src_start, src_end, compressed) in zip(self._starts[first:last],
+                                                                 self._locations[first:last]):
+            if compressed:
+                frame = zlib.decompressobj().decompress(buff[src_start:src_end])
+            else:
+                frame = buff[src_start:src_end]
+            parts.append(frame[max(start - frame_start, 0):stop - frame_start])
+
+        return parts[0] if len(parts) == 1 else b''.join(parts)
+
+    def __len__(self):
+        """Return the total number of decompressed bytes."""
+        self._index_to(None)
+        return self._size
+
+    def close(self):
+        """Release the underlying data, so that it can no longer be read."""
+        with self._lock:
+            # The frame generator holds a view of the data, which would keep it alive
+            self._frames.close()
+            self._data = None
+            self.complete = True
+
+
+class DiskCache(object):
+    """Keep pickled items in a directory, limiting the total size on disk.
+
+    This is safe to share between processes. Items are written to a temporary file that is
+    then renamed into place, so readers never see a partially-written item and concurrent
+    writers of an item simply replace each other's copy. Once the total size exceeds the
+    limit, the least recently used items are removed.
+
+    Since unpickling can run arbitrary code, the directory should only be writable by
+    trusted users.
+    """
+
+    suffix = '.pkl'
+
+    def __init__(self, directory, max_size=2 ** 30):
+        """Initialize the cache, creating the directory if necessary.
+
+        Parameters
+        ----------
+        directory : str
+            The directory in which to keep items
+        max_size : int, optional
+            The maximum total size of the items in bytes. Defaults to 1 GiB.
+
+        """
+        self.directory = directory
+        self.max_size = max_size
+        try:
+            os.makedirs(directory)
+        except OSError:
+            if not os.path.isdir(directory):
+                raise
+
+    def _path(self, key):
+        """Get the path of the file for an item."""
+        digest = hashlib.sha1(repr(key).encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, digest + self.suffix)
+
+    def get(self, key):
+        """Return the item cached under key, or `None` if it is not found."""
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as fobj:
+                item = pickle.load(fobj)
+        except EnvironmentError:
+            return None
+        except Exception:  # Anything unpickling an item written by another version
+            log.debug('Removing unreadable cache item %s', path, exc_info=True)
+            self._remove(path)
+            return None
+
+        # Mark the item as recently used
+        try:
+            os.utime(path, None)
+        except EnvironmentError:
+            pass
+        return item
+
+    def put(self, key, item):
+        """Cache an item under key, removing old items if the cache is too big."""
+        fd, tmp_path = tempfile.mkstemp(suffix='.tmp', dir=self.directory)
+        try:
+            with os.fdopen(fd, 'wb') as fobj:
+                pickle.dump(item, fobj, pickle.HIGHEST_PROTOCOL)
+            _replace(tmp_path, self._path(key))
+        except EnvironmentError:
+            # Can fail (e.g. on Windows) if another process has the item open. This is fine,
+            # since the other process has cached the same item.
+            log.debug('Unable to cache item %s', key, exc_info=True)
+            self._remove(tmp_path)
+            return
+
+        self._evict()
+
+    def clear(self):
+        """Remove all items from the cache."""
+        for _, _, path in self._items():
+            self._remove(path)
+
+    def _items(self):
+        """Get the (last used time, size, path) for all cached items."""
+        items = []
+        for name in os.listdir(self.directory):
+            if name.endswith(self.suffix):
+                path = os.path.join(self.directory, name)
+                try:
+                    stat = os.stat(path)
+                except EnvironmentError:  # Removed by another process
+                    continue
+                items.append((stat.st_mtime, stat.st_size, path))
+        return items
+
+    def _evict(self):
+        """Remove the least recently used items until the cache fits within its size."""
+        items = self._items()
+        total = sum(size for _, size, _ in items)
+        for _, size, path in sorted(items):
+            if total <= self.max_size:
+                break
+            self._remove(path)
+            total -= size
+
+    @staticmethod
+    def _remove(path):
+        """Remove a file, ignoring if it has already been removed by another process."""
+        try:
+            os.remove(path)
+        except EnvironmentError:
+            pass
+
+
+# os.rename can't replace an existing file on Windows, so use os.replace where available
+# (not on Python 2).
+_replace = getattr(os, 'replace', os.rename)
 
 
 def bits_to_code(val):
@@ -0,0 +1,449 @@
+# Copyright (c) 2018 MetPy Developers.
+# Distributed under the terms of the BSD 3-Clause License.
+# SPDX-License-Identifier: BSD-3-Clause
+"""Open GINI and NEXRAD files as xarray datasets."""
+from __future__ import absolute_import
+
+import contextlib
+from glob import glob
+import struct
+
+import numpy as np
+import xarray as xr
+from xarray import Variable
+from xarray.backends.common import AbstractDataStore, BackendArray
+from xarray.core import indexing
+from xarray.core.utils import FrozenOrderedDict
+
+from ._tools import open_as_needed
+from .gini import GiniFile
+from .nexrad import Level2File, Level3File, nexrad_to_datetime
+from ..cbook import is_string_like, Registry
+from ..package_tools import Exporter
+
+exporter = Exporter(globals())
+
+#: The functions to create a data store for each engine
+engines = Registry()
+
+#: Units for the moments found in Level 2 files
+moment_units = {'REF': 'dBZ', 'VEL': 'm/s', 'SW': 'm/s', 'ZDR': 'dB', 'PHI': 'degrees',
+                'RHO': 'dimensionless', 'CFP': 'dimensionless'}
+
+
+def _make_time_var(dt):
+    """Make a CF-style time variable for a `datetime.datetime`."""
+    base_time = dt.replace(hour=0, minute=0, second=0, microsecond=0)
+    offset = dt - base_time
+    return Variable((), data=offset.seconds + offset.microseconds / 1e6,
+                    attrs={'units': 'seconds since ' + base_time.isoformat()})
+
+
+def _decode_name(name):
+    """Return a name from a NEXRAD file as a string."""
+    return name.decode('ascii', 'ignore') if isinstance(name, bytes) else name
+
+
+class Level2MomentArray(BackendArray):
+    r"""Provide lazy access to a moment in a sweep of a `Level2File` for xarray.
+
+    Indexing only copies the radials needed into an array. Any gates (or radials) missing
+    the moment are filled with the file's missing value.
+    """
+
+    def __init__(self, radials, name, num_gates, dtype, missing):
+        """Wrap moment `name` of `radials`, which is `num_gates` long at most."""
+        self.radials = radials
+        self.name = name
+        self.missing = missing
+        self.shape = (len(radials), num_gates)
+        self.dtype = np.dtype(dtype)
+
+    def __getitem__(self, key):
+        """Read the portion of the moment given by an explicit indexer."""
+        return indexing.explicit_indexing_adapter(key, self.shape,
+                                                  indexing.IndexingSupport.BASIC,
+                                                  self._getitem)
+
+    def _getitem(self, key):
+        rows, cols = key
+        if isinstance(rows, slice):
+            row_inds = range(*rows.indices(self.shape[0]))
+        else:
+            row_inds = [rows % self.shape[0]]
+
+        data = np.empty((len(row_inds), self.shape[1]), dtype=self.dtype)
+        data.fill(self.missing)
+        for ind, radial_ind in enumerate(row_inds):
+            moments = self.radials[radial_ind][-1]
+            if self.name in moments:
+                vals = moments[self.name][1]
+                data[ind, :len(vals)] = vals
+
+        data = data[:, cols]
+        return data if isinstance(rows, slice) else data[0]
+
+
+class Level2DataStore(AbstractDataStore):
+    """Expose a sweep of a NEXRAD Level 2 file to xarray.
+
+    Each moment becomes a variable with dimensions of radial and range, with the azimuth and
+    elevation angles of each radial as coordinates. Since the moments can have different gate
+    spacings, each has its own range dimension (e.g. ``range_REF``). The moments are only
+    copied from the file's radials into arrays when they are accessed.
+    """
+
+    def __init__(self, level2_file, sweep=0):
+        """Wrap sweep number `sweep` of a `Level2File`."""
+        self.level2_file = level2_file
+        self.sweep = sweep
+        self._radials = level2_file.sweeps[sweep]
+
+        # Find the moments, along with the gate info and data type from the first radial
+        # with each
+        self._moments = {}
+        self._dtypes = {}
+        for radial in self._radials:
+            for name, (hdr, vals) in radial[-1].items():
+                first_hdr, num_gates = self._moments.get(name, (hdr, 0))
+                self._moments[name] = (first_hdr, max(num_gates, len(vals)))
+                self._dtypes.setdefault(name, vals.dtype)
+
+    def get_variables(self):
+        """Get all variables for the sweep.
+
+        This is used by `xarray.open_dataset`.
+
+        """
+        hdrs = [radial[0] for radial in self._radials]
+        start = nexrad_to_datetime(hdrs[0].date, hdrs[0].time_ms)
+        variables = [('time', _make_time_var(start))]
+        variables.append(('azimuth', Variable(('radial',),
+                                              np.array([hdr.az_angle for hdr in hdrs]),
+                                              {'units': 'degrees',
+                                               'long_name': 'azimuth angle'})))
+        variables.append(('elevation', Variable(('radial',),
+                                                np.array([hdr.el_angle for hdr in hdrs]),
+                                                {'units': 'degrees',
+                                                 'long_name': 'elevation angle'})))
+
+        for name in sorted(self._moments):
+            hdr, num_gates = self._moments[name]
+            str_name = _decode_name(name).strip()
+            range_dim = 'range_' + str_name
+
+            data = indexing.LazilyOuterIndexedArray(
+                Level2MomentArray(self._radials, name, num_gates, self._dtypes[name],
+                                  self.level2_file.MISSING))
+
+            rng = hdr.first_gate + np.arange(num_gates) * hdr.gate_width
+            variables.append((range_dim, Variable((range_dim,), rng,
+                                                  {'units': 'km',
+                                                   'long_name': 'range to center of gate'})))
+            attrs = {'coordinates': 'azimuth elevation time'}
+            if str_name in moment_units:
+                attrs['units'] = moment_units[str_name]
+            variables.append((str_name, Variable(('radial', range_dim), data, attrs)))
+
+        return FrozenOrderedDict(variables)
+
+    def get_attrs(self):
+        """Get the global attributes.
+
+        This is used by `xarray.open_dataset`.
+
+        """
+        attrs = {'station': _decode_name(self.level2_file.stid).strip('\x00'),
+                 'sweep': self.sweep}
+
+        # Only message 31 radials carry the site location
+        radial = self._radials[0]
+        if len(radial) > 2:
+            vol_consts = radial[1]
+            attrs.update(latitude=vol_consts.lat, longitude=vol_consts.lon,
+                         height=vol_consts.site_amsl)
+        return FrozenOrderedDict(attrs)
+
+    def get_dimensions(self):
+        """Get the sweep's dimensions.
+
+        This is used by `xarray.open_dataset`.
+
+        """
+        dims = [('radial', len(self._radials))]
+        dims.extend(('range_' + _decode_name(name).strip(), num_gates)
+                    for name, (_, num_gates) in sorted(self._moments.items()))
+        return FrozenOrderedDict(dims)
+
+
+class Level3DataStore(AbstractDataStore):
+    """Expose the radial data of a NEXRAD Level 3 product to xarray.
+
+    The data are converted to physical values using the product's data mapper, and have
+    dimensions of radial and range, with the azimuth of each radial as a coordinate.
+    """
+
+    def __init__(self, level3_file):
+        """Wrap a `Level3File`."""
+        self.level3_file = level3_file
+        sym_block = getattr(level3_file, 'sym_block', None)
+        if not sym_block or not sym_block[0] or 'start_az' not in sym_block[0][0]:
+            raise NotImplementedError('Only Level 3 products with radial data are supported.')
+        self._packet = sym_block[0][0]
+
+    def get_variables(self):
+        """Get all variables in the product.
+
+        This is used by `xarray.open_dataset`.
+
+        """
+        f = self.level3_file
+        raw = self._packet['data']
+        start_az = self._packet['start_az']
+        az = (start_az + ((self._packet['end_az'] - start_az) % 360) / 2) % 360
+
+        # Ranges are at the center of evenly spaced bins out to the maximum range
+        rng = np.linspace(0, f.max_range, raw.shape[-1] + 1)
+        rng = (rng[:-1] + rng[1:]) / 2
+
+        variables = [('time', _make_time_var(f.metadata['vol_time'])),
+                     ('azimuth', Variable(('radial',), az,
+                                          {'units': 'degrees', 'long_name': 'azimuth angle'})),
+                     ('range', Variable(('range',), rng,
+                                        {'units': 'km',
+                                         'long_name': 'range to center of bin'}))]
+        attrs = {'coordinates': 'azimuth time', 'long_name': f.product_name}
+        if 'el_angle' in f.metadata:
+            variables.append(('elevation', Variable((), f.metadata['el_angle'],
+                                                    {'units': 'degrees',
+                                                     'long_name': 'elevation angle'})))
+            attrs['coordinates'] = 'azimuth elevation time'
+        variables.append((f.product_name, Variable(('radial', 'range'), f.map_data(raw),
+                                                   attrs)))
+
+        return FrozenOrderedDict(variables)
+
+    def get_attrs(self):
+        """Get the global attributes.
+
+        This is used by `xarray.open_dataset`.
+
+        """
+        f = self.level3_file
+        return FrozenOrderedDict(station=getattr(f, 'siteID', ''), product_code=f.header.code,
+                                 latitude=f.lat, longitude=f.lon, height=f.height)
+
+    def get_dimensions(self):
+        """Get the product's dimensions.
+
+        This is used by `xarray.open_dataset`.
+
+        """
+        return FrozenOrderedDict(zip(('radial', 'range'), self._packet['data'].shape))
+
+
+@engines.register('gini')
+def _open_gini(filename_or_obj):
+    return GiniFile(filename_or_obj)
+
+
+@engines.register('nexrad_level2')
+def _open_level2(filename_or_obj, sweep=0):
+    return Level2DataStore(Level2File(filename_or_obj), sweep)
+
+
+@engines.register('nexrad_level3')
+def _open_level3(filename_or_obj):
+    return Level3DataStore(Level3File(filename_or_obj))
+
+
+def _is_level3_message(start):
+    """Check for a NEXRAD Level 3 message header followed by a block divider."""
+    if len(start) < Level3File.header_fmt.size + 2:
+        return False
+    code, = struct.unpack('>H', start[:2])
+    return 0 < code < 1000 and start[Level3File.header_fmt.size:][:2] == b'\xff\xff'
+
+
+def _guess_engine(filename):
+    """Determine the engine to use for a file from its first bytes.
+
+    Returns `None` if the file does not look like one that can be opened.
+    """
+    if not is_string_like(filename):
+        raise ValueError('engine must be given when not opening a file by name.')
+
+    fobj = open_as_needed(filename)
+    with contextlib.closing(fobj):
+        start = fobj.read(64)
+
+    text = start.decode('utf-8', 'ignore')
+    if start[:4] in Level2File.vol_hdr_tags:
+        return 'nexrad_level2'
+    elif GiniFile.wmo_finder.search(text):
+        return 'gini'
+    elif Level3File.wmo_finder.search(text) or _is_level3_message(start):
+        return 'nexrad_level3'
+    return None
+
+
+@exporter.export
+def open_dataset(filename_or_obj, engine=None, backend_kwargs=None, **kwargs):
+    r"""Open a GINI or NEXRAD file as an `xarray.Dataset`.
+
+    Parameters
+    ----------
+    filename_or_obj : str or file-like object
+        The file to open
+    engine : {'gini', 'nexrad_level2', 'nexrad_level3'}, optional
+        The type of file. If not given, this is determined from the start of the file, which
+        requires `filename_or_obj` to be a filename.
+    backend_kwargs : dict, optional
+        Additional arguments for opening the file, such as ``sweep`` for
+        ``engine='nexrad_level2'``.
+    kwargs
+        Any additional arguments are passed to :func:`xarray.open_dataset`, such as
+        ``chunks`` to read the data into dask arrays.
+
+    Returns
+    -------
+    `xarray.Dataset`
+
+    See Also
+    --------
+    open_mfdataset
+
+    """
+    if engine is None:
+        engine = _guess_engine(filename_or_obj)
+        if engine is None:
+            raise ValueError('Unable to determine the type of file; engine must be given.')
+    store = engines[engine](filename_or_obj, **(backend_kwargs or {}))
+    return xr.open_dataset(store, **kwargs)
+
+
+@exporter.export
+def open_mfdataset(paths, engine=None, chunks=None, concat_dim='time', data_vars='all',
+                   coords='different', preprocess=None, parallel=False, **kwargs):
+    r"""Open multiple GINI or NEXRAD files as a single `xarray.Dataset`.
+
+    The files are opened with dask arrays and concatenated along `concat_dim`, which by
+    default stacks the products in time.
+
+    Parameters
+    ----------
+    paths : str or sequence of str
+        Either a glob pattern or a list of files to open
+    engine : {'gini', 'nexrad_level2', 'nexrad_level3'}, optional
+        The type of file. If not given, this is determined separately for each file.
+    chunks : int or dict, optional
+        The dask chunk sizes for each file. Defaults to a single chunk per file.
+    concat_dim : str, optional
+        The dimension to concatenate along. Defaults to ``'time'``.
+    data_vars : {'minimal', 'different', 'all'} or list of str, optional
+        Which data variables to concatenate; see :func:`xarray.concat`.
+    coords : {'minimal', 'different', 'all'} or list of str, optional
+        Which coordinate variables to concatenate; see :func:`xarray.concat`.
+    preprocess : callable, optional
+        Called with each dataset before concatenation.
+    parallel : bool, optional
+        Whether to open and preprocess the files in parallel using `dask.delayed`.
+        Defaults to False.
+    kwargs
+        Any additional arguments are passed to :func:`open_dataset`.
+
+    Returns
+    -------
+    `xarray.Dataset`
+
+    See Also
+    --------
+    open_dataset
+
+    """
+    if is_string_like(paths):
+        paths = sorted(glob(paths))
+    if not paths:
+        raise IOError('no files to open')
+
+    open_kwargs = dict(engine=engine, chunks=chunks or {}, **kwargs)
+    if parallel:
+        import dask
+        open_ = dask.delayed(open_dataset)
+        preprocess = dask.delayed(preprocess) if preprocess is not None else None
+    else:
+        open_ = open_dataset
+
+    datasets = [open_(p, **open_kwargs) for p in paths]
+    if preprocess is not None:
+        datasets = [preprocess(ds) for ds in datasets]
+    if parallel:
+        datasets = dask.compute(*datasets)
+
+    return xr.concat(datasets, dim=concat_dim, data_vars=data_vars, coords=coords)
+
+
+@exporter.export
+def write_level2_archive(level2_file, path, sweeps=None, engine='netcdf4', complevel=4):
+    r"""Write the sweeps of a NEXRAD Level 2 file to a compact, compressed archive.
+
+    Each sweep is written to its own group (``sweep_0``, ``sweep_1``, ...), laid out as with
+    :func:`open_dataset`. The moments are stored as their original 8- or 16-bit integers,
+    with ``scale_factor`` and ``add_offset`` attributes, in a single compressed chunk per
+    sweep. Reading a group back with `xarray.open_dataset` gives the decoded values, but
+    much faster than decoding the original file, and without reading the other sweeps.
+
+    Parameters
+    ----------
+    level2_file : `Level2File` or str
+        The decoded file, or the name of a file to decode
+    path : str
+        The name of the archive to write
+    sweeps : sequence of int, optional
+        The sweeps to write. Defaults to all of them.
+    engine : {'netcdf4', 'zarr'}, optional
+        The format of the archive. Defaults to ``'netcdf4'``.
+    complevel : int, optional
+        The compression level to use, from 1 (fastest) to 9 (smallest). Defaults to 4.
+
+    Notes
+    -----
+    Both range-folded and missing gates are decoded as NaN, so both are stored as missing.
+
+    """
+    if not isinstance(level2_file, Level2File):
+        level2_file = Level2File(level2_file)
+
+    if sweeps is None:
+        sweeps = range(len(level2_file.sweeps))
+
+    for count, sweep in enumerate(sweeps):
+        store = Level2DataStore(level2_file, sweep)
+        ds = xr.open_dataset(store)
+
+        # Pack each moment back into its integer form, as a single chunk
+        encoding = {}
+        for name, (hdr, _) in store._moments.items():
+            var_name = _decode_name(name).strip()
+            var_encoding = {'dtype': 'u2' if getattr(hdr, 'data_size', 'B') == 'H' else 'u1',
+                            'scale_factor': 1. / hdr.scale,
+                            'add_offset': -hdr.offset / hdr.scale, '_FillValue': 0}
+            if engine == 'zarr':
+                from numcodecs import Blosc
+                var_encoding.update(chunks=ds[var_name].shape,
+                                    compressor=Blosc(cname='zstd', clevel=complevel))
+            else:
+                var_encoding.update(zlib=True, complevel=complevel,
+                                    chunksizes=ds[var_name].shape)
+            encoding[var_name] = var_encoding
+
+        group = 'sweep_{:d}'.format(sweep)
+        if engine == 'zarr':
+            # Writing a group only replaces that group, so start from an empty store
+            if not count:
+                import zarr
+                zarr.open_group(path, mode='w')
+            ds.to_zarr(path, mode='w', group=group, encoding=encoding)
+        else:
+            ds.to_netcdf(path, mode='a' if count else 'w', group=group, encoding=encoding,
+                         engine=engine)
@@ -13,19 +13,25 @@ except ImportError:
 from io import BytesIO
 from itertools import repeat  # noqa: I202
 import logging
+import mmap
 import re
+import sys
 
 import numpy as np
 try:
     from xarray import Variable
-    from xarray.backends.common import AbstractDataStore
+    from xarray.backends.common import AbstractDataStore, BackendArray
+    from xarray.core import indexing
     from xarray.core.utils import FrozenOrderedDict
 except ImportError:
     # This way GiniFile is still usable without xarray
     AbstractDataStore = object
+    BackendArray = object
 
-from ._tools import Bits, IOBuffer, NamedStruct, open_as_needed, zlib_decompress_all_frames
+from ._tools import (Bits, IndexedZlibData, IOBuffer, map_as_needed, NamedStruct,
+                     open_as_needed)
 from .cdm import cf_to_proj, Dataset
+from ..cbook import LRUCache
 from ..deprecation import deprecated
 from ..package_tools import Exporter
 
@@ -34,6 +40,9 @@ exporter = Exporter(globals())
 logging.basicConfig(level=logging.WARN)
 log = logging.getLogger(__name__)
 
+# Longitude and latitude grids, which consecutive files for the same sector share exactly
+_lon_lat_cache = LRUCache(maxsize=16)
+
 
 def _make_datetime(s):
     r"""Convert 7 bytes from a GINI file to a `datetime` instance."""
@@ -59,6 +68,17 @@ def _scaled_int(s):
     return (sign * int_val) / 10000.
 
 
+def _lon_lat_grid(proj, xlocs, ylocs):
+    r"""Calculate the (read-only) 2D longitude and latitude grids for projected locations."""
+    x, y = np.meshgrid(xlocs, ylocs)
+    lon, lat = proj(x, y, inverse=True)
+
+    # These are shared through the cache, so guard against modification
+    lon.flags.writeable = False
+    lat.flags.writeable = False
+    return lon, lat
+
+
 def _name_lookup(names):
     r"""Create an io helper to convert an integer to a named value."""
     mapper = dict(zip(range(len(names)), names))
@@ -76,6 +96,64 @@ class GiniProjection(Enum):
     polar_stereographic = 5
 
 
+class GiniImageArray(BackendArray):
+    r"""Provide lazy access to the image in a `GiniFile` for xarray.
+
+    Indexing only reads (and if necessary, decompresses) the rows of the image needed.
+    """
+
+    def __init__(self, gini_file):
+        """Wrap the image of `gini_file`."""
+        self.gini_file = gini_file
+        self.shape = (gini_file.prod_desc.ny, gini_file.prod_desc.nx)
+        self.dtype = np.dtype(np.uint8)
+
+    def __getitem__(self, key):
+        """Read the portion of the image given by an explicit indexer."""
+        return indexing.explicit_indexing_adapter(key, self.shape,
+                                                  indexing.IndexingSupport.BASIC,
+                                                  self._getitem)
+
+    def _getitem(self, key):
+        rows, cols = key
+        if isinstance(rows, slice):
+            row_inds = np.arange(*rows.indices(self.shape[0]))
+        else:
+            row_inds = np.array([rows % self.shape[0]])
+
+        if row_inds.size:
+            first = row_inds.min()
+            data = self.gini_file._read_rows(first, row_inds.max() + 1)[row_inds - first]
+        else:
+            data = np.empty((0, self.shape[1]), dtype=self.dtype)
+
+        data = data[:, cols]
+        return data if isinstance(rows, slice) else data[0]
+
+
+class GiniLonLatArray(BackendArray):
+    r"""Provide lazy access to the longitude or latitude grid of a `GiniFile` for xarray.
+
+    The grids are only calculated when first accessed.
+    """
+
+    def __init__(self, gini_file, index):
+        """Wrap the longitude (`index` 0) or latitude (`index` 1) grid of `gini_file`."""
+        self.gini_file = gini_file
+        self.index = index
+        self.shape = (gini_file.prod_desc.ny, gini_file.prod_desc.nx)
+        self.dtype = np.dtype(np.float64)
+
+    def __getitem__(self, key):
+        """Read the portion of the grid given by an explicit indexer."""
+        return indexing.explicit_indexing_adapter(key, self.shape,
+                                                  indexing.IndexingSupport.BASIC,
+                                                  self._getitem)
+
+    def _getitem(self, key):
+        return self.gini_file._get_lon_lat()[self.index][key]
+
+
 @exporter.export
 class GiniFile(AbstractDataStore):
     """A class that handles reading the GINI format satellite images from the NWS.
@@ -94,6 +172,7 @@ class GiniFile(AbstractDataStore):
     """
 
     missing = 255
+    header_bytes = 1024
     wmo_finder = re.compile('(T\w{3}\d{2})[\s\w\d]+\w*(\w{3})\r\r\n')
 
     crafts = ['Unknown', 'Unknown', 'Miscellaneous', 'JERS', 'ERS/QuikSCAT', 'POES/NPOESS',
@@ -153,30 +232,39 @@ class GiniFile(AbstractDataStore):
     def __init__(self, filename):
         r"""Create an instance of `GiniFile`.
 
+        The image itself is not read until it is accessed, either through :attr:`data` or
+        through indexing a dataset opened with xarray. Uncompressed files on disk are
+        memory-mapped, and for zlib-compressed files only the frames holding the requested
+        rows are decompressed.
+
         Parameters
         ----------
-        filename : str or file-like object
-            If str, the name of the file to be opened. Gzip-ed files are
-            recognized with the extension ``'.gz'``, as are bzip2-ed files with
-            the extension ``'.bz2'`` If `filename` is a file-like object,
-            this will be read from directly.
+        filename : str, bytes-like, or file-like object
+            If str, the name of the file to be opened. If bytes-like (`bytes`, `bytearray`,
+            or `memoryview`), the contents of the file. Gzip-ed and bzip2-ed files and
+            contents are recognized from their first bytes. If `filename` is a file-like
+            object, this will be read from directly.
 
         """
         fobj = open_as_needed(filename)
 
-        # Just read in the entire set of data at once
+        # Map (or read in) the entire set of data at once
         with contextlib.closing(fobj):
-            self._buffer = IOBuffer.fromfile(fobj)
+            self._source = map_as_needed(fobj)
 
         # Pop off the WMO header if we find it
         self.wmo_code = ''
+        self._buffer = IOBuffer(self._source[:64])
+        origin = self._buffer.set_mark()
         self._process_wmo_header()
         log.debug('First wmo code: %s', self.wmo_code)
 
-        # Decompress the data if necessary, and if so, pop off new header
-        log.debug('Length before decompression: %s', len(self._buffer))
-        self._buffer = IOBuffer(self._buffer.read_func(zlib_decompress_all_frames))
-        log.debug('Length after decompression: %s', len(self._buffer))
+        # Index any compressed frames, so that only the header needs to be decompressed
+        # right now, and pop off the new header
+        self._stream = IndexedZlibData(self._source, self._buffer.offset_from(origin))
+        log.debug('Data compressed: %s', self._stream.compressed)
+        self._buffer = IOBuffer(self._stream.read(0, self.header_bytes))
+        origin = self._buffer.set_mark()
 
         # Process WMO header inside compressed data if necessary
         self._process_wmo_header()
@@ -223,29 +311,82 @@ class GiniFile(AbstractDataStore):
             log.warning('Adjusting bad PDB size from 0 to 512.')
             self.prod_desc2 = self.prod_desc2._replace(pdb_size=512)
 
-        # Jump past the remaining empty bytes in the product description block
+        # Jump past the remaining empty bytes in the product description block; the raster
+        # starts there--unless it's PNG compressed, in which case it's read right away.
         self._buffer.jump_to(start, self.prod_desc2.pdb_size)
-
-        # Read the actual raster--unless it's PNG compressed, in which case that happens later
-        blob = self._buffer.read(self.prod_desc.num_records * self.prod_desc.record_len)
-
-        # Check for end marker
-        end = self._buffer.read(self.prod_desc.record_len)
+        self._image_start = self._buffer.offset_from(origin)
+        self._data = None
+        if not self.prod_desc.num_records * self.prod_desc.record_len:
+            log.debug('No raster records, trying to decompress remaining data as an image.')
+            from matplotlib.image import imread
+            blob = self._stream.read(self._image_start)
+            if blob:
+                self._data = (imread(BytesIO(blob)) * 255).astype('uint8')
+        elif not self._stream.compressed:
+            # Checking the end is cheap when nothing needs to be decompressed
+            self._check_end()
+
+    def close(self):
+        """Release the contents of the file, unmapping it from memory if it was mapped.
+
+        Neither :attr:`data` nor any dataset opened from this file can be read afterwards.
+        """
+        self._stream.close()
+        self._data = None
+        source, self._source = self._source, b''
+
+        # Python 2 unmaps even with arrays still viewing the file, so there the mapping is
+        # only released once nothing else refers to it
+        if isinstance(source, mmap.mmap) and sys.version_info[0] >= 3:
+            try:
+                source.close()
+            except BufferError:
+                # Arrays viewing the file are still in use, so the mapping is instead
+                # released once they are gone
+                log.debug('Leaving memory-mapped file open for existing arrays.')
+
+    def __enter__(self):
+        """Use the file as a context manager, closing it on exit."""
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Close the file."""
+        self.close()
+
+    @property
+    def data(self):
+        """The image data as an array.
+
+        For uncompressed files this is a read-only view of the (memory-mapped) file.
+        """
+        if self._data is None:
+            self._data = self._read_rows(0, self.prod_desc.ny)
+            if self._stream.compressed:
+                self._check_end()
+        return self._data
+
+    def _read_rows(self, start, stop):
+        """Read rows of the image from the (possibly compressed) data."""
+        if self._data is not None:
+            return self._data[start:stop]
+
+        nx = self.prod_desc.nx
+        stop = min(stop, self.prod_desc.ny)
+        offset = self._image_start + start * nx
+        return np.frombuffer(self._stream.read(offset, offset + (stop - start) * nx),
+                             dtype=np.uint8).reshape(-1, nx)
+
+    def _check_end(self):
+        """Check for the end marker, as well as for any data beyond it."""
+        end_start = self._image_start + self.prod_desc.num_records * self.prod_desc.record_len
+        end = bytes(self._stream.read(end_start, end_start + self.prod_desc.record_len))
         if end != b''.join(repeat(b'\xff\x00', self.prod_desc.record_len // 2)):
             log.warning('End marker not as expected: %s', end)
 
-        # Check to ensure that we processed all of the data
-        if not self._buffer.at_end():
-            if not blob:
-                log.debug('No data read yet, trying to decompress remaining data as an image.')
-                from matplotlib.image import imread
-                blob = (imread(BytesIO(self._buffer.read())) * 255).astype('uint8')
-            else:
-                log.warning('Leftover unprocessed data beyond EOF marker: %s',
-                            self._buffer.get_next(10))
-
-        self.data = np.array(blob).reshape((self.prod_desc.ny,
-                                            self.prod_desc.nx))
+        leftover = bytes(self._stream.read(end_start + self.prod_desc.record_len,
+                                           end_start + self.prod_desc.record_len + 10))
+        if leftover:
+            log.warning('Leftover unprocessed data beyond EOF marker: %s', leftover)
 
     @deprecated(0.8, alternative='xarray.open_dataset(GiniFile)')
     def to_dataset(self):
@@ -403,32 +544,44 @@ class GiniFile(AbstractDataStore):
 
         return pyproj.Proj(**kwargs), dx, dy
 
-    def _make_coord_vars(self):
+    def _get_proj_and_locs(self):
         proj, dx, dy = self._get_proj_and_res()
 
         # Get projected location of lower left point
         x0, y0 = proj(self.prod_desc.lo1, self.prod_desc.la1)
+        xlocs = x0 + np.arange(self.prod_desc.nx) * (1000. * dx)
+
+        # Need to flip y because we calculated from the lower left corner,
+        # but the raster data is stored with top row first.
+        ylocs = (y0 + np.arange(self.prod_desc.ny) * (1000. * dy))[::-1]
+        return proj, xlocs, ylocs
+
+    def _get_lon_lat(self):
+        # The grids depend only on the navigation, so they can be shared between files
+        key = (self.prod_desc.projection, self.proj_info, self.prod_desc2.lat_in,
+               self.prod_desc2.resolution, self.prod_desc.la1, self.prod_desc.lo1,
+               self.prod_desc.nx, self.prod_desc.ny)
+        return _lon_lat_cache.fetch(key, lambda: _lon_lat_grid(*self._get_proj_and_locs()))
+
+    def _make_coord_vars(self):
+        _, xlocs, ylocs = self._get_proj_and_locs()
 
         # Coordinate variable for x
-        xlocs = x0 + np.arange(self.prod_desc.nx) * (1000. * dx)
         attrs = {'units': 'm', 'long_name': 'x coordinate of projection',
                  'standard_name': 'projection_x_coordinate'}
         x_var = Variable(('x',), xlocs, attrs)
 
-        # Now y--Need to flip y because we calculated from the lower left corner,
-        # but the raster data is stored with top row first.
-        ylocs = (y0 + np.arange(self.prod_desc.ny) * (1000. * dy))[::-1]
+        # Now y
         attrs = {'units': 'm', 'long_name': 'y coordinate of projection',
                  'standard_name': 'projection_y_coordinate'}
         y_var = Variable(('y',), ylocs, attrs)
 
-        # Get the two-D lon,lat grid as well
-        x, y = np.meshgrid(xlocs, ylocs)
-        lon, lat = proj(x, y, inverse=True)
-
-        lon_var = Variable(('y', 'x'), data=lon,
+        # The two-D lon,lat grid is only calculated if needed
+        lon_var = Variable(('y', 'x'),
+                           data=indexing.LazilyOuterIndexedArray(GiniLonLatArray(self, 0)),
                            attrs={'long_name': 'longitude', 'units': 'degrees_east'})
-        lat_var = Variable(('y', 'x'), data=lat,
+        lat_var = Variable(('y', 'x'),
+                           data=indexing.LazilyOuterIndexedArray(GiniLonLatArray(self, 1)),
                            attrs={'long_name': 'latitude', 'units': 'degrees_north'})
 
         return [('x', x_var), ('y', y_var), ('lon', lon_var), ('lat', lat_var)]
@@ -479,8 +632,7 @@ class GiniFile(AbstractDataStore):
         attrs = {'long_name': self.prod_desc.channel, 'missing_value': missing_val,
                  'coordinates': 'y x time', 'grid_mapping': proj_var_name}
         data_var = Variable(('y', 'x'),
-                            data=np.ma.array(self.data,
-                                             mask=self.data == missing_val),
+                            data=indexing.LazilyOuterIndexedArray(GiniImageArray(self)),
                             attrs=attrs)
         variables.append((name, data_var))
 
@@ -530,9 +682,10 @@ def _add_projection_coords(ds, prod_desc, proj_var, dx, dy):
     # is stored with top row first.
     y_var[::-1] = y0 + np.arange(prod_desc.ny) * (1000. * dy)
 
-    # Get the two-D lon,lat grid as well
-    x, y = np.meshgrid(x_var[:], y_var[:])
-    lon, lat = proj(x, y, inverse=True)
+    # Get the two-D lon,lat grid as well, which only depends on the navigation
+    key = (tuple((attr, getattr(proj_var, attr)) for attr in proj_var.ncattrs()),
+           prod_desc.la1, prod_desc.lo1, prod_desc.nx, prod_desc.ny, dx, dy)
+    lon, lat = _lon_lat_cache.fetch(key, _lon_lat_grid, proj, x_var[:], y_var[:])
     lon_var = ds.createVariable('lon', np.float64, dimensions=('y', 'x'), wrap_array=lon)
     lon_var.long_name = 'longitude'
     lon_var.units = 'degrees_east'
@@ -6,10 +6,14 @@
 from __future__ import print_function
 
 import bz2
-from collections import defaultdict, namedtuple, OrderedDict
+from collections import defaultdict, OrderedDict
 import contextlib
 import datetime
+import functools
 import logging
+from multiprocessing import Pool
+from multiprocessing.pool import ThreadPool
+import os
 import re
 import struct
 from struct import Struct
@@ -18,9 +22,11 @@ from xdrlib import Unpacker
 import numpy as np
 from scipy.constants import day, milli
 
-from ._tools import (Array, BitField, Bits, bits_to_code, DictStruct, Enum, IOBuffer,
-                     NamedStruct, open_as_needed, zlib_decompress_all_frames)
-from ..cbook import is_string_like
+from ._tools import (_named_tuple, Array, BitField, Bits, bits_to_code, bytearray_to_buff,
+                     DiskCache, Enum, IOBuffer, NamedStruct, open_as_needed,
+                     zlib_decompress_all_frames)
+from .. import __version__
+from ..cbook import is_string_like, LRUCache
 from ..package_tools import Exporter
 
 exporter = Exporter(globals())
@@ -55,29 +61,94 @@ def az_rate(val):
     return val * 90. / 2**16
 
 
-def bzip_blocks_decompress_all(data):
+def _bzip_block_bounds(data):
+    """Find the start and end offsets of each of the size-prefixed bzip2 blocks."""
+    bounds = []
+    size_fmt = Struct('>l')
+    buff = bytearray_to_buff(data)
+    offset = 0
+    while offset < len(data):
+        # Not enough bytes left for a size, so treat what's left as a (bad) block
+        if len(data) - offset < size_fmt.size:
+            bounds.append((offset, len(data)))
+            break
+
+        # Sign is used to flag the last block of the volume, so ignore it
+        block_cmp_bytes = abs(size_fmt.unpack_from(buff, offset)[0])
+        offset += size_fmt.size
+        bounds.append((offset, offset + block_cmp_bytes))
+        offset += block_cmp_bytes
+    return bounds
+
+
+def _bzip_decompress_block(block):
+    """Decompress a single bzip2 block, returning `None` if it is not valid bzip2 data."""
+    try:
+        return bz2.decompress(block)
+    except IOError:
+        return None
+
+
+def bzip_blocks_decompress_all(data, num_threads=None, max_blocks=None):
     """Decompress all of the bzip2-ed blocks.
 
-    Returns the decompressed data as a `bytearray`.
+    The block boundaries are found up front so that the blocks, which are independent,
+    can be decompressed concurrently by a pool of threads; this works since
+    :func:`bz2.decompress` releases the GIL.
+
+    Parameters
+    ----------
+    data : bytes or bytearray
+        The size-prefixed bzip2 blocks
+    num_threads : int, optional
+        The number of threads to use for decompression. Defaults to `None`, which uses
+        the number of CPUs available.
+    max_blocks : int, optional
+        The maximum number of blocks to decompress. Defaults to `None`, which decompresses
+        all of the blocks.
+
+    Returns
+    -------
+        bytearray
+            All decompressed bytes
+
     """
-    frames = bytearray()
-    offset = 0
-    while offset < len(data):
-        size_bytes = data[offset:offset + 4]
-        offset += 4
-        block_cmp_bytes = abs(Struct('>l').unpack(size_bytes)[0])
+    bounds = _bzip_block_bounds(data)[:max_blocks]
+
+    # Decompress serially until we get some data; if this fails, we're not looking at a
+    # bz2 stream and we shouldn't bother with the rest.
+    blocks = []
+    while len(blocks) < len(bounds) and not any(blocks):
+        start, end = bounds[len(blocks)]
+        block = _bzip_decompress_block(data[start:end])
+        if block is None:
+            raise ValueError('Not a bz2 stream.')
+        blocks.append(block)
+
+    if len(blocks) < len(bounds):
+        pool = ThreadPool(num_threads)
         try:
-            frames.extend(bz2.decompress(data[offset:offset + block_cmp_bytes]))
-            offset += block_cmp_bytes
-        except IOError:
-            # If we've decompressed any frames, this is an error mid-stream, so warn, stop
-            # trying to decompress and let processing proceed
-            if frames:
-                logging.warning('Error decompressing bz2 block stream at offset: %d',
-                                offset - 4)
-                break
-            else:  # Otherwise, this isn't a bzip2 stream, so bail
-                raise ValueError('Not a bz2 stream.')
+            blocks.extend(pool.map(_bzip_decompress_block,
+                                   [data[start:end] for start, end in bounds[len(blocks):]]))
+        finally:
+            pool.close()
+            pool.join()
+
+    # Since we've decompressed some frames, an error is mid-stream, so warn, keep the
+    # blocks before the bad one, and let processing proceed
+    for ind, block in enumerate(blocks):
+        if block is None:
+            logging.warning('Error decompressing bz2 block stream at offset: %d',
+                            bounds[ind][0] - 4)
+            blocks = blocks[:ind]
+            break
+
+    # Copy all the blocks into a single, preallocated buffer
+    frames = bytearray(sum(len(block) for block in blocks))
+    offset = 0
+    for block in blocks:
+        frames[offset:offset + len(block)] = block
+        offset += len(block)
     return frames
 
 
@@ -116,6 +187,50 @@ END_VOLUME = 0x8
 LAST_ELEVATION = 0x10
 BAD_DATA = 0x20
 
+# Cache of decoded files on disk, shared by the readers, if enabled
+_product_cache = None
+
+
+@exporter.export
+def set_product_cache(directory, max_size=2 ** 30):
+    r"""Keep the decoded contents of NEXRAD files in a cache on disk.
+
+    Once this is set, creating a `Level2File` or `Level3File` from a filename will use the
+    cached results of decoding that file if available, and otherwise add the results to the
+    cache. Files are recognized by their path, modification time, and size. The cache can be
+    shared by multiple processes; once its total size exceeds `max_size`, the least recently
+    used files are removed.
+
+    Parameters
+    ----------
+    directory : str or None
+        The directory in which to keep decoded files. If `None`, stops using the cache.
+    max_size : int, optional
+        The maximum total size of the cache in bytes. Defaults to 1 GiB.
+
+    Notes
+    -----
+    The results are stored using :mod:`pickle`, so the directory should only be
+    writable by trusted users.
+
+    """
+    global _product_cache
+    _product_cache = DiskCache(directory, max_size) if directory is not None else None
+
+
+def _cache_key(cls, filename, metadata_only):
+    """Get the key for a decoded file in the product cache, or `None` if not cacheable."""
+    if _product_cache is None or not is_string_like(filename):
+        return None
+
+    try:
+        stat = os.stat(filename)
+    except EnvironmentError:
+        return None
+
+    return (cls.__name__, os.path.realpath(filename), stat.st_mtime, stat.st_size,
+            metadata_only, __version__)
+
 
 @exporter.export
 class Level2File(object):
@@ -164,18 +279,40 @@ class Level2File(object):
     MISSING = float('nan')
     RANGE_FOLD = float('nan')  # TODO: Need to separate from missing
 
-    def __init__(self, filename):
+    # Starting bytes of the volume header's version ('AR2V0006.', 'ARCHIVE2.', etc.)
+    vol_hdr_tags = (b'AR2V', b'ARCH')
+
+    def __init__(self, filename, metadata_only=False):
         r"""Create instance of `Level2File`.
 
         Parameters
         ----------
-        filename : str or file-like object
-            If str, the name of the file to be opened. Gzip-ed files are
-            recognized with the extension '.gz', as are bzip2-ed files with
-            the extension `.bz2` If `fname` is a file-like object,
+        filename : str, bytes-like, or file-like object
+            If str, the name of the file to be opened. If bytes-like (`bytes`, `bytearray`,
+            or `memoryview`), the contents of the file, which are used without making an
+            extra copy where possible. Gzip-ed and bzip2-ed files and contents are
+            recognized from their first bytes. If `filename` is a file-like object,
             this will be read from directly.
+        metadata_only : bool, optional
+            If `True`, only decode the volume header, the metadata messages, and the first
+            radial, which is useful for quickly scanning many files. Defaults to `False`.
+
+        See Also
+        --------
+        set_product_cache
 
         """
+        key = _cache_key(type(self), filename, metadata_only)
+        state = _product_cache.get(key) if key else None
+        if state is not None:
+            self.__dict__.update(state)
+            return
+
+        self._decode(filename, metadata_only)
+        if key:
+            _product_cache.put(key, self.__getstate__())
+
+    def _decode(self, filename, metadata_only):
         fobj = open_as_needed(filename)
 
         with contextlib.closing(fobj):
@@ -184,14 +321,23 @@ class Level2File(object):
         self._read_volume_header()
         start = self._buffer.set_mark()
 
-        # See if we need to apply bz2 decompression
+        # See if we need to apply bz2 decompression. For only metadata, we only need the
+        # first block of metadata messages and the block with the first radials.
+        decompress = functools.partial(bzip_blocks_decompress_all,
+                                       max_blocks=2 if metadata_only else None)
         try:
-            self._buffer = IOBuffer(self._buffer.read_func(bzip_blocks_decompress_all))
+            self._buffer = IOBuffer(self._buffer.read_func(decompress))
         except ValueError:
             self._buffer.jump_to(start)
 
         # Now we're all initialized, we can proceed with reading in data
-        self._read_data()
+        self._read_data(metadata_only)
+
+    def __getstate__(self):
+        """Return the state for pickling, leaving out the buffer of raw bytes."""
+        state = self.__dict__.copy()
+        state.pop('_buffer', None)
+        return state
 
     vol_hdr_fmt = NamedStruct([('version', '9s'), ('vol_num', '3s'),
                                ('date', 'L'), ('time_ms', 'L'), ('stid', '4s')], '>', 'VolHdr')
@@ -209,10 +355,20 @@ class Level2File(object):
                                ('time_ms', 'I'), ('num_segments', 'H'), ('segment_num', 'H')],
                               '>', 'MsgHdr')
 
-    def _read_data(self):
+    def _read_data(self, first_radial_only=False):
         self._msg_buf = {}
         self.sweeps = []
         self.rda_status = []
+        self._read_messages(first_radial_only)
+
+        # Check if we have any message segments still in the buffer
+        if self._msg_buf:
+            log.warning('Remaining buffered messages segments for message type(s): %s',
+                        ' '.join(map(str, self._msg_buf)))
+
+        del self._msg_buf
+
+    def _read_messages(self, first_radial_only=False):
         while not self._buffer.at_end():
             # Clear old file book marks and set the start of message for
             # easy jumping to the end
@@ -257,17 +413,13 @@ class Level2File(object):
                 else:
                     log.warning('Unknown message: %d', msg_hdr.msg_type)
 
+                if first_radial_only and self.sweeps:
+                    break
+
             # Jump to the start of the next message. This depends on whether
             # the message was legacy with fixed block size or not.
             self._buffer.jump_to(msg_start, msg_bytes)
 
-        # Check if we have any message segments still in the buffer
-        if self._msg_buf:
-            log.warning('Remaining buffered messages segments for message type(s): %s',
-                        ' '.join(map(str, self._msg_buf)))
-
-        del self._msg_buf
-
     msg1_fmt = NamedStruct([('time_ms', 'L'), ('date', 'H'),
                             ('unamb_range', 'H', scaler(0.1)), ('az_angle', 'H', angle),
                             ('az_num', 'H'), ('rad_status', 'H', remap_status),
@@ -285,8 +437,8 @@ class Level2File(object):
                             ('spot_blanking', 'B', BitField('Radial', 'Elevation', 'Volume')),
                             (None, '32x')], '>', 'Msg1Fmt')
 
-    msg1_data_hdr = namedtuple('Msg1DataHdr',
-                               'name first_gate gate_width num_gates scale offset')
+    msg1_data_hdr = _named_tuple('Msg1DataHdr', ['name', 'first_gate', 'gate_width',
+                                                 'num_gates', 'scale', 'offset'])
 
     def _decode_msg1(self, msg_hdr):
         msg_start = self._buffer.set_mark()
@@ -317,7 +469,7 @@ class Level2File(object):
         for ptr, data_hdr in read_info:
             # Jump and read
             self._buffer.jump_to(msg_start, ptr)
-            vals = np.array(self._buffer.read_binary(data_hdr.num_gates, 'B'))
+            vals = self._buffer.read_array(data_hdr.num_gates, 'B')
 
             # Scale and flag data
             scaled_vals = (vals - data_hdr.offset) / data_hdr.scale
@@ -382,9 +534,8 @@ class Level2File(object):
         self._check_size(msg_hdr, self.msg2_fmt.size + extra_size)
 
     def _decode_msg3(self, msg_hdr):
-        from ._nexrad_msgs.msg3 import descriptions, fields
+        from ._nexrad_msgs.msg3 import descriptions, msg_fmt
         self.maintenance_data_desc = descriptions
-        msg_fmt = DictStruct(fields, '>')
         self.maintenance_data = self._buffer.read_struct(msg_fmt)
         self._check_size(msg_hdr, msg_fmt.size)
 
@@ -499,12 +650,10 @@ class Level2File(object):
         # will be returned concatenated when this is the case
         data = self._buffer_segment(msg_hdr)
         if data:
-            from ._nexrad_msgs.msg18 import descriptions, fields
-            self.rda_adaptation_desc = descriptions
-
             # Can't use NamedStruct because we have more than 255 items--this
-            # is a CPython limit for arguments.
-            msg_fmt = DictStruct(fields, '>')
+            # is a CPython limit for arguments--so this is a DictStruct.
+            from ._nexrad_msgs.msg18 import descriptions, msg_fmt
+            self.rda_adaptation_desc = descriptions
             self.rda = msg_fmt.unpack(data)
             for num in (11, 21, 31, 32, 300, 301):
                 attr = 'VCPAT' + str(num)
@@ -599,8 +748,7 @@ class Level2File(object):
                 block_count += 1
                 self._buffer.jump_to(msg_start, ptr)
                 hdr = self._buffer.read_struct(self.data_block_fmt)
-                vals = np.array(self._buffer.read_binary(hdr.num_gates,
-                                                         '>' + hdr.data_size))
+                vals = self._buffer.read_array(hdr.num_gates, '>' + hdr.data_size)
                 scaled_vals = (vals - hdr.offset) / hdr.scale
                 scaled_vals[vals == 0] = self.MISSING
                 scaled_vals[vals == 1] = self.RANGE_FOLD
@@ -651,6 +799,95 @@ class Level2File(object):
                         msg_hdr.msg_type, size, hdr_size)
 
 
+@exporter.export
+class Level2ChunkReader(Level2File):
+    r"""Incrementally decode NEXRAD Level 2 data from real-time chunks as they arrive.
+
+    In real-time, a volume of Level 2 data is distributed as a series of chunk files: a
+    start chunk containing the volume header and metadata messages, followed by
+    intermediate chunks and an end chunk, each containing one or more bzip2-compressed
+    blocks of radials. This class decodes each chunk as it is added, so that sweeps can
+    be used as soon as they are complete, rather than waiting on the full volume.
+
+    Attributes
+    ----------
+    completed_sweeps : list of int
+        Indices into `sweeps` for those that have seen their end of elevation radial
+    volume_complete : bool
+        Whether the end of the volume has been seen
+
+    See Also
+    --------
+    Level2File
+
+    """
+
+    def __init__(self, chunks=()):
+        r"""Create instance of `Level2ChunkReader`.
+
+        Parameters
+        ----------
+        chunks : iterable of str or file-like object, optional
+            Any chunks to start with, passed in order to :meth:`add_chunk`.
+
+        """
+        self._msg_buf = {}
+        self.sweeps = []
+        self.rda_status = []
+        self.completed_sweeps = []
+        self.volume_complete = False
+        for chunk in chunks:
+            self.add_chunk(chunk)
+
+    def add_chunk(self, chunk):
+        r"""Decode the radials and other messages from another chunk of the volume.
+
+        Parameters
+        ----------
+        chunk : str or file-like object
+            If str, the name of the file to be opened. If `chunk` is a file-like object,
+            this will be read from directly. Chunks must be added in order.
+
+        Returns
+        -------
+        list of int
+            Indices into `sweeps` for any sweeps that were completed by this chunk
+
+        """
+        fobj = open_as_needed(chunk)
+
+        with contextlib.closing(fobj):
+            self._buffer = IOBuffer.fromfile(fobj)
+
+        # Only the start chunk has the volume header
+        if self._buffer.get_next(4) in self.vol_hdr_tags:
+            self._read_volume_header()
+
+        start = self._buffer.set_mark()
+        try:
+            self._buffer = IOBuffer(self._buffer.read_func(bzip_blocks_decompress_all))
+        except ValueError:
+            self._buffer.jump_to(start)
+
+        num_completed = len(self.completed_sweeps)
+        self._read_messages()
+        return self.completed_sweeps[num_completed:]
+
+    def _decode_msg1(self, msg_hdr):
+        super(Level2ChunkReader, self)._decode_msg1(msg_hdr)
+        self._check_sweep_end(self.sweeps[-1][-1][0])
+
+    def _decode_msg31(self, msg_hdr):
+        super(Level2ChunkReader, self)._decode_msg31(msg_hdr)
+        self._check_sweep_end(self.sweeps[-1][-1][0])
+
+    def _check_sweep_end(self, hdr):
+        if hdr.rad_status & END_ELEVATION:
+            self.completed_sweeps.append(len(self.sweeps) - 1)
+        if hdr.rad_status & END_VOLUME:
+            self.volume_complete = True
+
+
 def reduce_lists(d):
     """Replace single item lists in a dictionary with the single item."""
     for field in d:
@@ -659,6 +896,50 @@ def reduce_lists(d):
             d[field] = old_data[0]
 
 
+def runs_to_array(vals, runs, runs_per_row, num_cols=None):
+    """Expand run-length encoded values into a 2D array with a row per set of runs.
+
+    Parameters
+    ----------
+    vals : array-like
+        The value for each run
+    runs : array-like
+        The number of repeats of each value
+    runs_per_row : list of int
+        The number of runs that make up each row
+    num_cols : int, optional
+        The number of columns in the returned array; defaults to the length of the longest
+        row. Shorter rows are padded with 0, and longer rows truncated.
+
+    Returns
+    -------
+    `numpy.ndarray`
+        2D array of the expanded values
+
+    """
+    # Find the number of values in each row from the cumulative number of values
+    runs_per_row = np.asarray(runs_per_row, dtype=np.intp)
+    run_ends = np.cumsum(runs_per_row)
+    total_vals = np.concatenate(([0], np.cumsum(runs, dtype=np.intp)))
+    row_starts = total_vals[run_ends - runs_per_row]
+    row_lens = total_vals[run_ends] - row_starts
+    if num_cols is None:
+        num_cols = row_lens.max() if row_lens.size else 0
+
+    expanded = np.repeat(np.asarray(vals, dtype=np.uint8), runs)
+    if np.all(row_lens == num_cols):
+        return expanded.reshape(len(row_lens), num_cols)
+
+    # Rows are not all the right length, so figure out the column for each value and
+    # place them in the array
+    data = np.zeros((len(row_lens), num_cols), dtype=np.uint8)
+    row_inds = np.repeat(np.arange(len(row_lens)), row_lens)
+    col_inds = np.arange(expanded.size) - np.repeat(row_starts, row_lens)
+    keep = col_inds < num_cols
+    data[row_inds[keep], col_inds[keep]] = expanded[keep]
+    return data
+
+
 def two_comp16(val):
     """Return the two's-complement signed representation of a 16-bit unsigned integer."""
     if val >> 15:
@@ -967,6 +1248,11 @@ class LegacyMapper(DataMapper):
         self.lut = np.array(self.lut)
 
 
+# Cache of mappers, which can be shared between any files with the same product and
+# thresholds
+_mapper_cache = LRUCache(maxsize=64)
+
+
 @exporter.export
 class Level3File(object):
     r"""Handle reading the wide array of NEXRAD Level 3 (NIDS) product files.
@@ -996,7 +1282,8 @@ class Level3File(object):
     max_range : float
         Maximum range of the product, taken from the NIDS ICD
     map_data : Mapper
-        Class instance mapping data int values to proper floating point values
+        Class instance mapping data int values to proper floating point values. Instances
+        are cached and shared between files with the same product code and thresholds.
     sym_block : list, optional
         Any symbology block packets that were found
     tab_pages : list, optional
@@ -1530,16 +1817,41 @@ class Level3File(object):
                            (('el_angle', scaled_elem(2, 0.1)),
                             ('max', 3)))}
 
-    def __init__(self, filename):
+    # Number of decompressed bytes needed to get through the product description block (or
+    # the GSM), including any WMO header
+    metadata_bytes = 512
+
+    def __init__(self, filename, metadata_only=False):
         r"""Create instance of `Level3File`.
 
         Parameters
         ----------
-        filename : str or file-like object
-            If str, the name of the file to be opened. If file-like object,
-            this will be read from directly.
+        filename : str, bytes-like, or file-like object
+            If str, the name of the file to be opened. If bytes-like (`bytes`, `bytearray`,
+            or `memoryview`), the contents of the file, which are used without making an
+            extra copy where possible. If file-like object, this will be read from directly.
+        metadata_only : bool, optional
+            If `True`, only decompress and decode the headers and product description block,
+            skipping the product's data. This is useful for quickly scanning many products.
+            Defaults to `False`.
+
+        See Also
+        --------
+        set_product_cache
 
         """
+        key = _cache_key(type(self), filename, metadata_only)
+        state = _product_cache.get(key) if key else None
+        if state is not None:
+            self.__dict__.update(state)
+            self.filename = filename
+            return
+
+        self._decode(filename, metadata_only)
+        if key:
+            _product_cache.put(key, self.__getstate__())
+
+    def _decode(self, filename, metadata_only):
         fobj = open_as_needed(filename)
         self.filename = filename if is_string_like(filename) else 'No File'
 
@@ -1568,7 +1880,9 @@ class Level3File(object):
             return
 
         # Decompress the data if necessary, and if so, pop off new header
-        self._buffer = IOBuffer(self._buffer.read_func(zlib_decompress_all_frames))
+        max_length = self.metadata_bytes if metadata_only else None
+        self._buffer = IOBuffer(self._buffer.read_func(
+            functools.partial(zlib_decompress_all_frames, max_length=max_length)))
         self._process_wmo_header()
 
         # Check for empty product
@@ -1582,11 +1896,11 @@ class Level3File(object):
         log.debug('Buffer size: %d (%d expected) Header: %s', len(self._buffer),
                   self.header.msg_len, self.header)
 
-        if not self._buffer.check_remains(self.header.msg_len - self.header_fmt.size):
+        remaining = self.header.msg_len - self.header_fmt.size
+        if not metadata_only and not self._buffer.check_remains(remaining):
             log.warning('Product contains an unexpected amount of data remaining--have: %d '
                         'expected: %d. This product may not parse correctly.',
-                        len(self._buffer) - self._buffer._offset,
-                        self.header.msg_len - self.header_fmt.size)
+                        len(self._buffer) - self._buffer._offset, remaining)
 
         # Handle GSM and jump out
         if self.header.code == 2:
@@ -1630,9 +1944,14 @@ class Level3File(object):
             else:
                 self.metadata[name] = self.depVals[block]
 
+        if metadata_only:
+            return
+
         # Now that we have the header, we have everything needed to make tables
-        # Store as class that can be called
-        self.map_data = mapper(self)
+        # Store as class that can be called. These only depend on the product and its
+        # thresholds, so are cached and shared between files.
+        self.map_data = _mapper_cache.fetch((self.header.code, mapper, tuple(self.thresholds)),
+                                            mapper, self)
 
         # Process compression if indicated. We need to fail
         # gracefully here since we default to it being on
@@ -1674,6 +1993,12 @@ class Level3File(object):
             log.warning('%s: Using default metadata for product %d',
                         self.filename, self.header.code)
 
+    def __getstate__(self):
+        """Return the state for pickling, leaving out the buffer of raw bytes."""
+        state = self.__dict__.copy()
+        state.pop('_buffer', None)
+        return state
+
     def _process_wmo_header(self):
         # Read off the WMO header if necessary
         data = self._buffer.get_next(64).decode('ascii', 'ignore')
@@ -1693,13 +2018,11 @@ class Level3File(object):
             self._buffer.truncate(4)
 
     @staticmethod
-    def _unpack_rle_data(data):
-        # Unpack Run-length encoded data
-        unpacked = []
-        for run in data:
-            num, val = run >> 4, run & 0x0F
-            unpacked.extend([val] * num)
-        return unpacked
+    def _unpack_rle_data(rows, num_bins=None):
+        # Unpack Run-length encoded data, where each byte has the run length in the upper
+        # 4 bits and the value in the lower 4 bits. Decodes all rows at once into an array.
+        runs = np.frombuffer(bytearray().join(rows), dtype=np.uint8)
+        return runs_to_array(runs & 0x0F, runs >> 4, [len(row) for row in rows], num_bins)
 
     @staticmethod
     def pos_scale(is_sym_block):
@@ -1835,11 +2158,11 @@ class Level3File(object):
             rad = self._buffer.read_struct(rad_fmt)
             start_az = rad.start_angle * 0.1
             end_az = start_az + rad.angle_delta * 0.1
-            rads.append((start_az, end_az,
-                         self._unpack_rle_data(
-                             self._buffer.read_binary(2 * rad.num_hwords))))
+            rads.append((start_az, end_az, self._buffer.read_binary(2 * rad.num_hwords)))
         start, end, vals = zip(*rads)
-        return {'start_az': list(start), 'end_az': list(end), 'data': list(vals),
+        return {'start_az': np.array(start, dtype=np.float32),
+                'end_az': np.array(end, dtype=np.float32),
+                'data': self._unpack_rle_data(vals, hdr.nbins),
                 'center': (hdr.i_center * self.pos_scale(in_sym_block),
                            hdr.j_center * self.pos_scale(in_sym_block)),
                 'gate_scale': hdr.scale_factor * 0.001, 'first': hdr.ind_first_bin}
@@ -1852,14 +2175,42 @@ class Level3File(object):
         rad_fmt = NamedStruct([('num_bytes', 'H'), ('start_angle', 'h'),
                                ('angle_delta', 'h')], '>', 'DigitalRadialData')
         hdr = self._buffer.read_struct(hdr_fmt)
-        rads = []
-        for _ in range(hdr.num_rad):
-            rad = self._buffer.read_struct(rad_fmt)
-            start_az = rad.start_angle * 0.1
-            end_az = start_az + rad.angle_delta * 0.1
-            rads.append((start_az, end_az, self._buffer.read_binary(rad.num_bytes)))
-        start, end, vals = zip(*rads)
-        return {'start_az': list(start), 'end_az': list(end), 'data': list(vals),
+        rads_start = self._buffer.set_mark()
+
+        # Radials should all be the same size, so peek at the first radial's size and try
+        # to read all of them at once.
+        num_bytes = self._buffer.read_struct(rad_fmt).num_bytes
+        self._buffer.jump_to(rads_start)
+        try:
+            rads = self._buffer.read_array(hdr.num_rad,
+                                           [('num_bytes', '>u2'), ('start_angle', '>i2'),
+                                            ('angle_delta', '>i2'), ('data', 'u1', num_bytes)])
+            same_size = np.all(rads['num_bytes'] == num_bytes)
+        except ValueError:  # Not enough data left, so the sizes must vary
+            same_size = False
+
+        data = np.zeros((hdr.num_rad, hdr.nbins), dtype=np.uint8)
+        if same_size:
+            num_bins = min(num_bytes, hdr.nbins)
+            data[:, :num_bins] = rads['data'][:, :num_bins]
+            start_angle = rads['start_angle']
+            angle_delta = rads['angle_delta']
+        else:
+            # Otherwise, go back and read them one at a time
+            self._buffer.jump_to(rads_start)
+            start_angle = np.empty(hdr.num_rad, dtype=np.int16)
+            angle_delta = np.empty(hdr.num_rad, dtype=np.int16)
+            for ind in range(hdr.num_rad):
+                rad = self._buffer.read_struct(rad_fmt)
+                start_angle[ind] = rad.start_angle
+                angle_delta[ind] = rad.angle_delta
+                num_bins = min(rad.num_bytes, hdr.nbins)
+                data[ind, :num_bins] = self._buffer.read_array(num_bins, np.uint8)
+                self._buffer.skip(rad.num_bytes - num_bins)
+
+        start_az = (start_angle * 0.1).astype(np.float32)
+        end_az = start_az + (angle_delta * 0.1).astype(np.float32)
+        return {'start_az': start_az, 'end_az': end_az, 'data': data,
                 'center': (hdr.i_center * self.pos_scale(in_sym_block),
                            hdr.j_center * self.pos_scale(in_sym_block)),
                 'gate_scale': hdr.scale_factor * 0.001, 'first': hdr.ind_first_bin}
@@ -1876,9 +2227,9 @@ class Level3File(object):
         rows = []
         for _ in range(hdr.num_rows):
             num_bytes = self._buffer.read_int('>H')
-            rows.append(self._unpack_rle_data(self._buffer.read_binary(num_bytes)))
+            rows.append(self._buffer.read_binary(num_bytes))
         return {'start_x': hdr.i_start * hdr.xscale_int,
-                'start_y': hdr.j_start * hdr.yscale_int, 'data': rows}
+                'start_y': hdr.j_start * hdr.yscale_int, 'data': self._unpack_rle_data(rows)}
 
     def _unpack_packet_uniform_text(self, code, in_sym_block):
         # By not using a struct, we can handle multiple codes
@@ -2017,17 +2368,17 @@ class Level3File(object):
         # Read off each row and decode the RLE data
         for _ in range(num_rows):
             row_num_bytes = self._buffer.read_int('>H')
-            row_bytes = self._buffer.read_binary(row_num_bytes)
-            if code == 18:
-                row = self._unpack_rle_data(row_bytes)
-            else:
-                row = []
-                for run, level in zip(row_bytes[::2], row_bytes[1::2]):
-                    row.extend([level] * run)
-            assert len(row) == lfm_boxes
-            rows.append(row)
+            rows.append(self._buffer.read_binary(row_num_bytes))
 
-        return {'data': rows}
+        if code == 18:
+            data = self._unpack_rle_data(rows)
+        else:
+            # Bytes are pairs of run length and level
+            pairs = np.frombuffer(bytearray().join(rows), dtype=np.uint8)
+            data = runs_to_array(pairs[1::2], pairs[::2], [len(row) // 2 for row in rows])
+        assert data.shape[-1] == lfm_boxes
+
+        return {'data': data}
 
     def _unpack_packet_linked_vector(self, code, in_sym_block):
         num_bytes = self._buffer.read_int('>h')
@@ -2265,12 +2616,12 @@ class Level3XDRParser(Unpacker):
 
         return ret
 
-    radial_fmt = namedtuple('RadialComponent', ['description', 'gate_width',
-                                                'first_gate', 'parameters',
-                                                'radials'])
-    radial_data_fmt = namedtuple('RadialData', ['azimuth', 'elevation', 'width',
-                                                'num_bins', 'attributes',
-                                                'data'])
+    radial_fmt = _named_tuple('RadialComponent', ['description', 'gate_width',
+                                                  'first_gate', 'parameters',
+                                                  'radials'])
+    radial_data_fmt = _named_tuple('RadialData', ['azimuth', 'elevation', 'width',
+                                                  'num_bins', 'attributes',
+                                                  'data'])
 
     def _unpack_radial(self):
         ret = self.radial_fmt(description=self.unpack_string(),
@@ -2290,7 +2641,7 @@ class Level3XDRParser(Unpacker):
                                              data=self.unpack_array(self.unpack_int)))
         return ret._replace(radials=rads)
 
-    text_fmt = namedtuple('TextComponent', ['parameters', 'text'])
+    text_fmt = _named_tuple('TextComponent', ['parameters', 'text'])
 
     def _unpack_text(self):
         return self.text_fmt(parameters=self._unpack_parameters(),
@@ -2315,3 +2666,117 @@ def is_precip_mode(vcp_num):
 
     """
     return not vcp_num // 10 == 3
+
+
+def _open_nexrad_file(fname):
+    """Decode a NEXRAD file, determining whether it is Level 2 or Level 3 from the data."""
+    fobj = open_as_needed(fname)
+    with contextlib.closing(fobj):
+        is_level2 = fobj.read(4) in Level2File.vol_hdr_tags
+    return Level2File(fname) if is_level2 else Level3File(fname)
+
+
+def _decode_nexrad_file(fname, reader, func):
+    """Decode a single file in a worker process, returning the filename and result."""
+    try:
+        decoded = reader(fname)
+    except Exception as e:
+        # Don't let one bad file stop the whole batch
+        log.warning('Unable to decode %s: %s', fname, e)
+        return fname, None
+
+    return fname, decoded if func is None else func(decoded)
+
+
+@exporter.export
+def read_nexrad_files(filenames, reader=None, processes=None, chunksize=1, ordered=True,
+                      func=None):
+    r"""Decode a collection of NEXRAD files in parallel, using a pool of processes.
+
+    Parameters
+    ----------
+    filenames : iterable of str
+        The names of the files to decode
+    reader : callable, optional
+        Class or function called with each filename to decode it, such as
+        :class:`Level2File` or :class:`Level3File`. Defaults to `None`, in which case the
+        kind of file is determined from the data in each file.
+    processes : int, optional
+        The number of worker processes to use. Defaults to `None`, which uses the number of
+        CPUs available.
+    chunksize : int, optional
+        The number of files given to a worker process at once. Larger values reduce the
+        overhead of communicating with the workers when decoding many small files.
+        Defaults to 1.
+    ordered : bool, optional
+        Whether results are returned in the same order as `filenames`; otherwise they are
+        returned as they are completed. Defaults to `True`.
+    func : callable, optional
+        Function run in the worker on each decoded file, whose return value is returned in
+        place of the decoded file. This is useful to only send back the data needed rather
+        than the entire decoded file. Both `reader` and `func` need to be picklable, e.g.
+        module-level functions.
+
+    Returns
+    -------
+    generator of (str, object) tuples
+        Each filename, and the decoded file (or the result of `func`). If a file fails to
+        decode, a warning is logged and `None` is returned for it.
+
+    """
+    if reader is None:
+        reader = _open_nexrad_file
+
+    pool = Pool(processes)
+    try:
+        mapper = pool.imap if ordered else pool.imap_unordered
+        for result in mapper(functools.partial(_decode_nexrad_file, reader=reader, func=func),
+                             filenames, chunksize):
+            yield result
+    finally:
+        pool.terminate()
+        pool.join()
+
+
+@exporter.export
+def read_nexrad_async(source, reader=None, executor=None, loop=None):
+    r"""Decode a NEXRAD file without blocking an :mod:`asyncio` event loop.
+
+    Decoding runs in `executor`, so a coroutine can ``await`` the result while the event
+    loop continues handling other work, such as receiving more products.
+
+    Parameters
+    ----------
+    source : str, bytes-like, or file-like object
+        The file to decode, such as the contents of a product received over the network
+    reader : callable, optional
+        Class or function called with `source` to decode it, such as :class:`Level2File` or
+        :class:`Level3File`. Defaults to `None`, in which case the kind of file is
+        determined from the data.
+    executor : `concurrent.futures.Executor`, optional
+        The executor in which to decode. Defaults to `None`, which uses the event loop's
+        default pool of threads; this works well since decompression releases the GIL.
+        A `concurrent.futures.ProcessPoolExecutor` decodes fully in parallel, at the cost
+        of sending `source` and the decoded file between processes.
+    loop : `asyncio.AbstractEventLoop`, optional
+        The event loop to use. Defaults to the current event loop.
+
+    Returns
+    -------
+    `asyncio.Future`
+        The decoded file, once complete
+
+    Notes
+    -----
+    This requires Python 3.
+
+    """
+    import asyncio
+
+    if reader is None:
+        reader = _open_nexrad_file
+
+    if loop is None:
+        loop = asyncio.get_event_loop()
+
+    return loop.run_in_executor(executor, reader, source)
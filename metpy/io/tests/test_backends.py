@@ -0,0 +1,179 @@
+# Copyright (c) 2018 MetPy Developers.
+# Distributed under the terms of the BSD 3-Clause License.
+# SPDX-License-Identifier: BSD-3-Clause
+"""Test opening files as xarray datasets."""
+
+import logging
+
+import numpy as np
+from numpy.testing import assert_array_almost_equal
+import pytest
+import xarray as xr
+
+from metpy.cbook import get_test_data
+from metpy.io import (GiniFile, Level2File, Level3File, open_dataset, open_mfdataset,
+                      write_level2_archive)
+from metpy.io.backends import _guess_engine
+
+logging.getLogger('metpy.io').setLevel(logging.ERROR)
+
+
+def test_open_gini():
+    """Test that opening GINI files matches using `GiniFile` as a data store."""
+    fname = get_test_data('WEST-CONUS_4km_WV_20151208_2200.gini', as_file_obj=False)
+    ds = open_dataset(fname)
+    truth = xr.open_dataset(GiniFile(fname))
+    assert ds.satellite == 'GOES-15'
+    assert ds['WV'][150, 150] == truth['WV'][150, 150]
+
+
+def test_open_level2():
+    """Test opening a sweep of a Level 2 file."""
+    fname = get_test_data('Level2_KFTG_20150430_1419.ar2v', as_file_obj=False)
+    ds = open_dataset(fname, backend_kwargs={'sweep': 1})
+    f = Level2File(fname)
+
+    assert ds.station == 'KFTG'
+    assert ds['REF'].dims == ('radial', 'range_REF')
+    assert ds['REF'].shape == (len(f.sweeps[1]), 1192)
+    assert_array_almost_equal(ds['azimuth'], [ray[0].az_angle for ray in f.sweeps[1]], 4)
+    assert_array_almost_equal(ds['range_REF'][:2], [2.125, 2.375], 4)
+    np.testing.assert_array_equal(ds['VEL'][10].values, f.sweeps[1][10][4][b'VEL'][1])
+    assert ds['time'] == np.datetime64('2015-04-30T14:19:27.902')
+
+
+def test_open_level2_lazy():
+    """Test that the moments of a Level 2 sweep are only copied into arrays when indexed."""
+    fname = get_test_data('Level2_KFTG_20150430_1419.ar2v', as_file_obj=False)
+    ds = open_dataset(fname, backend_kwargs={'sweep': 1})
+    f = Level2File(fname)
+    radials = f.sweeps[1]
+
+    assert not ds['VEL'].variable._in_memory
+    assert ds['VEL'].dtype == radials[0][4][b'VEL'][1].dtype
+    subset = ds['VEL'][10:20:3, 5:50].values
+    assert not ds['VEL'].variable._in_memory
+    truth = np.array([radial[4][b'VEL'][1][5:50] for radial in radials[10:20:3]])
+    np.testing.assert_array_equal(subset, truth)
+    np.testing.assert_array_equal(ds['VEL'][-1].values, radials[-1][4][b'VEL'][1])
+
+
+def test_write_level2_archive(tmpdir):
+    """Test that moments in a Level 2 archive are packed integers matching the file."""
+    fname = get_test_data('KTLX19990503_235621.gz', as_file_obj=False)
+    path = str(tmpdir.join('archive.nc'))
+    write_level2_archive(fname, path, sweeps=[0, 2])
+
+    ds = xr.open_dataset(path, group='sweep_2')
+    truth = open_dataset(fname, backend_kwargs={'sweep': 2})
+    assert ds['REF'].encoding['dtype'] == np.uint8
+    assert ds['REF'].encoding['chunksizes'] == ds['REF'].shape
+    assert_array_almost_equal(ds['REF'].values, truth['REF'].values, 6)
+    assert_array_almost_equal(ds['azimuth'].values, truth['azimuth'].values, 6)
+    ds.close()
+
+    with pytest.raises(IOError):
+        xr.open_dataset(path, group='sweep_1')
+
+
+def test_write_level2_archive_zarr(tmpdir):
+    """Test writing sweeps with 8- and 16-bit moments to a zarr archive."""
+    zarr = pytest.importorskip('zarr')
+    fname = get_test_data('Level2_KFTG_20150430_1419.ar2v', as_file_obj=False)
+    f = Level2File(fname)
+    path = str(tmpdir.join('archive.zarr'))
+    write_level2_archive(f, path, sweeps=[2], engine='zarr')
+    write_level2_archive(f, path, sweeps=[0, 1], engine='zarr')
+    assert sorted(zarr.open_group(path).group_keys()) == ['sweep_0', 'sweep_1']
+
+    for sweep, dtypes in [(0, {'REF': np.uint8, 'PHI': np.uint16}),
+                          (1, {'REF': np.uint8, 'VEL': np.uint8})]:
+        ds = xr.open_zarr(path, group='sweep_{}'.format(sweep))
+        truth = open_dataset(fname, backend_kwargs={'sweep': sweep})
+        for name, dtype in dtypes.items():
+            assert ds[name].encoding['dtype'] == dtype
+            assert ds[name].encoding['chunks'] == ds[name].shape
+            np.testing.assert_allclose(ds[name].values, truth[name].values, rtol=1e-6)
+
+
+def test_open_level3():
+    """Test opening a Level 3 product with radial data."""
+    fname = get_test_data('nids/KOUN_SDUS54_N0QTLX_201305202016', as_file_obj=False)
+    ds = open_dataset(fname, engine='nexrad_level3')
+    f = Level3File(fname)
+
+    var = ds['Base Reflectivity Data Array']
+    assert var.dims == ('radial', 'range')
+    assert var.shape == (360, 460)
+    assert_array_almost_equal(ds['range'][:2], [0.5, 1.5], 4)
+    assert_array_almost_equal(ds['azimuth'][0], f.sym_block[0][0]['start_az'][0] + 0.5, 4)
+    assert ds['elevation'] == 0.5
+    np.testing.assert_array_equal(var[0].values, f.map_data(f.sym_block[0][0]['data'][0]))
+
+
+def test_open_level3_unsupported():
+    """Test that products without radial data give an error."""
+    with pytest.raises(NotImplementedError):
+        open_dataset(get_test_data('nids/KOUN_SDUS64_NHITLX_201305202016',
+                                   as_file_obj=False))
+
+
+def test_open_file_obj_needs_engine():
+    """Test that the engine must be given for file-like objects."""
+    with pytest.raises(ValueError):
+        open_dataset(get_test_data('nids/KOUN_SDUS54_N0QTLX_201305202016'))
+
+
+@pytest.mark.parametrize('fname,engine', [
+    ('WEST-CONUS_4km_WV_20151208_2200.gini', 'gini'),
+    ('KTLX19990503_235621.gz', 'nexrad_level2'),
+    ('nids/KOUN_SDUS54_N0QTLX_201305202016', 'nexrad_level3'),
+    ('nids/Level3_FFC_N0Q_20140407_1805.nids', 'nexrad_level3'),
+    ('gfs_output.nc', None),
+    ('may4_sounding.txt', None)])
+def test_guess_engine(fname, engine):
+    """Test determining the engine from the start of a file."""
+    assert _guess_engine(get_test_data(fname, as_file_obj=False)) == engine
+
+
+def test_guess_engine_level3_no_wmo_header(tmpdir):
+    """Test recognizing a Level 3 product that starts with the message header."""
+    with open(get_test_data('nids/KOUN_SDUS54_N0QTLX_201305202016', as_file_obj=False),
+              'rb') as fobj:
+        data = fobj.read()
+    wmo = Level3File.wmo_finder.search(data[:64].decode('utf-8', 'ignore'))
+    path = str(tmpdir.join('n0q.nids'))
+    with open(path, 'wb') as fobj:
+        fobj.write(data[wmo.end():])
+
+    assert _guess_engine(path) == 'nexrad_level3'
+    assert open_dataset(path)['Base Reflectivity Data Array'].shape == (360, 460)
+
+
+def test_open_unknown_file():
+    """Test that a file with an unrecognized format gives an error."""
+    with pytest.raises(ValueError):
+        open_dataset(get_test_data('gfs_output.nc', as_file_obj=False))
+
+
+def test_open_chunks():
+    """Test opening a file into dask arrays."""
+    pytest.importorskip('dask')
+    ds = open_dataset(get_test_data('nids/KOUN_SDUS54_N0QTLX_201305202016', as_file_obj=False),
+                      chunks={'radial': 90})
+    assert ds['Base Reflectivity Data Array'].chunks == ((90,) * 4, (460,))
+
+
+@pytest.mark.parametrize('parallel', [False, True])
+def test_open_mfdataset(parallel):
+    """Test opening multiple products as a single dataset."""
+    pytest.importorskip('dask')
+    fnames = [get_test_data('nids/KOUN_SDUS54_{}TLX_201305202016'.format(prod),
+                            as_file_obj=False) for prod in ('N0Q', 'NAQ')]
+    ds = open_mfdataset(fnames, parallel=parallel)
+
+    var = ds['Base Reflectivity Data Array']
+    assert var.dims == ('time', 'radial', 'range')
+    assert var.shape == (2, 360, 460)
+    assert ds['azimuth'].dims == ('time', 'radial')
+    assert_array_almost_equal(ds['elevation'], [0.5, 0.9], 4)
@@ -5,6 +5,7 @@
 
 from datetime import datetime
 import logging
+import sys
 
 import numpy as np
 from numpy.testing import assert_almost_equal
@@ -14,7 +15,8 @@ import xarray as xr
 from metpy.cbook import get_test_data
 from metpy.deprecation import MetpyDeprecationWarning
 from metpy.io import GiniFile
-from metpy.io.gini import GiniProjection
+from metpy.io._tools import zlib_decompress_all_frames
+from metpy.io.gini import _lon_lat_cache, GiniProjection
 
 logging.getLogger('metpy.io.gini').setLevel(logging.ERROR)
 
@@ -209,3 +211,94 @@ def test_unidata_composite():
 
     # Check data value
     assert 66 == f.data[2160, 2130]
+
+
+def test_gini_xarray_lazy():
+    """Test that subsetting a compressed image in xarray only decompresses what's needed."""
+    f = GiniFile(get_test_data('WEST-CONUS_4km_WV_20151208_2200.gini', as_file_obj=False))
+    ds = xr.open_dataset(f, mask_and_scale=False)
+    subset = ds.variables['WV'][10:20:2, 100:150].values
+
+    assert not f._stream.complete
+    assert subset.dtype == np.uint8
+    np.testing.assert_array_equal(subset, f.data[10:20:2, 100:150])
+
+
+def _uncompressed_gini(tmpdir):
+    """Write an uncompressed copy of a GINI file, returning the names of both."""
+    fname = get_test_data('WEST-CONUS_4km_WV_20151208_2200.gini', as_file_obj=False)
+    with open(fname, 'rb') as fobj:
+        data = fobj.read()
+    uncompressed = tmpdir.join('uncompressed.gini')
+    uncompressed.write_binary(data[:21] + zlib_decompress_all_frames(data[21:]))
+    return str(uncompressed), fname
+
+
+def test_gini_memory_mapped(tmpdir):
+    """Test that the image of an uncompressed file is memory-mapped."""
+    uncompressed, fname = _uncompressed_gini(tmpdir)
+    f = GiniFile(uncompressed)
+    assert not f.data.flags.owndata
+    np.testing.assert_array_equal(f.data, GiniFile(fname).data)
+
+
+def test_gini_close(tmpdir):
+    """Test that closing a file stops further reads."""
+    uncompressed, fname = _uncompressed_gini(tmpdir)
+    with GiniFile(uncompressed) as f:
+        np.testing.assert_array_equal(f.data[:10], GiniFile(fname).data[:10])
+
+    with pytest.raises(ValueError):
+        f.data
+
+
+def test_gini_close_xarray(tmpdir):
+    """Test that closing a dataset closes the file it was opened from."""
+    f = GiniFile(_uncompressed_gini(tmpdir)[0])
+    ds = xr.open_dataset(f)
+    ds.close()
+
+    with pytest.raises(ValueError):
+        ds['WV'].values
+
+
+def test_gini_close_data_in_use(tmpdir):
+    """Test that data from a file are still valid after closing it."""
+    uncompressed, fname = _uncompressed_gini(tmpdir)
+    f = GiniFile(uncompressed)
+    data = f.data
+    f.close()
+
+    np.testing.assert_array_equal(data, GiniFile(fname).data)
+
+
+@pytest.mark.skipif(sys.version_info < (3,), reason='Python 2 only unmaps once unused')
+def test_gini_close_unmaps(tmpdir):
+    """Test that closing unmaps a file, unless its data are still in use."""
+    uncompressed = _uncompressed_gini(tmpdir)[0]
+    f = GiniFile(uncompressed)
+    source = f._source
+    f.data
+    f.close()
+    assert source.closed
+
+    f = GiniFile(uncompressed)
+    source = f._source
+    data = f.data
+    f.close()
+    assert not source.closed
+    assert data[0, 0] == GiniFile(uncompressed).data[0, 0]
+
+
+def test_gini_lon_lat_cached():
+    """Test that lon/lat are only calculated when needed, and shared between files."""
+    _lon_lat_cache.clear()
+    f = GiniFile(get_test_data('HI-REGIONAL_4km_3.9_20160616_1715.gini'))
+    ds = xr.open_dataset(f)
+    assert not len(_lon_lat_cache)
+
+    assert_almost_equal(ds.variables['lat'][-1, 0], f.prod_desc.la1, 4)
+    assert len(_lon_lat_cache) == 1
+
+    f2 = GiniFile(get_test_data('HI-REGIONAL_4km_3.9_20160616_1715.gini'))
+    assert f2._get_lon_lat() is f._get_lon_lat()
@@ -3,10 +3,18 @@
 # SPDX-License-Identifier: BSD-3-Clause
 """Test the `io.tools` module."""
 
+import bz2
+import gzip
+from io import BytesIO
+import os
+import zlib
+
 import numpy as np
 import pytest
 
-from metpy.io._tools import hexdump, UnitLinker
+from metpy.io._tools import (BufferReader, DiskCache, hexdump, IndexedZlibData, IOBuffer,
+                             open_as_needed, UnitLinker,
+                             zlib_decompress_all_frames, zlib_frames)
 from metpy.io.cdm import Dataset
 from metpy.testing import assert_array_equal
 from metpy.units import units
@@ -76,3 +84,120 @@ def test_hexdump():
     """Test hexdump tool."""
     data = bytearray([77, 101, 116, 80, 121])
     assert hexdump(data, 4, width=8) == '4D657450 79------  0  0  MetPy'
+
+
+def _gzip_compress(data):
+    """Compress data with gzip, which is not directly available on Python 2."""
+    buf = BytesIO()
+    with gzip.GzipFile(fileobj=buf, mode='wb') as fobj:
+        fobj.write(data)
+    return buf.getvalue()
+
+
+@pytest.mark.parametrize('compress', [lambda d: d, bz2.compress, _gzip_compress])
+def test_open_as_needed(tmpdir, compress):
+    """Test that compressed files are recognized from their contents, not names."""
+    data = b'MetPy' * 100
+    path = tmpdir.join('data')
+    path.write_binary(compress(data))
+
+    with open_as_needed(str(path)) as fobj:
+        assert fobj.read() == data
+
+    assert open_as_needed(bytearray(compress(data))).read() == data
+
+
+def test_buffer_reader():
+    """Test reading from binary data in memory without copying."""
+    data = b'0123456789'
+    reader = BufferReader(data)
+    assert reader.read(4) == b'0123'
+    assert reader.tell() == 4
+    assert reader.read() == b'456789'
+    reader.seek(0)
+    assert reader.read() is data
+
+
+def test_io_buffer_no_copy():
+    """Test that IOBuffer uses a bytearray without copying it."""
+    data = bytearray(b'0123')
+    assert IOBuffer(data)._data is data
+
+
+def test_zlib_frames():
+    """Test walking through zlib frames followed by uncompressed data."""
+    data = zlib.compress(b'abc') + zlib.compress(b'defg') + b'xyz'
+    frames = list(zlib_frames(data, chunk_size=4))
+    assert [frame for _, _, frame in frames] == [b'abc', b'defg', None]
+    assert frames[-1][:2] == (len(data) - 3, len(data))
+
+
+def test_zlib_frames_max_length():
+    """Test that walking zlib frames stops partway through a frame at the maximum length."""
+    data = zlib.compress(b'abc') + zlib.compress(b'defg')
+    assert [frame for _, _, frame in zlib_frames(data, max_length=5)] == [b'abc', b'de']
+
+
+@pytest.mark.parametrize('max_length,truth', [(None, b'abcdefgxyz'), (2, b'ab'),
+                                              (5, b'abcde')])
+def test_zlib_decompress_all_frames(max_length, truth):
+    """Test decompressing multiple zlib frames into a single buffer."""
+    data = zlib.compress(b'abc') + zlib.compress(b'defg') + b'xyz'
+    decompressed = zlib_decompress_all_frames(data, max_length)
+    assert isinstance(decompressed, bytearray)
+    assert decompressed == truth
+
+
+def test_indexed_zlib_data():
+    """Test random access into zlib-compressed frames."""
+    data = b'hdr' + b''.join(zlib.compress(bytes(bytearray(range(i, i + 10))))
+                             for i in range(0, 100, 10))
+    stream = IndexedZlibData(data, 3)
+    assert stream.compressed
+    assert bytes(stream.read(15, 32)) == bytes(bytearray(range(15, 32)))
+    assert not stream.complete
+    assert len(stream) == 100
+    assert bytes(stream.read(95)) == bytes(bytearray(range(95, 100)))
+
+
+def test_indexed_zlib_data_uncompressed():
+    """Test that uncompressed data are passed through."""
+    stream = IndexedZlibData(b'hdrabcdef', 3)
+    assert not stream.compressed
+    assert bytes(stream.read(1, 4)) == b'bcd'
+
+
+def test_indexed_zlib_data_close():
+    """Test that closed data can no longer be read."""
+    stream = IndexedZlibData(zlib.compress(b'abc') + zlib.compress(b'defg'))
+    assert bytes(stream.read(0, 2)) == b'ab'
+    stream.close()
+    with pytest.raises(ValueError):
+        stream.read(0, 2)
+
+
+def test_disk_cache(tmpdir):
+    """Test storing and retrieving items from the disk cache."""
+    cache = DiskCache(str(tmpdir.join('cache')))
+    assert cache.get('a') is None
+    cache.put('a', {'data': np.arange(5)})
+    assert_array_equal(cache.get('a')['data'], np.arange(5))
+
+    cache.clear()
+    assert cache.get('a') is None
+
+
+def test_disk_cache_evict(tmpdir):
+    """Test that the disk cache removes the least recently used items when too big."""
+    cache = DiskCache(str(tmpdir), max_size=2500)
+    cache.put('a', b'a' * 1000)
+    cache.put('b', b'b' * 1000)
+
+    # Make sure b is older than a, even with coarse file times
+    os.utime(cache._path('b'), (0, 0))
+    cache.put('c', b'c' * 1000)
+
+    assert cache.get('a') == b'a' * 1000
+    assert cache.get('b') is None
+    assert cache.get('c') == b'c' * 1000
+    assert len(tmpdir.listdir()) == 2
@@ -3,17 +3,24 @@
 # SPDX-License-Identifier: BSD-3-Clause
 """Test the `nexrad` module."""
 
+import bz2
 from datetime import datetime
 import glob
 from io import BytesIO
 import logging
 import os.path
+import pickle
+import shutil
+from struct import Struct
 
 import numpy as np
 import pytest
 
 from metpy.cbook import get_test_data
-from metpy.io import is_precip_mode, Level2File, Level3File
+from metpy.io import (is_precip_mode, Level2ChunkReader, Level2File, Level3File,
+                      read_nexrad_async, read_nexrad_files, set_product_cache)
+from metpy.io.nexrad import bzip_blocks_decompress_all, runs_to_array
+from metpy.testing import assert_array_equal
 
 # Turn off the warnings for tests
 logging.getLogger('metpy.io.nexrad').setLevel(logging.CRITICAL)
@@ -42,11 +49,33 @@ def test_level2(fname, voltime, num_sweeps):
     assert len(f.sweeps) == num_sweeps
 
 
+def test_level2_metadata_only():
+    """Test reading only the metadata from a NEXRAD level2 file."""
+    fname = get_test_data('Level2_KFTG_20150430_1419.ar2v', as_file_obj=False)
+    full = Level2File(fname)
+    f = Level2File(fname, metadata_only=True)
+    assert f.dt == full.dt
+    assert f.stid == full.stid
+    assert f.vcp_info == full.vcp_info
+    assert len(f.sweeps) == 1
+    assert len(f.sweeps[0]) == 1
+    assert f.sweeps[0][0][0] == full.sweeps[0][0][0]
+    assert f.sweeps[0][0][1] == full.sweeps[0][0][1]
+
+
 def test_level2_fobj():
     """Test reading NEXRAD level2 data from a file object."""
     Level2File(get_test_data('Level2_KFTG_20150430_1419.ar2v'))
 
 
+def test_level2_bytes():
+    """Test reading NEXRAD level2 data from a gzip-ed file's contents in memory."""
+    data = get_test_data('KTLX19990503_235621.gz').read()
+    f = Level2File(memoryview(data))
+    assert f.dt == datetime(1999, 5, 3, 23, 56, 21)
+    assert len(f.sweeps) == 16
+
+
 def test_doubled_file():
     """Test for #489 where doubled-up files didn't parse at all."""
     data = get_test_data('Level2_KFTG_20150430_1419.ar2v').read()
@@ -55,6 +84,80 @@ def test_doubled_file():
     assert len(f.sweeps) == 12
 
 
+def _split_level2_chunks(data):
+    """Split a bzip2-ed Level 2 file into chunks like the real-time feed."""
+    size_fmt = Struct('>l')
+    chunks = []
+    offset = 24
+    while offset < len(data):
+        size = abs(size_fmt.unpack_from(data, offset)[0]) + size_fmt.size
+        chunks.append(data[offset:offset + size])
+        offset += size
+
+    # Volume header goes with the first block
+    chunks[0] = data[:24] + chunks[0]
+    return chunks
+
+
+def test_level2_chunks():
+    """Test incrementally reading NEXRAD level2 data from chunks."""
+    data = get_test_data('Level2_KFTG_20150430_1419.ar2v').read()
+    full = Level2File(BytesIO(data))
+
+    f = Level2ChunkReader()
+    completed = []
+    for chunk in _split_level2_chunks(data):
+        new_sweeps = f.add_chunk(BytesIO(chunk))
+
+        # Completed sweeps should be available right away and not change afterwards
+        for ind in new_sweeps:
+            assert len(f.sweeps[ind]) == len(full.sweeps[ind])
+        completed.extend(new_sweeps)
+
+    assert f.dt == full.dt
+    assert f.stid == full.stid
+    assert completed == list(range(len(full.sweeps)))
+    assert f.completed_sweeps == completed
+    assert f.volume_complete
+    assert len(f.sweeps) == len(full.sweeps)
+    assert f.vcp_info == full.vcp_info
+
+
+def _make_bzip_blocks(blocks):
+    """Pack a list of byte strings as size-prefixed bzip2 blocks, like LDM does."""
+    size_fmt = Struct('>l')
+    data = b''
+    for ind, block in enumerate(blocks):
+        comp = bz2.compress(block)
+        size = -len(comp) if ind == len(blocks) - 1 else len(comp)
+        data += size_fmt.pack(size) + comp
+    return data
+
+
+@pytest.mark.parametrize('num_threads', [1, 4])
+def test_bzip_blocks_decompress_all(num_threads):
+    """Test decompressing multiple bzip2 blocks, in parallel or not."""
+    blocks = [bytes(bytearray([i % 256] * (1000 + i))) for i in range(10)]
+    data = _make_bzip_blocks(blocks)
+    assert bzip_blocks_decompress_all(data, num_threads=num_threads) == b''.join(blocks)
+
+
+def test_bzip_blocks_bad_block():
+    """Test that a bad block mid-stream truncates the data rather than failing."""
+    blocks = [b'abc' * 100, b'def' * 100, b'ghi' * 100]
+    data = bytearray(_make_bzip_blocks(blocks))
+
+    # Corrupt the last block
+    data[-20:] = b'\x00' * 20
+    assert bzip_blocks_decompress_all(data) == b''.join(blocks[:2])
+
+
+def test_bzip_blocks_not_bzip():
+    """Test that data that are not bzip2-ed raise an error."""
+    with pytest.raises(ValueError):
+        bzip_blocks_decompress_all(b'\x00\x00\x00\x08abcdefgh')
+
+
 #
 # NIDS/Level 3 Tests
 #
@@ -100,6 +203,37 @@ def test_basic():
     assert str(f)
 
 
+def test_level3_bytes():
+    """Test reading a NIDS file from its contents in memory."""
+    fname = get_test_data('nids/Level3_FFC_N0Q_20140407_1805.nids', as_file_obj=False)
+    with open(fname, 'rb') as fobj:
+        data = fobj.read()
+    f = Level3File(data)
+    truth = Level3File(fname)
+
+    assert f.filename == 'No File'
+    assert f.prod_desc == truth.prod_desc
+    assert_array_equal(f.sym_block[0][0]['data'], truth.sym_block[0][0]['data'])
+
+
+@pytest.mark.parametrize('fname', ['nids/KOUN_SDUS54_N0QTLX_201305202016', 'nids/sn.last',
+                                   'nids/KOUN_NXUS64_GSMTLX_201305202100'])
+def test_level3_metadata_only(fname):
+    """Test reading only the metadata from a NIDS file."""
+    fname = get_test_data(fname, as_file_obj=False)
+    full = Level3File(fname)
+    f = Level3File(fname, metadata_only=True)
+    assert f.siteID == full.siteID
+    assert f.header == full.header
+    if hasattr(full, 'gsm'):
+        assert f.gsm == full.gsm
+    else:
+        assert f.prod_desc == full.prod_desc
+        assert f.metadata == full.metadata
+        assert f.product_name == full.product_name
+        assert not hasattr(f, 'sym_block')
+
+
 def test_bad_length(caplog):
     """Test reading a product with too many bytes produces a log message."""
     fname = get_test_data('nids/KOUN_SDUS84_DAATLX_201305202016', as_file_obj=False)
@@ -178,3 +312,152 @@ def test_vector_packet():
                 assert len(x2)
                 assert len(y1)
                 assert len(y2)
+
+
+def test_pickle_level3():
+    """Test that decoded NIDS files can be pickled, without the raw buffer."""
+    f = Level3File(get_test_data('nids/Level3_FFC_N0Q_20140407_1805.nids'))
+    f2 = pickle.loads(pickle.dumps(f))
+    assert not hasattr(f2, '_buffer')
+    assert f2.prod_desc == f.prod_desc
+    assert_array_equal(f2.sym_block[0][0]['start_az'], f.sym_block[0][0]['start_az'])
+
+
+batch_nids_files = [get_test_data('nids/KOUN_SDUS54_{}TLX_201305202016'.format(prod),
+                                  as_file_obj=False)
+                    for prod in ('N0Q', 'N0R', 'N0S', 'N0U', 'DHR', 'DPA')]
+
+
+def _product_code(f):
+    """Pull out the product code from a file, for testing read_nexrad_files."""
+    return f.prod_desc.prod_code
+
+
+def test_read_nexrad_async():
+    """Test decoding files from a coroutine."""
+    asyncio = pytest.importorskip('asyncio')
+    with open(batch_nids_files[0], 'rb') as fobj:
+        data = fobj.read()
+
+    loop = asyncio.new_event_loop()
+    try:
+        f = loop.run_until_complete(read_nexrad_async(data, loop=loop))
+    finally:
+        loop.close()
+    assert f.prod_desc.prod_code == 94
+
+
+@pytest.mark.parametrize('ordered', [True, False])
+def test_read_nexrad_files(ordered):
+    """Test decoding multiple NEXRAD files using a process pool."""
+    fnames = batch_nids_files + [get_test_data('Level2_KFTG_20150430_1419.ar2v',
+                                               as_file_obj=False)]
+    results = list(read_nexrad_files(fnames, processes=2, ordered=ordered))
+    if ordered:
+        assert [r[0] for r in results] == fnames
+    else:
+        assert sorted(r[0] for r in results) == sorted(fnames)
+
+    results = dict(results)
+    assert isinstance(results[fnames[-1]], Level2File)
+    assert len(results[fnames[-1]].sweeps) == 12
+    for fname in fnames[:-1]:
+        assert results[fname].prod_desc == Level3File(fname).prod_desc
+
+
+def test_read_nexrad_files_func():
+    """Test decoding multiple NEXRAD files and reducing the results in the workers."""
+    fnames = batch_nids_files[:4]
+    results = list(read_nexrad_files(fnames, reader=Level3File, processes=2, chunksize=2,
+                                     func=_product_code))
+    assert results == [(fname, Level3File(fname).prod_desc.prod_code) for fname in fnames]
+
+
+def test_read_nexrad_files_bad():
+    """Test that a file that fails to decode does not stop the others."""
+    fnames = [get_test_data('timeseries.csv', as_file_obj=False)] + batch_nids_files[:2]
+    results = list(read_nexrad_files(fnames, processes=2))
+    assert results[0] == (fnames[0], None)
+    assert all(r[1] is not None for r in results[1:])
+
+
+# Values at a row and starting column, along with the total, from the original decoder
+@pytest.mark.parametrize('fname, shape, row, col, values, total', [
+    ('KOUN_SDUS54_N0RTLX_201305202016', (360, 230), 85, 110,
+     [10, 9, 8, 7, 5, 4, 2, 1, 0, 0], 70712),
+    ('KOUN_SDUS54_NCRTLX_201305202016', (464, 464), 330, 160,
+     [3, 3, 3, 5, 5, 7, 6, 9, 10, 11], 181270),
+    ('KOUN_SDUS54_DPATLX_201305202016', (131, 131), 100, 45,
+     [126, 129, 135, 132, 110, 82, 74, 63, 45, 17], 1828828)])
+def test_rle_packet_arrays(fname, shape, row, col, values, total):
+    """Test that run-length encoded radial and raster data are decoded to 2D arrays."""
+    f = Level3File(get_test_data('nids/' + fname))
+    data = f.sym_block[0][0]['data']
+    assert data.dtype == np.uint8
+    assert data.shape == shape
+    assert_array_equal(data[row, col:col + len(values)], values)
+    assert data.sum(dtype=np.int64) == total
+
+
+def test_runs_to_array():
+    """Test expanding run-length encoded values into a 2D array."""
+    data = runs_to_array([1, 2, 3, 4, 5], [2, 1, 3, 1, 1], [2, 1, 2])
+    assert_array_equal(data, np.array([[1, 1, 2], [3, 3, 3], [4, 5, 0]]))
+
+
+def test_runs_to_array_num_cols():
+    """Test expanding run-length encoded values with a fixed number of columns."""
+    data = runs_to_array([1, 2, 3], [2, 3, 1], [1, 1, 1], num_cols=2)
+    assert_array_equal(data, np.array([[1, 1], [2, 2], [3, 0]]))
+
+
+def test_digital_radial_arrays():
+    """Test that digital radial data are decoded to arrays."""
+    f = Level3File(get_test_data('nids/KOUN_SDUS24_N1QTLX_201305202016'))
+    packet = f.sym_block[0][0]
+    assert packet['data'].dtype == np.uint8
+    assert packet['data'].shape == (360, 421)
+    assert packet['start_az'].dtype == np.float32
+    assert packet['end_az'].dtype == np.float32
+    assert packet['start_az'].shape == (360,)
+    assert f.map_data(packet['data']).shape == (360, 421)
+
+
+def test_mapper_cache():
+    """Test that mappers are shared between products with the same thresholds."""
+    fname = get_test_data('nids/KOUN_SDUS54_N0QTLX_201305202016', as_file_obj=False)
+    f1 = Level3File(fname)
+    f2 = Level3File(fname)
+    assert f1.map_data is f2.map_data
+
+    f3 = Level3File(get_test_data('nids/KOUN_SDUS54_N0UTLX_201305202016', as_file_obj=False))
+    assert f3.map_data is not f1.map_data
+
+
+def _no_decode(self, filename, metadata_only):
+    """Replace decoding to make sure the product cache is used."""
+    raise AssertionError('Product was decoded')
+
+
+@pytest.mark.parametrize('cls, fname, get_data', [
+    (Level2File, 'KTLX19990503_235621.gz', lambda f: f.sweeps[0][0][-1]['REF'][1]),
+    (Level3File, 'nids/KOUN_SDUS84_DPRTLX_201305202016',
+     lambda f: f.sym_block[0][0]['components'].radials[0].data)])
+def test_product_cache(tmpdir, monkeypatch, cls, fname, get_data):
+    """Test that decoded files are taken from the cache until they are modified."""
+    path = str(tmpdir.join(os.path.basename(fname)))
+    shutil.copy(get_test_data(fname, as_file_obj=False), path)
+    set_product_cache(str(tmpdir.join('cache')))
+    try:
+        f = cls(path)
+        with monkeypatch.context() as m:
+            m.setattr(cls, '_decode', _no_decode)
+            f2 = cls(path)
+            os.utime(path, (0, 0))
+            with pytest.raises(AssertionError):
+                cls(path)
+    finally:
+        set_product_cache(None)
+
+    assert sorted(vars(f2)) == sorted(f.__getstate__())
+    assert_array_equal(get_data(f2), get_data(f))
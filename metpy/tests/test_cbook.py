@@ -3,7 +3,7 @@
 # SPDX-License-Identifier: BSD-3-Clause
 """Test functionality of MetPy's utility code."""
 
-from metpy.cbook import Registry
+from metpy.cbook import LRUCache, Registry
 
 
 def test_registry():
@@ -14,3 +14,35 @@ def test_registry():
     reg.register('mine')(a)
 
     assert reg['mine'] is a
+
+
+def test_lru_cache():
+    """Test that the cache keeps the most recently used items."""
+    cache = LRUCache(maxsize=2)
+    cache['a'] = 1
+    cache['b'] = 2
+    assert cache['a'] == 1
+
+    # Adding another should discard b, since a was used more recently
+    cache['c'] = 3
+    assert len(cache) == 2
+    assert 'a' in cache
+    assert 'b' not in cache
+    assert 'c' in cache
+
+
+def test_lru_cache_fetch():
+    """Test that fetch only creates an item when it is not in the cache."""
+    calls = []
+
+    def make(val):
+        calls.append(val)
+        return val * 2
+
+    cache = LRUCache()
+    assert cache.fetch('a', make, 1) == 2
+    assert cache.fetch('a', make, 1) == 2
+    assert calls == [1]
+
+    cache.clear()
+    assert not len(cache)
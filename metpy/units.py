@@ -22,6 +22,8 @@ import numpy as np
 import pint
 import pint.unit
 
+from .cbook import is_dask_array
+
 UndefinedUnitError = pint.UndefinedUnitError
 DimensionalityError = pint.DimensionalityError
 
@@ -100,17 +102,18 @@ def concatenate(arrs, axis=0):
             dest = a.units
             break
 
-    data = []
-    for a in arrs:
-        if hasattr(a, 'to'):
-            a = a.to(dest).magnitude
-        data.append(np.atleast_1d(a))
+    data = [a.to(dest).magnitude if hasattr(a, 'to') else a for a in arrs]
 
-    # Use masked array concatenate to ensure masks are preserved, but convert to an
-    # array if there are no masked values.
-    data = np.ma.concatenate(data, axis=axis)
-    if not np.any(data.mask):
-        data = np.asarray(data)
+    if any(is_dask_array(d) for d in data):
+        # Keep dask arrays unevaluated
+        import dask.array as da
+        data = da.concatenate([da.atleast_1d(d) for d in data], axis=axis)
+    else:
+        # Use masked array concatenate to ensure masks are preserved, but convert to an
+        # array if there are no masked values.
+        data = np.ma.concatenate([np.atleast_1d(d) for d in data], axis=axis)
+        if not np.any(data.mask):
+            data = np.asarray(data)
 
     return units.Quantity(data, dest)
 
@@ -199,7 +202,12 @@ def atleast_2d(*arrs):
     """
     mags = [a.magnitude if hasattr(a, 'magnitude') else a for a in arrs]
     orig_units = [a.units if hasattr(a, 'units') else None for a in arrs]
-    ret = np.atleast_2d(*mags)
+    if any(is_dask_array(m) for m in mags):
+        # Keep dask arrays unevaluated
+        import dask.array as da
+        ret = da.atleast_2d(*mags)
+    else:
+        ret = np.atleast_2d(*mags)
     if len(mags) == 1:
         if orig_units[0] is not None:
             return units.Quantity(ret, orig_units[0])
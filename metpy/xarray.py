@@ -11,6 +11,7 @@ import warnings
 import xarray as xr
 from xarray.core.accessors import DatetimeAccessor
 
+from .cbook import is_dask_array
 from .units import DimensionalityError, units
 
 __all__ = []
@@ -368,16 +369,28 @@ class CFConventionHandler(object):
         coord_lists[axis] = []
 
 
-def preprocess_xarray(func):
+def preprocess_xarray(func=None, dask=False):
     """Decorate a function to convert all DataArray arguments to pint.Quantities.
 
-    This uses the metpy xarray accessors to do the actual conversion.
+    This uses the metpy xarray accessors to do the actual conversion. If `dask` is True, used
+    as ``@preprocess_xarray(dask=True)``, DataArrays backed by dask are instead converted to
+    `pint.Quantity` wrapping the dask array, rather than loading the values, for functions
+    that can calculate lazily.
     """
+    if func is None:
+        return functools.partial(preprocess_xarray, dask=dask)
+
+    def convert(a):
+        if not isinstance(a, xr.DataArray):
+            return a
+        if dask and is_dask_array(a.data):
+            return units.Quantity(a.data, a.metpy.units)
+        return a.metpy.unit_array
+
     @functools.wraps(func)
     def wrapper(*args, **kwargs):
-        args = tuple(a.metpy.unit_array if isinstance(a, xr.DataArray) else a for a in args)
-        kwargs = {name: (v.metpy.unit_array if isinstance(v, xr.DataArray) else v)
-                  for name, v in kwargs.items()}
+        args = tuple(convert(a) for a in args)
+        kwargs = {name: convert(v) for name, v in kwargs.items()}
         return func(*args, **kwargs)
     return wrapper
 